@@ -0,0 +1,134 @@
+"""Admission control: shed load early instead of queueing past the SLOs.
+
+A request is admitted while the number of requests in flight and the
+event-loop lag are under their limits. Each request gets a priority class
+which scales those limits: health checks and metrics are never shed,
+maker-checker decisions are shed last and bulk reads such as the audit
+trail first. Shed requests get a fast 503 with `Retry-After`, before any
+token verification or storage work.
+"""
+
+import logging
+import re
+from typing import Dict, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import config
+from app.loop_monitor import loop_monitor
+from app.middleware import error_response
+
+logger = logging.getLogger(__name__)
+
+CRITICAL = "critical"
+HIGH = "high"
+NORMAL = "normal"
+LOW = "low"
+
+# Multipliers applied to the in-flight and loop-lag limits per class
+PRIORITY_HEADROOM: Dict[str, float] = {
+    HIGH: 1.5,
+    NORMAL: 1.0,
+    LOW: 0.5,
+}
+
+CRITICAL_PATH_PREFIXES = ("/health", "/healthz", "/readyz", "/metrics")
+
+# Long-lived streams: admitted like any request, but not counted in flight
+# while open, since the change bus bounds them separately
+STREAMING_PATH_PREFIXES = ("/api/v1/events",)
+
+# Maker-checker decisions: enrichment submission and review, document verification
+_HIGH_PRIORITY_ROUTES: Tuple[Tuple[str, "re.Pattern"], ...] = (
+    ("POST", re.compile(r"^/api/v1/profiles/[^/]+/enrichment(?:/[^/]+/review)?$")),
+    ("POST", re.compile(r"^/api/v1/profiles/me/documents/.+/verify$")),
+)
+
+_LOW_PRIORITY_ROUTES: Tuple[Tuple[str, "re.Pattern"], ...] = (
+    ("GET", re.compile(r"^/api/v1/profiles/me/audit/?$")),
+)
+
+
+def classify(method: str, path: str) -> str:
+    """Priority class of a request."""
+    if path.startswith(CRITICAL_PATH_PREFIXES):
+        return CRITICAL
+    for route_method, pattern in _HIGH_PRIORITY_ROUTES:
+        if method == route_method and pattern.match(path):
+            return HIGH
+    for route_method, pattern in _LOW_PRIORITY_ROUTES:
+        if method == route_method and pattern.match(path):
+            return LOW
+    return NORMAL
+
+
+class AdmissionController:
+    """Tracks in-flight requests and decides whether to admit new ones."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.shed: Dict[str, int] = {name: 0 for name in PRIORITY_HEADROOM}
+
+    def overloaded(self, priority: str) -> bool:
+        """Whether a request of this class should be shed right now."""
+        if priority == CRITICAL:
+            return False
+        headroom = PRIORITY_HEADROOM[priority]
+        settings = config.admission
+        if self.in_flight >= settings.max_in_flight * headroom:
+            return True
+        return loop_monitor.lag_seconds * 1000 >= settings.max_loop_lag_ms * headroom
+
+    def reset(self) -> None:
+        """Clear counters."""
+        self.in_flight = 0
+        for name in self.shed:
+            self.shed[name] = 0
+
+
+class AdmissionMiddleware:
+    """Rejects requests with 503 while the service is overloaded.
+
+    Must run outside `RequestContextMiddleware` so shed requests skip token
+    verification.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not config.admission.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        priority = classify(scope["method"], scope["path"])
+        if admission_controller.overloaded(priority):
+            admission_controller.shed[priority] += 1
+            correlation_id = None
+            for name, value in scope["headers"]:
+                if name == b"x-correlation-id":
+                    correlation_id = value.decode("latin-1")
+                    break
+            response = error_response(
+                503,
+                "SERVICE_OVERLOADED",
+                "Service is temporarily overloaded, retry later",
+                correlation_id,
+                headers={"Retry-After": str(config.admission.retry_after_seconds)}
+            )
+            await response(scope, receive, send)
+            return
+
+        if scope["path"].startswith(STREAMING_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        admission_controller.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_controller.in_flight -= 1
+
+
+# Global admission controller instance
+admission_controller = AdmissionController()
@@ -3,9 +3,11 @@
 import json
 import logging
 from datetime import timedelta
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 from app.config import config
+from app.metrics import cache_requests
+from app.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +31,28 @@ class InMemoryCache:
             return self._cache[key]
         return None
     
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """Get several values; None for missing keys."""
+        return [await self.get(key) for key in keys]
+    
     async def set(self, key: str, value: str, ttl: int) -> None:
         """Set value in cache with TTL."""
         import time
         self._cache[key] = value
         self._ttl[key] = time.time() + ttl
     
+    async def set_many(self, items: Dict[str, str], ttl: int) -> None:
+        """Set several values with the same TTL."""
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+    
+    async def add(self, key: str, value: str, ttl: int) -> bool:
+        """Set value only if the key is absent; returns whether it was set."""
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+    
     async def delete(self, key: str) -> None:
         """Delete key from cache."""
         if key in self._cache:
@@ -70,6 +88,17 @@ class RedisCache:
             logger.error(f"Redis get error: {e}")
             return None
     
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """Get several values in one MGET round trip."""
+        if not self.redis or not keys:
+            return [None] * len(keys)
+        try:
+            values = await self.redis.mget(keys)
+            return [value.decode() if value else None for value in values]
+        except Exception as e:
+            logger.error(f"Redis mget error: {e}")
+            return [None] * len(keys)
+    
     async def set(self, key: str, value: str, ttl: int) -> None:
         """Set value in Redis with TTL."""
         if not self.redis:
@@ -79,6 +108,28 @@ class RedisCache:
         except Exception as e:
             logger.error(f"Redis set error: {e}")
     
+    async def set_many(self, items: Dict[str, str], ttl: int) -> None:
+        """Set several values with the same TTL in one pipelined round trip."""
+        if not self.redis or not items:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.setex(key, ttl, value)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis set_many error: {e}")
+    
+    async def add(self, key: str, value: str, ttl: int) -> bool:
+        """Set value only if the key is absent (SET NX); returns whether it was set."""
+        if not self.redis:
+            return True
+        try:
+            return bool(await self.redis.set(key, value, ex=ttl, nx=True))
+        except Exception as e:
+            logger.error(f"Redis add error: {e}")
+            return True
+    
     async def delete(self, key: str) -> None:
         """Delete key from Redis."""
         if not self.redis:
@@ -109,14 +160,39 @@ class CacheManager:
             self.cache = RedisCache()
             logger.info("Using Redis cache")
     
-    async def get_profile(self, profile_id: str) -> Optional[dict]:
-        """Get profile from cache."""
-        key = f"profile:{profile_id}"
-        data = await self.cache.get(key)
+    async def _get_json(self, namespace: str, key: str) -> Optional[Any]:
+        """Get and decode a cached value, counting hits and misses per namespace."""
+        with span("cache", operation="get", namespace=namespace):
+            data = await self.cache.get(key)
         if data:
+            cache_requests.inc(namespace, "hit")
             return json.loads(data)
+        cache_requests.inc(namespace, "miss")
         return None
     
+    async def get_profile(self, profile_id: str) -> Optional[dict]:
+        """Get profile from cache."""
+        return await self._get_json("profile", f"profile:{profile_id}")
+    
+    async def get_profiles(self, profile_ids: List[str]) -> Dict[str, dict]:
+        """Get cached profiles for several ids in one round trip; misses are omitted."""
+        with span("cache", operation="get_many", namespace="profile"):
+            values = await self.cache.get_many([f"profile:{profile_id}" for profile_id in profile_ids])
+        found = {}
+        for profile_id, data in zip(profile_ids, values):
+            if data:
+                found[profile_id] = json.loads(data)
+        cache_requests.inc("profile", "hit", amount=len(found))
+        cache_requests.inc("profile", "miss", amount=len(profile_ids) - len(found))
+        return found
+    
+    async def set_profiles(self, profiles: Dict[str, dict]) -> None:
+        """Cache several profiles."""
+        await self.cache.set_many(
+            {f"profile:{profile_id}": json.dumps(data) for profile_id, data in profiles.items()},
+            config.caching.profile_ttl
+        )
+    
     async def set_profile(self, profile_id: str, profile_data: dict) -> None:
         """Set profile in cache."""
         key = f"profile:{profile_id}"
@@ -129,11 +205,7 @@ class CacheManager:
     
     async def get_addresses(self, profile_id: str) -> Optional[list]:
         """Get addresses from cache."""
-        key = f"addresses:{profile_id}"
-        data = await self.cache.get(key)
-        if data:
-            return json.loads(data)
-        return None
+        return await self._get_json("addresses", f"addresses:{profile_id}")
     
     async def set_addresses(self, profile_id: str, addresses: list) -> None:
         """Set addresses in cache."""
@@ -147,11 +219,7 @@ class CacheManager:
     
     async def get_kyc_status(self, profile_id: str) -> Optional[dict]:
         """Get KYC status from cache."""
-        key = f"kyc:{profile_id}"
-        data = await self.cache.get(key)
-        if data:
-            return json.loads(data)
-        return None
+        return await self._get_json("kyc", f"kyc:{profile_id}")
     
     async def set_kyc_status(self, profile_id: str, kyc_data: dict) -> None:
         """Set KYC status in cache."""
@@ -3,12 +3,18 @@
 from app.clients.entity_service import EntityServiceClient, entity_service_client
 from app.clients.document_service import DocumentServiceClient, document_service_client
 from app.clients.authz_service import AuthZServiceClient, authz_service_client
+from app.clients.entity_cache import EntityNearCache, entity_near_cache
+from app.clients.notification_service import NotificationServiceClient, notification_service_client
 
 __all__ = [
     "EntityServiceClient",
     "DocumentServiceClient",
     "AuthZServiceClient",
+    "EntityNearCache",
+    "NotificationServiceClient",
     "entity_service_client",
     "document_service_client",
     "authz_service_client",
+    "entity_near_cache",
+    "notification_service_client",
 ]
@@ -1,23 +1,35 @@
 """AuthZ Service client for authorization checks."""
 
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
+import httpx
+
 from app.clients.base_client import BaseHTTPClient
 from app.config import config
+from app.deadline import DeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
+# Status codes meaning authz-service has no batch endpoint
+BULK_UNSUPPORTED_STATUSES = {404, 405, 501}
+
 
 class AuthZServiceClient(BaseHTTPClient):
     """Client for AuthZ Service integration."""
     
-    def __init__(self):
+    service_name = "authz_service"
+    
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         super().__init__(
             base_url=config.authz_service.base_url,
             timeout=config.authz_service.timeout,
-            retry_attempts=config.authz_service.retry_attempts
+            retry_attempts=config.authz_service.retry_attempts,
+            transport=transport
         )
+        self.max_concurrency = config.authz_service.max_concurrency
+        self.bulk_reprobe_seconds = config.authz_service.bulk_reprobe_seconds
     
     async def check_permission(
         self,
@@ -40,11 +52,86 @@ class AuthZServiceClient(BaseHTTPClient):
                 correlation_id=correlation_id
             )
             return response.get("allowed", False)
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"AuthZ check failed: {str(e)}")
             # Fail closed - deny access on error
             return False
     
+    async def check_permissions(
+        self,
+        user_id: str,
+        resource_type: str,
+        resource_ids: List[str],
+        action: str,
+        correlation_id: Optional[str] = None
+    ) -> Dict[str, bool]:
+        """Check one action on many resources in a single call.
+        
+        Falls back to per-resource checks with bounded concurrency if
+        authz-service has no batch endpoint. Fails closed per resource.
+        """
+        resource_ids = list(dict.fromkeys(resource_ids))
+        if not resource_ids:
+            return {}
+        
+        if self.bulk_supported:
+            results = await self._check_permissions_batch(user_id, resource_type, resource_ids, action, correlation_id)
+            if results is not None:
+                return results
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def check_one(resource_id: str) -> bool:
+            async with semaphore:
+                return await self.check_permission(user_id, resource_type, resource_id, action, correlation_id)
+        
+        allowed = await asyncio.gather(*(check_one(resource_id) for resource_id in resource_ids))
+        return dict(zip(resource_ids, allowed))
+    
+    async def _check_permissions_batch(
+        self,
+        user_id: str,
+        resource_type: str,
+        resource_ids: List[str],
+        action: str,
+        correlation_id: Optional[str] = None
+    ) -> Optional[Dict[str, bool]]:
+        """Batch authz check; None if the batch endpoint is unavailable."""
+        denied = {resource_id: False for resource_id in resource_ids}
+        try:
+            response = await self.post(
+                "/authz/check-batch",
+                json_data={
+                    "user_id": user_id,
+                    "resource_type": resource_type,
+                    "resource_ids": resource_ids,
+                    "action": action
+                },
+                correlation_id=correlation_id
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"AuthZ batch check failed: {str(e)}")
+            return denied
+        
+        if response.get("error"):
+            if response.get("status_code") in BULK_UNSUPPORTED_STATUSES:
+                logger.warning(
+                    f"AuthZ service has no batch endpoint, falling back to per-resource checks "
+                    f"for {self.bulk_reprobe_seconds}s"
+                )
+                self._mark_bulk_unsupported()
+                return None
+            return denied
+        
+        for item in response.get("results", []):
+            if item.get("resource_id") in denied:
+                denied[item["resource_id"]] = item.get("allowed") is True
+        return denied
+    
     async def check_field_access(
         self,
         user_id: str,
@@ -64,6 +151,8 @@ class AuthZServiceClient(BaseHTTPClient):
                 correlation_id=correlation_id
             )
             return response.get("allowed", False)
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Field access check failed: {str(e)}")
             # Fail closed - deny access on error
@@ -81,6 +170,8 @@ class AuthZServiceClient(BaseHTTPClient):
                 correlation_id=correlation_id
             )
             return response.get("permissions", [])
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Failed to get user permissions: {str(e)}")
             return []
@@ -1,21 +1,49 @@
 """Base HTTP client with retry logic."""
 
+import asyncio
 import logging
+import time
 from typing import Any, Dict, Optional
 
 import httpx
 
+from app.config import config
+from app.deadline import DeadlineExceeded, get_deadline
+from app.metrics import upstream_duration
+from app.tracing import span
+
 logger = logging.getLogger(__name__)
 
 
 class BaseHTTPClient:
     """Base HTTP client with retry and error handling."""
     
-    def __init__(self, base_url: str, timeout: int = 10, retry_attempts: int = 3):
+    # Label for upstream metrics
+    service_name = "upstream"
+    
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 10,
+        retry_attempts: int = 3,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.retry_attempts = retry_attempts
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self.client = httpx.AsyncClient(timeout=timeout, transport=transport)
+        # Seconds before a bulk endpoint that answered "unsupported" is tried again
+        self.bulk_reprobe_seconds = 300
+        self._bulk_retry_at = 0.0
+    
+    @property
+    def bulk_supported(self) -> bool:
+        """Whether to call the bulk endpoint; a 404/405/501 only disables it until the re-probe."""
+        return time.monotonic() >= self._bulk_retry_at
+    
+    def _mark_bulk_unsupported(self) -> None:
+        """Fall back to per-item calls for `bulk_reprobe_seconds`, then try the bulk endpoint again."""
+        self._bulk_retry_at = time.monotonic() + self.bulk_reprobe_seconds
     
     async def _request(
         self,
@@ -27,35 +55,86 @@ class BaseHTTPClient:
         correlation_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Make HTTP request with retry logic."""
+        response = await self._send(method, path, headers, json_data, params, correlation_id)
+        
+        if response.status_code < 400:
+            return response.json() if response.content else {}
+        
+        # Client errors (4xx) are returned, not raised
+        logger.error(
+            f"Client error from {response.request.url}: {response.status_code}",
+            extra={"correlation_id": correlation_id}
+        )
+        return {"error": response.text, "status_code": response.status_code}
+    
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        correlation_id: Optional[str] = None
+    ) -> httpx.Response:
+        """Send request, retrying timeouts and server errors (5xx)."""
+        with span(self.service_name, method=method, path=path):
+            return await self._send_with_retries(method, path, headers, json_data, params, correlation_id)
+    
+    async def _send_with_retries(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]],
+        json_data: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+        correlation_id: Optional[str]
+    ) -> httpx.Response:
         url = f"{self.base_url}/{path.lstrip('/')}"
         
-        if headers is None:
-            headers = {}
+        # Copy so deadline and correlation headers never leak into the caller's dict
+        headers = dict(headers or {})
         
         if correlation_id:
             headers["X-Correlation-Id"] = correlation_id
         
+        deadline = get_deadline()
+        
         last_exception = None
         for attempt in range(self.retry_attempts):
+            timeout = self.timeout
+            if deadline is not None:
+                # Give up early instead of waiting on a call the caller can't use
+                if deadline.expired:
+                    logger.warning(
+                        f"Deadline exceeded before calling {url} (attempt {attempt + 1}/{self.retry_attempts})",
+                        extra={"correlation_id": correlation_id}
+                    )
+                    raise DeadlineExceeded(f"Request deadline exceeded before calling {url}")
+                timeout = deadline.cap(self.timeout)
+                headers[config.deadlines.header] = str(deadline.remaining_ms())
+            
+            started = time.perf_counter()
             try:
-                response = await self.client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=json_data,
-                    params=params
+                # httpx timeouts apply per socket operation, so an upstream that
+                # trickles its body can outlast them; bound the whole attempt too
+                response = await asyncio.wait_for(
+                    self.client.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        json=json_data,
+                        params=params,
+                        timeout=timeout
+                    ),
+                    timeout
+                )
+                upstream_duration.observe(
+                    time.perf_counter() - started, self.service_name, method, f"{response.status_code // 100}xx"
                 )
-                
-                if response.status_code < 400:
-                    return response.json() if response.content else {}
                 
                 # Don't retry client errors (4xx)
-                if 400 <= response.status_code < 500:
-                    logger.error(
-                        f"Client error from {url}: {response.status_code}",
-                        extra={"correlation_id": correlation_id}
-                    )
-                    return {"error": response.text, "status_code": response.status_code}
+                if response.status_code < 500:
+                    return response
                 
                 # Retry server errors (5xx)
                 logger.warning(
@@ -64,13 +143,22 @@ class BaseHTTPClient:
                 )
                 last_exception = Exception(f"Server error: {response.status_code}")
                 
-            except httpx.TimeoutException as e:
+            except (httpx.TimeoutException, asyncio.TimeoutError) as e:
+                upstream_duration.observe(time.perf_counter() - started, self.service_name, method, "timeout")
+                if deadline is not None and (deadline.expired or timeout < self.timeout):
+                    # Cut short by the request budget, not by the upstream's own timeout
+                    logger.warning(
+                        f"Deadline exceeded calling {url} (attempt {attempt + 1}/{self.retry_attempts})",
+                        extra={"correlation_id": correlation_id}
+                    )
+                    raise DeadlineExceeded(f"Request deadline exceeded calling {url}") from e
                 logger.warning(
                     f"Timeout calling {url} (attempt {attempt + 1}/{self.retry_attempts})",
                     extra={"correlation_id": correlation_id}
                 )
                 last_exception = e
             except Exception as e:
+                upstream_duration.observe(time.perf_counter() - started, self.service_name, method, "error")
                 logger.error(
                     f"Error calling {url}: {str(e)}",
                     exc_info=True,
@@ -79,10 +167,22 @@ class BaseHTTPClient:
                 last_exception = e
         
         # All retries exhausted
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceeded(f"Request deadline exceeded calling {url}") from last_exception
         if last_exception:
             raise last_exception
         raise Exception(f"Failed to call {url} after {self.retry_attempts} attempts")
     
+    async def get_response(
+        self,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        correlation_id: Optional[str] = None
+    ) -> httpx.Response:
+        """GET request returning the raw response (status, validators, body)."""
+        return await self._send("GET", path, headers=headers, params=params, correlation_id=correlation_id)
+    
     async def get(self, path: str, **kwargs) -> Dict[str, Any]:
         """GET request."""
         return await self._request("GET", path, **kwargs)
@@ -1,24 +1,41 @@
 """Document Service client for file management."""
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
+import httpx
+
 from app.clients.base_client import BaseHTTPClient
 from app.config import config
+from app.deadline import DeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
+# Status codes meaning document-service has no bulk endpoint
+BULK_UNSUPPORTED_STATUSES = {404, 405, 501}
+
 
 class DocumentServiceClient(BaseHTTPClient):
     """Client for Document Service integration."""
     
-    def __init__(self):
+    service_name = "document_service"
+    
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         super().__init__(
             base_url=config.document_service.base_url,
             timeout=config.document_service.timeout,
-            retry_attempts=config.document_service.retry_attempts
+            retry_attempts=config.document_service.retry_attempts,
+            transport=transport
         )
+        self.max_concurrency = config.document_service.max_concurrency
+        self.bulk_reprobe_seconds = config.document_service.bulk_reprobe_seconds
+        # document_id -> (url, expires_at as epoch seconds)
+        self._url_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
     
     async def upload_document(
         self,
@@ -58,6 +75,8 @@ class DocumentServiceClient(BaseHTTPClient):
                 correlation_id=correlation_id
             )
             return response if not response.get("error") else None
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Failed to get document metadata: {str(e)}")
             return None
@@ -68,16 +87,125 @@ class DocumentServiceClient(BaseHTTPClient):
         correlation_id: Optional[str] = None
     ) -> Optional[str]:
         """Get pre-signed download URL for document."""
+        cached = self._cached_url(document_id)
+        if cached:
+            return cached
         try:
             response = await self.get(
                 f"/documents/{document_id}/download-url",
                 correlation_id=correlation_id
             )
-            return response.get("url") if not response.get("error") else None
+            if response.get("error"):
+                return None
+            return self._cache_url(document_id, response)
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Failed to get document download URL: {str(e)}")
             return None
     
+    async def resolve_download_urls(
+        self,
+        document_ids: List[str],
+        correlation_id: Optional[str] = None
+    ) -> Dict[str, Optional[str]]:
+        """Resolve pre-signed download URLs for many documents at once.
+        
+        Cached URLs are reused until shortly before they expire. The rest are
+        fetched in one bulk call, or with bounded concurrency if
+        document-service has no bulk endpoint.
+        """
+        urls: Dict[str, Optional[str]] = {}
+        missing = []
+        for document_id in dict.fromkeys(document_ids):
+            urls[document_id] = self._cached_url(document_id)
+            if urls[document_id] is None:
+                missing.append(document_id)
+        
+        if not missing:
+            return urls
+        
+        if self.bulk_supported:
+            fetched = await self._get_documents_batch(missing, correlation_id)
+            if fetched is not None:
+                urls.update(fetched)
+                return urls
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def resolve_one(document_id: str) -> Optional[str]:
+            async with semaphore:
+                return await self.get_document_download_url(document_id, correlation_id)
+        
+        results = await asyncio.gather(*(resolve_one(document_id) for document_id in missing))
+        urls.update(zip(missing, results))
+        return urls
+    
+    async def _get_documents_batch(
+        self,
+        document_ids: List[str],
+        correlation_id: Optional[str] = None
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """Fetch metadata and URLs in one call; None if the bulk endpoint is unavailable."""
+        try:
+            response = await self.post(
+                "/documents/batch",
+                json_data={"document_ids": document_ids, "include": ["download_url"]},
+                correlation_id=correlation_id
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get document batch: {str(e)}")
+            return {document_id: None for document_id in document_ids}
+        
+        if response.get("error"):
+            if response.get("status_code") in BULK_UNSUPPORTED_STATUSES:
+                logger.warning(
+                    f"Document service has no bulk endpoint, falling back to per-document calls "
+                    f"for {self.bulk_reprobe_seconds}s"
+                )
+                self._mark_bulk_unsupported()
+                return None
+            return {document_id: None for document_id in document_ids}
+        
+        urls: Dict[str, Optional[str]] = {document_id: None for document_id in document_ids}
+        for item in response.get("data", []):
+            if item.get("document_id") in urls and item.get("url"):
+                urls[item["document_id"]] = self._cache_url(item["document_id"], item)
+        return urls
+    
+    def _cached_url(self, document_id: str) -> Optional[str]:
+        entry = self._url_cache.get(document_id)
+        if entry is None:
+            return None
+        url, expires_at = entry
+        # Stop handing out URLs that could expire before the client follows them
+        if time.time() >= expires_at - config.caching.download_url_expiry_margin:
+            del self._url_cache[document_id]
+            return None
+        return url
+    
+    def _cache_url(self, document_id: str, response: Dict[str, Any]) -> Optional[str]:
+        url = response.get("url")
+        if not url:
+            return None
+        expires_at = None
+        if response.get("expires_at"):
+            try:
+                expires_at = datetime.fromisoformat(response["expires_at"]).timestamp()
+            except (TypeError, ValueError):
+                expires_at = None
+        if expires_at is None:
+            expires_in = response.get("expires_in") or config.caching.download_url_default_ttl
+            expires_at = time.time() + float(expires_in)
+        
+        self._url_cache[document_id] = (url, expires_at)
+        self._url_cache.move_to_end(document_id)
+        while len(self._url_cache) > config.caching.download_url_max_entries:
+            self._url_cache.popitem(last=False)
+        return url
+    
     async def delete_document(
         self,
         document_id: str,
@@ -90,6 +218,8 @@ class DocumentServiceClient(BaseHTTPClient):
                 correlation_id=correlation_id
             )
             return not response.get("error")
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Failed to delete document: {str(e)}")
             return False
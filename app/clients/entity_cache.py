@@ -0,0 +1,222 @@
+"""Read-through near-cache over EntityServiceClient."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from app.clients.entity_service import EntityServiceClient, entity_service_client
+from app.config import config
+from app.deadline import DeadlineExceeded, get_deadline, set_deadline
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    """Cached upstream representation with its validators."""
+
+    __slots__ = ("value", "etag", "last_modified", "expires_at", "refresh_at", "hits")
+
+    def __init__(self, value: Any, etag: Optional[str], last_modified: Optional[str], ttl: float, refresh_after: float):
+        now = time.monotonic()
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = now + ttl
+        self.refresh_at = now + refresh_after
+        self.hits = 0
+
+
+class EntityNearCache:
+    """In-process cache of entity-service reads with conditional revalidation.
+
+    Entries keep the upstream ETag/Last-Modified. Once an entry expires it is
+    revalidated with a conditional GET, so an unchanged entity costs a 304
+    instead of a full body. Entries read often enough are revalidated in the
+    background shortly before they expire, so steady-state reads stay local.
+    """
+
+    def __init__(
+        self,
+        client: Optional[EntityServiceClient] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        self.client = client or entity_service_client
+        self.ttl = ttl if ttl is not None else config.caching.entity_near_cache_ttl
+        self.max_entries = max_entries or config.caching.entity_near_cache_max_entries
+        self.refresh_after = self.ttl * (1 - config.caching.entity_near_cache_refresh_ahead_percent / 100)
+        self.hot_hits = config.caching.entity_near_cache_hot_hits
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Per in-flight key, bumped on invalidation so that fetch doesn't store its result
+        self._generations: Dict[str, int] = {}
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "refreshed_ahead": 0,
+            "stale_served": 0,
+        }
+
+    async def get_profile_entity(self, profile_id: UUID, correlation_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get profile entity, served from the near-cache when fresh."""
+        return await self._get(
+            f"profile:{profile_id}",
+            f"/entities/profiles/{profile_id}",
+            lambda body: body,
+            None,
+            correlation_id
+        )
+
+    async def get_addresses_by_profile(self, profile_id: UUID, correlation_id: Optional[str] = None) -> list:
+        """Get addresses for a profile, served from the near-cache when fresh."""
+        return await self._get(
+            f"addresses:{profile_id}",
+            f"/entities/profiles/{profile_id}/addresses",
+            lambda body: body.get("data", []),
+            [],
+            correlation_id
+        )
+
+    def invalidate_profile(self, profile_id: UUID) -> None:
+        """Drop cached entities for a profile after a local write."""
+        for key in (f"profile:{profile_id}", f"addresses:{profile_id}"):
+            self._entries.pop(key, None)
+            self._bump_generation(key)
+
+    def clear(self) -> None:
+        """Drop all cached entities."""
+        self._entries.clear()
+        for key in self._inflight:
+            self._bump_generation(key)
+
+    def stats(self) -> dict:
+        """Hit/miss and revalidation counters."""
+        return {"entries": len(self._entries), **self.counters}
+
+    async def _get(
+        self,
+        key: str,
+        path: str,
+        extract: Callable[[dict], Any],
+        default: Any,
+        correlation_id: Optional[str]
+    ) -> Any:
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and now < entry.expires_at:
+            self.counters["hits"] += 1
+            entry.hits += 1
+            self._entries.move_to_end(key)
+            if now >= entry.refresh_at and entry.hits >= self.hot_hits and key not in self._inflight:
+                self._start_fetch(key, path, extract, default, correlation_id, background=True)
+            return entry.value
+
+        self.counters["misses"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_fetch(key, path, extract, default, correlation_id, background=False)
+        # The shared fetch runs without a deadline; each caller waits only for
+        # its own budget, and the shield keeps its timeout from cancelling
+        # the fetch for the others
+        deadline = get_deadline()
+        if deadline is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadline.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Request deadline exceeded waiting for {key} from entity-service")
+
+    def _start_fetch(
+        self,
+        key: str,
+        path: str,
+        extract: Callable[[dict], Any],
+        default: Any,
+        correlation_id: Optional[str],
+        background: bool
+    ) -> asyncio.Task:
+        task = asyncio.create_task(self._fetch(key, path, extract, default, correlation_id, background))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._fetch_done(key))
+        return task
+
+    def _fetch_done(self, key: str) -> None:
+        self._inflight.pop(key, None)
+        self._generations.pop(key, None)
+
+    def _bump_generation(self, key: str) -> None:
+        # Only a fetch in flight can race an invalidation
+        if key in self._inflight:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    async def _fetch(
+        self,
+        key: str,
+        path: str,
+        extract: Callable[[dict], Any],
+        default: Any,
+        correlation_id: Optional[str],
+        background: bool
+    ) -> Any:
+        # The task copied the first caller's context; its budget must not
+        # bound a fetch other callers (or a refresh-ahead) share
+        set_deadline(None)
+
+        generation = self._generations.get(key, 0)
+        entry = self._entries.get(key)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            response = await self.client.get_response(path, headers=headers, correlation_id=correlation_id)
+        except Exception as e:
+            if entry is not None:
+                # Serve stale rather than fail while entity-service is unavailable
+                self.counters["stale_served"] += 1
+                logger.warning(f"Entity near-cache revalidation of {key} failed, serving stale: {e}")
+                return entry.value
+            logger.error(f"Failed to get {key} from entity-service: {str(e)}")
+            return default
+
+        if response.status_code == 304 and entry is not None:
+            fresh = _Entry(entry.value, entry.etag, entry.last_modified, self.ttl, self.refresh_after)
+            self._store(key, fresh, generation)
+            self.counters["refreshed_ahead" if background else "revalidated"] += 1
+            return entry.value
+
+        if response.status_code >= 400:
+            self._entries.pop(key, None)
+            return default
+
+        value = extract(response.json() if response.content else {})
+        self._store(key, _Entry(
+            value,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            self.ttl,
+            self.refresh_after
+        ), generation)
+        if background:
+            self.counters["refreshed_ahead"] += 1
+        return value
+
+    def _store(self, key: str, entry: _Entry, generation: int) -> None:
+        if self._generations.get(key, 0) != generation:
+            # Invalidated while the fetch was in flight; the response may predate the write
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Global entity near-cache instance
+entity_near_cache = EntityNearCache()
@@ -4,8 +4,11 @@ import logging
 from typing import Any, Dict, Optional
 from uuid import UUID
 
+import httpx
+
 from app.clients.base_client import BaseHTTPClient
 from app.config import config
+from app.deadline import DeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -13,11 +16,14 @@ logger = logging.getLogger(__name__)
 class EntityServiceClient(BaseHTTPClient):
     """Client for Entity Service integration."""
     
-    def __init__(self):
+    service_name = "entity_service"
+    
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         super().__init__(
             base_url=config.entity_service.base_url,
             timeout=config.entity_service.timeout,
-            retry_attempts=config.entity_service.retry_attempts
+            retry_attempts=config.entity_service.retry_attempts,
+            transport=transport
         )
     
     async def create_profile_entity(
@@ -49,6 +55,8 @@ class EntityServiceClient(BaseHTTPClient):
                 correlation_id=correlation_id
             )
             return response if not response.get("error") else None
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Failed to get profile entity: {str(e)}")
             return None
@@ -100,6 +108,8 @@ class EntityServiceClient(BaseHTTPClient):
                 correlation_id=correlation_id
             )
             return response.get("data", []) if not response.get("error") else []
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Failed to get addresses: {str(e)}")
             return []
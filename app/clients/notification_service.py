@@ -0,0 +1,47 @@
+"""Notification Service client for profile event notifications."""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.clients.base_client import BaseHTTPClient
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationServiceClient(BaseHTTPClient):
+    """Client for Notification Service integration."""
+    
+    service_name = "notification_service"
+    
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        super().__init__(
+            base_url=config.notification_service.base_url,
+            timeout=config.notification_service.timeout,
+            retry_attempts=config.notification_service.retry_attempts,
+            transport=transport
+        )
+    
+    async def send_notifications(
+        self,
+        endpoint: str,
+        notifications: List[Dict[str, Any]],
+        correlation_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Deliver a batch of notifications to one notification-service endpoint."""
+        try:
+            response = await self.post(
+                endpoint,
+                json_data={"notifications": notifications},
+                correlation_id=correlation_id
+            )
+            return response
+        except Exception as e:
+            logger.error(f"Failed to send notifications to {endpoint}: {str(e)}")
+            raise
+
+
+# Global notification service client instance
+notification_service_client = NotificationServiceClient()
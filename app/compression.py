@@ -0,0 +1,196 @@
+"""Negotiated response compression (zstd, brotli, gzip)."""
+
+import logging
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Paths whose responses are never compressed
+SKIP_PATH_PREFIXES = ("/health", "/healthz", "/readyz")
+
+# Content types that are already compressed or must not be buffered
+SKIP_CONTENT_TYPES = (
+    "text/event-stream",
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/pdf",
+    "application/octet-stream",
+)
+
+
+class _Compressor:
+    """Incremental compressor with a `compress(chunk)` / `finish()` interface."""
+
+    def __init__(self, compress: Callable[[bytes], bytes], finish: Callable[[], bytes]):
+        self.compress = compress
+        self.finish = finish
+
+
+def _gzip() -> _Compressor:
+    # wbits=31 writes a gzip header and trailer
+    obj = zlib.compressobj(config.compression.gzip_level, zlib.DEFLATED, 31)
+    return _Compressor(obj.compress, obj.flush)
+
+
+def _brotli() -> _Compressor:
+    obj = brotli.Compressor(quality=config.compression.brotli_quality)
+    return _Compressor(obj.process, obj.finish)
+
+
+def _zstd() -> _Compressor:
+    obj = zstandard.ZstdCompressor(level=config.compression.zstd_level).compressobj()
+    return _Compressor(obj.compress, obj.flush)
+
+
+def available_encodings() -> Dict[str, Callable[[], _Compressor]]:
+    """Supported encodings in server preference order."""
+    encodings: Dict[str, Callable[[], _Compressor]] = {}
+    if zstandard is not None:
+        encodings["zstd"] = _zstd
+    if brotli is not None:
+        encodings["br"] = _brotli
+    encodings["gzip"] = _gzip
+    return encodings
+
+
+def _parse_accept_encoding(value: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for part in value.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Pick the encoding with the highest client weight, ties going to the server preference."""
+    if not accept_encoding:
+        return None
+    weights = _parse_accept_encoding(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    best: Optional[Tuple[float, str]] = None
+    for coding in available_encodings():
+        weight = weights.get(coding, wildcard)
+        if weight > 0 and (best is None or weight > best[0]):
+            best = (weight, coding)
+    return best[1] if best else None
+
+
+class CompressionMiddleware:
+    """Compresses response bodies in the negotiated encoding as they stream.
+
+    The response start is held until the first body chunk: a single-chunk
+    body under `compression.minimum_size` is sent as is, with its
+    Content-Length. Larger or streamed bodies are compressed chunk by chunk
+    without buffering the whole response. Responses that already carry a
+    Content-Encoding, have a binary or event-stream content type, or are
+    health probes pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not config.compression.enabled
+            or scope["path"].startswith(SKIP_PATH_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, encoding: str, send: Send):
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if "content-encoding" in headers or content_type.startswith(SKIP_CONTENT_TYPES):
+                self.passthrough = True
+                await self.downstream(message)
+            else:
+                self.start_message = message
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if not more_body and len(body) < config.compression.minimum_size:
+                self.passthrough = True
+                await self.downstream(start)
+                await self.downstream(message)
+                return
+
+            self.compressor = available_encodings()[self.encoding]()
+            headers = MutableHeaders(scope=start)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            # The encoded bytes differ, so a strong validator no longer applies
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+
+            compressed = self.compressor.compress(body)
+            if not more_body:
+                compressed += self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+            elif "content-length" in headers:
+                del headers["Content-Length"]
+            await self.downstream(start)
+            await self.downstream({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            return
+
+        compressed = self.compressor.compress(body)
+        if not more_body:
+            compressed += self.compressor.finish()
+        await self.downstream({"type": "http.response.body", "body": compressed, "more_body": more_body})
@@ -28,6 +28,13 @@ def _get_int(key: str, default: int) -> int:
         return default
 
 
+def _get_float(key: str, default: float) -> float:
+    try:
+        return float(config.get(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
 REDIS_HOST = config.get("redis.host", "localhost")
 REDIS_PORT = _get_int("redis.port", 6379)
 REDIS_DB = _get_int("redis.db", 1)
@@ -41,6 +48,7 @@ class ServiceConfig(BaseModel):
     port: int = _get_int("server.port", 8006)
     workers: int = _get_int("service.workers", 4)
     environment: str = config.get("service.environment", "development")
+    debug: bool = _get_bool("service.debug", False)
 
 
 class SecurityConfig(BaseModel):
@@ -48,7 +56,18 @@ class SecurityConfig(BaseModel):
 
     jwt_algorithm: str = config.get("jwt.algorithm", "HS256")
     jwt_secret_key: str = config.get("jwt.access_secret", "your-super-secret-access-key-min-32-chars")
+    jwt_issuer: str = config.get("jwt.issuer", "") or ""
+    jwt_audience: str = config.get("jwt.audience", "") or ""
     api_key_header: str = config.get("api_key.header", "X-API-Key")
+    claims_cache_enabled: bool = _get_bool("jwt.claims_cache_enabled", True)
+    claims_cache_max_entries: int = _get_int("jwt.claims_cache_max_entries", 10000)
+    claims_cache_max_ttl: int = _get_int("jwt.claims_cache_max_ttl", 60)
+    jwks_url: str = config.get("jwt.jwks_url", "") or ""
+    jwks_file: str = config.get("jwt.jwks_file", "") or ""
+    jwks_refresh_interval: int = _get_int("jwt.jwks_refresh_interval", 300)
+    jwks_min_refresh_interval: int = _get_int("jwt.jwks_min_refresh_interval", 30)
+    verify_in_thread_pool: bool = _get_bool("jwt.verify_in_thread_pool", False)
+    verify_thread_pool_size: int = _get_int("jwt.verify_thread_pool_size", 4)
 
 
 class CachingConfig(BaseModel):
@@ -59,6 +78,14 @@ class CachingConfig(BaseModel):
     kyc_status_ttl: int = _get_int("caching.kyc_status_ttl", 120)
     redis_url: str = config.get("redis.url", f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}")
     use_in_memory: bool = _get_bool("caching.use_in_memory", True)
+    entity_near_cache_ttl: int = _get_int("caching.entity_near_cache_ttl", 30)
+    entity_near_cache_max_entries: int = _get_int("caching.entity_near_cache_max_entries", 10000)
+    entity_near_cache_refresh_ahead_percent: int = _get_int("caching.entity_near_cache_refresh_ahead_percent", 20)
+    entity_near_cache_hot_hits: int = _get_int("caching.entity_near_cache_hot_hits", 2)
+    download_url_default_ttl: int = _get_int("caching.download_url_default_ttl", 300)
+    download_url_expiry_margin: int = _get_int("caching.download_url_expiry_margin", 30)
+    download_url_max_entries: int = _get_int("caching.download_url_max_entries", 10000)
+    reference_data_max_age: int = _get_int("caching.reference_data_max_age", 86400)
 
 
 class BusinessConfig(BaseModel):
@@ -68,22 +95,149 @@ class BusinessConfig(BaseModel):
     kyc_validity_days: int = _get_int("business.kyc_validity_days", 365)
     kyc_renewal_warning_days: int = _get_int("business.kyc_renewal_warning_days", 30)
     maker_checker_sla_hours: int = _get_int("business.maker_checker_sla_hours", 24)
+    batch_get_max_ids: int = _get_int("business.batch_get_max_ids", 200)
 
 
 class RateLimitConfig(BaseModel):
     """Rate limiting configuration."""
 
+    enabled: bool = _get_bool("rate_limiting.enabled", True)
+    backend: str = config.get("rate_limiting.backend", "memory")
+    window_ms: int = _get_int("rate_limiting.window_ms", 60000)
+    max_requests_per_user: int = _get_int("rate_limiting.max_requests_per_user", 100)
+    max_requests_per_tenant: int = _get_int("rate_limiting.max_requests_per_tenant", 10000)
+    max_requests_per_ip: int = _get_int("rate_limiting.max_requests_per_ip", 1000)
     profile_update_per_hour: int = _get_int("rate_limiting.profile_update_per_hour", 10)
     address_add_per_month: int = _get_int("rate_limiting.address_add_per_month", 20)
     document_upload_per_day: int = _get_int("rate_limiting.document_upload_per_day", 10)
 
 
+class DeadlineConfig(BaseModel):
+    """Request deadline configuration."""
+
+    header: str = config.get("deadlines.header", "X-Request-Timeout-Ms")
+    default_ms: int = _get_int("deadlines.default_ms", 5000)
+    max_ms: int = _get_int("deadlines.max_ms", 30000)
+    route_slos_ms: Dict[str, int] = Field(
+        default_factory=lambda: config.get("deadlines.route_slos_ms", {
+            "/api/v1/profiles/me/kyc": 1000,
+            "/api/v1/profiles/me/addresses": 1200,
+            "/api/v1/profiles": 1500,
+        })
+    )
+
+
+class EntitySyncConfig(BaseModel):
+    """Write-behind sync to entity-service configuration."""
+
+    enabled: bool = _get_bool("entity_sync.enabled", True)
+    batch_size: int = _get_int("entity_sync.batch_size", 50)
+    flush_interval_ms: int = _get_int("entity_sync.flush_interval_ms", 500)
+    max_attempts: int = _get_int("entity_sync.max_attempts", 8)
+    backoff_base_ms: int = _get_int("entity_sync.backoff_base_ms", 500)
+    backoff_max_ms: int = _get_int("entity_sync.backoff_max_ms", 60000)
+    high_water_mark: int = _get_int("entity_sync.high_water_mark", 10000)
+
+
+class NotificationsConfig(BaseModel):
+    """Debounced, batched profile event notifications configuration."""
+
+    enabled: bool = _get_bool("notifications.enabled", True)
+    debounce_ms: int = _get_int("notifications.debounce_ms", 2000)
+    max_debounce_ms: int = _get_int("notifications.max_debounce_ms", 10000)
+    batch_size: int = _get_int("notifications.batch_size", 100)
+    flush_interval_ms: int = _get_int("notifications.flush_interval_ms", 500)
+    max_attempts: int = _get_int("notifications.max_attempts", 8)
+    backoff_base_ms: int = _get_int("notifications.backoff_base_ms", 1000)
+    backoff_max_ms: int = _get_int("notifications.backoff_max_ms", 300000)
+
+
 class ExternalServiceConfig(BaseModel):
     """External service configuration."""
 
     base_url: str
     timeout: int = 10
     retry_attempts: int = 3
+    max_concurrency: int = 10
+    bulk_reprobe_seconds: int = 300
+
+
+class TracingConfig(BaseModel):
+    """Request tracing configuration."""
+
+    enabled: bool = _get_bool("tracing.enabled", True)
+    sample_rate: float = _get_float("tracing.sample_rate", 0.1)
+    server_timing: bool = _get_bool("tracing.server_timing", False)
+    opentelemetry: bool = _get_bool("tracing.opentelemetry", True)
+
+
+class LoggingPipelineConfig(BaseModel):
+    """Asynchronous logging pipeline configuration."""
+
+    enabled: bool = _get_bool("async_logging.enabled", True)
+    queue_size: int = _get_int("async_logging.queue_size", 10000)
+    overflow_policy: str = config.get("async_logging.overflow_policy", "sample")
+    sample_threshold_percent: int = _get_int("async_logging.sample_threshold_percent", 80)
+    sample_every: int = _get_int("async_logging.sample_every", 10)
+    redact: bool = _get_bool("async_logging.redact", True)
+
+
+class AdmissionConfig(BaseModel):
+    """Admission control (load shedding) configuration."""
+
+    enabled: bool = _get_bool("admission.enabled", True)
+    max_in_flight: int = _get_int("admission.max_in_flight", 500)
+    max_loop_lag_ms: int = _get_int("admission.max_loop_lag_ms", 200)
+    retry_after_seconds: int = _get_int("admission.retry_after_seconds", 2)
+
+
+class CompressionConfig(BaseModel):
+    """Response compression configuration."""
+
+    enabled: bool = _get_bool("compression.enabled", True)
+    minimum_size: int = _get_int("compression.minimum_size", 1024)
+    gzip_level: int = _get_int("compression.gzip_level", 6)
+    brotli_quality: int = _get_int("compression.brotli_quality", 4)
+    zstd_level: int = _get_int("compression.zstd_level", 3)
+
+
+class EventsConfig(BaseModel):
+    """Server-sent event stream configuration."""
+
+    backend: str = config.get("events.backend", "memory")
+    redis_channel: str = config.get("events.redis_channel", "profile-service:events")
+    max_connections: int = _get_int("events.max_connections", 1000)
+    max_connections_per_user: int = _get_int("events.max_connections_per_user", 5)
+    heartbeat_seconds: int = _get_int("events.heartbeat_seconds", 15)
+    retry_ms: int = _get_int("events.retry_ms", 3000)
+    replay_buffer_size: int = _get_int("events.replay_buffer_size", 1000)
+    subscriber_queue_size: int = _get_int("events.subscriber_queue_size", 100)
+
+
+class ChangesConfig(BaseModel):
+    """Change-data-capture feed configuration."""
+
+    log_size: int = _get_int("changes.log_size", 100000)
+    default_limit: int = _get_int("changes.default_limit", 100)
+    max_limit: int = _get_int("changes.max_limit", 1000)
+
+
+class IdempotencyConfig(BaseModel):
+    """Idempotency-Key handling for POST endpoints configuration."""
+
+    enabled: bool = _get_bool("idempotency.enabled", True)
+    ttl_seconds: int = _get_int("idempotency.ttl_seconds", 86400)
+    lock_ttl_seconds: int = _get_int("idempotency.lock_ttl_seconds", 30)
+    wait_timeout_ms: int = _get_int("idempotency.wait_timeout_ms", 10000)
+    max_key_length: int = _get_int("idempotency.max_key_length", 255)
+
+
+class LoopMonitorConfig(BaseModel):
+    """Event-loop lag monitor configuration."""
+
+    interval_ms: int = _get_int("loop_monitor.interval_ms", 100)
+    watchdog: bool = _get_bool("loop_monitor.watchdog", False)
+    blocking_threshold_ms: int = _get_int("loop_monitor.blocking_threshold_ms", 100)
 
 
 class AppConfig(BaseSettings):
@@ -96,6 +250,17 @@ class AppConfig(BaseSettings):
     caching: CachingConfig = Field(default_factory=CachingConfig)
     business: BusinessConfig = Field(default_factory=BusinessConfig)
     rate_limiting: RateLimitConfig = Field(default_factory=RateLimitConfig)
+    deadlines: DeadlineConfig = Field(default_factory=DeadlineConfig)
+    entity_sync: EntitySyncConfig = Field(default_factory=EntitySyncConfig)
+    notifications: NotificationsConfig = Field(default_factory=NotificationsConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
+    async_logging: LoggingPipelineConfig = Field(default_factory=LoggingPipelineConfig)
+    admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
+    loop_monitor: LoopMonitorConfig = Field(default_factory=LoopMonitorConfig)
+    compression: CompressionConfig = Field(default_factory=CompressionConfig)
+    events: EventsConfig = Field(default_factory=EventsConfig)
+    changes: ChangesConfig = Field(default_factory=ChangesConfig)
+    idempotency: IdempotencyConfig = Field(default_factory=IdempotencyConfig)
 
     # External services
     entity_service: ExternalServiceConfig = Field(
@@ -110,6 +275,8 @@ class AppConfig(BaseSettings):
             base_url=config.get("external_services.document_service.url", "http://localhost:8001"),
             timeout=_get_int("external_services.document_service.timeout", 5),
             retry_attempts=_get_int("external_services.document_service.retry_attempts", 3),
+            max_concurrency=_get_int("external_services.document_service.max_concurrency", 10),
+            bulk_reprobe_seconds=_get_int("external_services.document_service.bulk_reprobe_seconds", 300),
         )
     )
     authz_service: ExternalServiceConfig = Field(
@@ -117,6 +284,7 @@ class AppConfig(BaseSettings):
             base_url=config.get("external_services.authz_service.url", "http://localhost:3002"),
             timeout=_get_int("external_services.authz_service.timeout", 5),
             retry_attempts=_get_int("external_services.authz_service.retry_attempts", 3),
+            bulk_reprobe_seconds=_get_int("external_services.authz_service.bulk_reprobe_seconds", 300),
         )
     )
     notification_service: ExternalServiceConfig = Field(
@@ -0,0 +1,82 @@
+"""Per-request deadline tracking and propagation."""
+
+import time
+from contextvars import ContextVar, Token
+from typing import Mapping, Optional
+
+from app.config import config
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the request budget is exhausted before an upstream call."""
+
+
+class Deadline:
+    """Absolute point in time by which a request must complete."""
+
+    __slots__ = ("budget", "expires_at")
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        """Seconds left in the budget (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def remaining_ms(self) -> int:
+        """Milliseconds left in the budget, for forwarding upstream."""
+        return int(self.remaining() * 1000)
+
+    @property
+    def expired(self) -> bool:
+        """Whether the budget has been used up."""
+        return time.monotonic() >= self.expires_at
+
+    def cap(self, timeout: float) -> float:
+        """Cap a static timeout at the remaining budget."""
+        return min(timeout, self.remaining())
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def get_deadline() -> Optional[Deadline]:
+    """Get the deadline of the request being processed, if any."""
+    return _current_deadline.get()
+
+
+def set_deadline(deadline: Optional[Deadline]) -> Token:
+    """Bind a deadline to the current request context."""
+    return _current_deadline.set(deadline)
+
+
+def reset_deadline(token: Token) -> None:
+    """Restore the deadline that was bound before `set_deadline`."""
+    _current_deadline.reset(token)
+
+
+def route_budget_ms(path: str) -> int:
+    """Get the SLO budget for a path (longest configured prefix wins)."""
+    best_prefix = ""
+    budget = config.deadlines.default_ms
+    for prefix, slo_ms in config.deadlines.route_slos_ms.items():
+        if path.startswith(prefix) and len(prefix) > len(best_prefix):
+            best_prefix = prefix
+            budget = slo_ms
+    return budget
+
+
+def deadline_for_request(path: str, headers: Mapping[str, str]) -> Deadline:
+    """Derive the request deadline from the deadline header or the route SLO."""
+    budget_ms = None
+    header_value = headers.get(config.deadlines.header)
+    if header_value:
+        try:
+            budget_ms = int(header_value)
+        except ValueError:
+            budget_ms = None
+    if budget_ms is None or budget_ms < 0:
+        budget_ms = route_budget_ms(path)
+    budget_ms = min(budget_ms, config.deadlines.max_ms)
+    return Deadline(budget_ms / 1000)
@@ -0,0 +1,278 @@
+"""Change bus feeding the server-sent event stream.
+
+Services publish changes to topics (`profile:<id>` for a customer's KYC
+progress, `enrichment` for maker-checker decisions) and every open stream
+subscribed to the topic receives them. With `events.backend: redis`, each
+replica also relays its changes over Redis pub/sub and delivers the changes
+of the other replicas, so a client sees every change whichever replica it is
+connected to.
+
+Each event is encoded as an SSE frame once, when published, and the same
+bytes are written to every subscriber. The most recent events are kept in a
+replay buffer so a reconnecting client sending `Last-Event-ID` receives what
+it missed; when that id has already left the buffer it gets a `reset` event
+and refetches current state instead.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+from app.config import config
+from app.metrics import registry
+from app.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Comment line written when a stream is idle; keeps proxies from timing it out
+HEARTBEAT = b": keep-alive\n\n"
+
+# Topic carrying maker-checker decisions, for officers
+ENRICHMENT_TOPIC = "enrichment"
+
+open_streams = registry.gauge("event_streams_open", "Server-sent event streams currently open.")
+published_events = registry.counter("events_published_total", "Change events published, by type.", ["type"])
+dropped_streams = registry.counter(
+    "event_streams_dropped_total", "Streams disconnected because they fell behind the publish rate."
+)
+
+
+def profile_topic(profile_id: str) -> str:
+    """Topic of a profile's own changes."""
+    return f"profile:{profile_id}"
+
+
+class StreamLimitExceeded(Exception):
+    """Raised when a new stream would exceed the connection limits."""
+
+    def __init__(self, message: str, per_user: bool):
+        super().__init__(message)
+        self.per_user = per_user
+
+
+class Event:
+    """A published change with its pre-encoded SSE frame."""
+
+    __slots__ = ("id", "topic", "type", "data", "frame")
+
+    def __init__(self, event_id: str, topic: str, event_type: str, data: Dict[str, Any]):
+        self.id = event_id
+        self.topic = topic
+        self.type = event_type
+        self.data = data
+        self.frame = b"id: " + event_id.encode() + b"\nevent: " + event_type.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+class Subscription:
+    """One open stream's view of the bus.
+
+    Frames are queued up to `events.subscriber_queue_size`. A subscriber that
+    falls further behind is closed rather than buffered without bound; the
+    client reconnects with `Last-Event-ID` and catches up from the replay
+    buffer.
+    """
+
+    def __init__(self, bus: "ChangeBus", user_id: str, topics: Iterable[str]):
+        self.bus = bus
+        self.user_id = user_id
+        self.topics = frozenset(topics)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=config.events.subscriber_queue_size)
+        self.closed = False
+
+    def push(self, frame: bytes) -> None:
+        """Queue a frame without blocking the publisher."""
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            dropped_streams.inc()
+            self.close()
+
+    def close(self) -> None:
+        """End the stream; `next_frame` returns None once the queue is drained."""
+        if self.closed:
+            return
+        self.closed = True
+        # Drop queued frames so the end-of-stream marker always fits
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def next_frame(self, timeout: float) -> Optional[bytes]:
+        """The next frame, a heartbeat after `timeout` idle seconds, or None when closed."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return HEARTBEAT
+
+
+class ChangeBus:
+    """In-process publish/subscribe with an optional Redis relay between replicas."""
+
+    def __init__(self):
+        self.node_id = uuid.uuid4().hex[:12]
+        self._sequence = itertools.count(1)
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self._per_user: Dict[str, int] = {}
+        self._recent: Deque[Event] = deque(maxlen=config.events.replay_buffer_size)
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+        self._relays: Set[asyncio.Task] = set()
+
+    @property
+    def connections(self) -> int:
+        """Number of open subscriptions."""
+        return sum(self._per_user.values())
+
+    def publish(self, topic: str, event_type: str, data: Dict[str, Any]) -> Event:
+        """Deliver a change to this replica's subscribers and relay it to the others."""
+        event = Event(f"{self.node_id}-{next(self._sequence)}", topic, event_type, data)
+        self._deliver(event)
+        published_events.inc(event_type)
+        if self._redis is not None:
+            task = asyncio.create_task(self._relay(event))
+            self._relays.add(task)
+            task.add_done_callback(self._relays.discard)
+        return event
+
+    def _deliver(self, event: Event) -> None:
+        self._recent.append(event)
+        for subscription in tuple(self._topics.get(event.topic, ())):
+            subscription.push(event.frame)
+
+    def subscribe(self, user_id: str, topics: Iterable[str], last_event_id: Optional[str] = None) -> Subscription:
+        """Open a subscription, queueing the events missed since `last_event_id`.
+
+        Raises StreamLimitExceeded past `events.max_connections` in total or
+        `events.max_connections_per_user` for this user.
+        """
+        settings = config.events
+        if self.connections >= settings.max_connections:
+            raise StreamLimitExceeded("Too many open event streams", per_user=False)
+        if self._per_user.get(user_id, 0) >= settings.max_connections_per_user:
+            raise StreamLimitExceeded("Too many open event streams for this user", per_user=True)
+
+        subscription = Subscription(self, user_id, topics)
+        if last_event_id:
+            for frame in self._missed(subscription.topics, last_event_id):
+                subscription.push(frame)
+        for topic in subscription.topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+        self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+        open_streams.inc()
+        return subscription
+
+    def _missed(self, topics: frozenset, last_event_id: str) -> List[bytes]:
+        missed = None
+        for event in self._recent:
+            if missed is not None:
+                if event.topic in topics:
+                    missed.append(event.frame)
+            elif event.id == last_event_id:
+                missed = []
+        if missed is None:
+            # The client's position is no longer (or never was) buffered
+            return [Event(last_event_id, "", "reset", {"reason": "replay_unavailable"}).frame]
+        return missed
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Close a subscription and release its connection slot."""
+        subscription.close()
+        removed = False
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers and subscription in subscribers:
+                removed = True
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[topic]
+        if not removed:
+            return
+        remaining = self._per_user.get(subscription.user_id, 0) - 1
+        if remaining > 0:
+            self._per_user[subscription.user_id] = remaining
+        else:
+            self._per_user.pop(subscription.user_id, None)
+        open_streams.dec()
+
+    async def start(self) -> None:
+        """Connect the Redis relay when `events.backend` is redis."""
+        if config.events.backend != "redis" or self._listener is not None:
+            return
+        try:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(config.caching.redis_url)
+            pubsub = self._redis.pubsub()
+            await pubsub.subscribe(config.events.redis_channel)
+        except Exception as e:
+            logger.warning(f"Failed to connect event relay to Redis: {e}. Events stay within this replica.")
+            self._redis = None
+            return
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def stop(self) -> None:
+        """Close every open stream and disconnect from Redis."""
+        for subscribers in tuple(self._topics.values()):
+            for subscription in tuple(subscribers):
+                subscription.close()
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    async def _relay(self, event: Event) -> None:
+        payload = json.dumps({
+            "node": self.node_id, "id": event.id, "topic": event.topic, "type": event.type, "data": event.data
+        }, default=str)
+        try:
+            await self._redis.publish(config.events.redis_channel, payload)
+        except Exception as e:
+            logger.error(f"Redis event publish error: {e}")
+
+    async def _listen(self, pubsub) -> None:
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._receive(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis event subscription error: {e}")
+                await asyncio.sleep(1)
+                try:
+                    await pubsub.subscribe(config.events.redis_channel)
+                except Exception as e:
+                    logger.error(f"Redis event resubscribe error: {e}")
+
+    def _receive(self, raw: Any) -> None:
+        try:
+            payload = json.loads(raw)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Malformed event on {config.events.redis_channel}: {e}")
+            return
+        if payload.get("node") == self.node_id:
+            return
+        self._deliver(Event(payload["id"], payload["topic"], payload["type"], payload["data"]))
+
+    def reset(self) -> None:
+        """Close all subscriptions and forget buffered events."""
+        for subscribers in tuple(self._topics.values()):
+            for subscription in tuple(subscribers):
+                self.unsubscribe(subscription)
+        self._recent.clear()
+
+
+# Global change bus instance
+change_bus = ChangeBus()
@@ -0,0 +1,309 @@
+"""Idempotency-Key handling for create endpoints.
+
+A client that retries a POST after a timeout cannot tell whether the first
+attempt went through. Sending the same `Idempotency-Key` header makes the
+retry safe: the first response is stored in the cache backend for
+`idempotency.ttl_seconds` and later requests with the key get that response
+back, marked `Idempotent-Replayed: true`, without running the handler again.
+
+While the first request runs its key holds a pending marker (set only if
+absent, so one replica wins). A duplicate arriving meanwhile waits for the
+result instead of executing: on the same replica it awaits the in-flight
+request directly, otherwise it polls the store, and after
+`idempotency.wait_timeout_ms` it gets 409. Reusing a key with a different
+body is rejected with 422.
+
+Keys are scoped to the caller and the route. Server errors and responses
+that say "retry later" (401, 403, 408, 409, 425, 429) are not stored, so a
+retry executes again.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import cache_manager
+from app.config import config
+from app.metrics import registry
+from app.middleware import error_response
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+
+# Create endpoints that honour Idempotency-Key
+IDEMPOTENT_ROUTES: Tuple[Tuple[str, "re.Pattern"], ...] = (
+    ("POST", re.compile(r"^/api/v1/profiles/me/addresses/?$")),
+    ("POST", re.compile(r"^/api/v1/profiles/me/documents/?$")),
+    ("POST", re.compile(r"^/api/v1/profiles/[^/]+/enrichment$")),
+)
+
+# Client errors a retry may legitimately turn into a success
+NON_STORABLE_STATUSES = frozenset({401, 403, 408, 409, 425, 429})
+
+# How often a duplicate on another replica checks for the stored response
+POLL_INTERVAL_SECONDS = 0.05
+
+PENDING = "pending"
+COMPLETE = "complete"
+
+idempotency_requests = registry.counter(
+    "idempotency_requests_total", "Requests carrying an Idempotency-Key, by outcome.", ["outcome"]
+)
+
+
+def is_idempotent_route(method: str, path: str) -> bool:
+    """Whether a request may carry an Idempotency-Key."""
+    for route_method, pattern in IDEMPOTENT_ROUTES:
+        if method == route_method and pattern.match(path):
+            return True
+    return False
+
+
+def is_storable(status_code: int) -> bool:
+    """Whether a response is final for its key and should be replayed to retries."""
+    return status_code < 500 and status_code not in NON_STORABLE_STATUSES
+
+
+class IdempotencyStore:
+    """Pending markers and stored responses in the cache backend.
+
+    A stored response is one JSON value: status, headers, a fingerprint of
+    the request body and the response body zlib-compressed.
+    """
+
+    def __init__(self):
+        self.cache = cache_manager.cache
+
+    async def reserve(self, key: str, fingerprint: str) -> bool:
+        """Claim a key for a request about to execute; False when already claimed."""
+        marker = json.dumps({"state": PENDING, "fingerprint": fingerprint})
+        return await self.cache.add(key, marker, config.idempotency.lock_ttl_seconds)
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Pending marker or stored response for a key."""
+        data = await self.cache.get(key)
+        return json.loads(data) if data else None
+
+    async def save(
+        self,
+        key: str,
+        fingerprint: str,
+        status_code: int,
+        headers: List[Tuple[str, str]],
+        body: bytes
+    ) -> None:
+        """Store the final response for a key."""
+        record = {
+            "state": COMPLETE,
+            "fingerprint": fingerprint,
+            "status": status_code,
+            "headers": headers,
+            "body": base64.b64encode(zlib.compress(body)).decode("ascii")
+        }
+        await self.cache.set(key, json.dumps(record, separators=(",", ":")), config.idempotency.ttl_seconds)
+
+    async def release(self, key: str) -> None:
+        """Drop a pending marker so the next request with the key executes."""
+        await self.cache.delete(key)
+
+    @staticmethod
+    def body(record: dict) -> bytes:
+        """Decoded response body of a stored record."""
+        return zlib.decompress(base64.b64decode(record["body"]))
+
+
+class IdempotencyMiddleware:
+    """Answers retries of create requests from the idempotency store.
+
+    Must run inside `RequestContextMiddleware`, which resolves the caller,
+    and inside `CompressionMiddleware`, so stored bodies are uncompressed and
+    each replay is encoded for its own client.
+    """
+
+    def __init__(self, app: ASGIApp, store: Optional[IdempotencyStore] = None):
+        self.app = app
+        self.store = store or IdempotencyStore()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not config.idempotency.enabled
+            or not is_idempotent_route(scope["method"], scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        raw_key = headers.get(IDEMPOTENCY_HEADER)
+        caller = self._caller(scope, headers)
+        if raw_key is None or caller is None:
+            # Unauthenticated requests are rejected by the route; nothing to store
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.get("state", {})
+        correlation_id = state.get("correlation_id")
+        idempotency_key = raw_key.decode("latin-1").strip()
+        if not idempotency_key or len(idempotency_key) > config.idempotency.max_key_length:
+            response = error_response(
+                400,
+                "INVALID_IDEMPOTENCY_KEY",
+                f"Idempotency-Key must be 1 to {config.idempotency.max_key_length} characters",
+                correlation_id
+            )
+            await response(scope, receive, send)
+            return
+
+        body, disconnected = await _read_body(receive)
+        if disconnected:
+            return
+        fingerprint = hashlib.sha256(body).hexdigest()
+        key = f"idempotency:{caller}:{scope['method']}:{scope['path'].rstrip('/')}:{idempotency_key}"
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + config.idempotency.wait_timeout_ms / 1000
+        while not await self.store.reserve(key, fingerprint):
+            record = await self.store.get(key)
+            if record is not None and record["fingerprint"] != fingerprint:
+                idempotency_requests.inc("mismatch")
+                response = error_response(
+                    422,
+                    "IDEMPOTENCY_KEY_REUSED",
+                    "Idempotency-Key was already used with a different request body",
+                    correlation_id
+                )
+                await response(scope, receive, send)
+                return
+            if record is not None and record["state"] == COMPLETE:
+                idempotency_requests.inc("replayed")
+                await _replay(record, send)
+                return
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                idempotency_requests.inc("in_progress")
+                logger.warning(
+                    f"Idempotency-Key still in progress after {config.idempotency.wait_timeout_ms}ms: "
+                    f"{scope['method']} {scope['path']}",
+                    extra={"correlation_id": correlation_id}
+                )
+                response = error_response(
+                    409,
+                    "IDEMPOTENCY_KEY_IN_PROGRESS",
+                    "A request with this Idempotency-Key is still being processed",
+                    correlation_id,
+                    headers={"Retry-After": "1"}
+                )
+                await response(scope, receive, send)
+                return
+            # Still pending, or released or expired between the two calls: wait, then try to claim it again
+            await self._wait(key, remaining)
+
+        idempotency_requests.inc("executed")
+        await self._execute(scope, receive, send, key, fingerprint, body)
+
+    @staticmethod
+    def _caller(scope: Scope, headers: Dict[bytes, bytes]) -> Optional[str]:
+        """Identity a key is scoped to: the user, else a digest of the credentials."""
+        user_id = scope.get("state", {}).get("user_id")
+        if user_id:
+            return f"user:{user_id}"
+        authorization = headers.get(b"authorization")
+        if authorization:
+            return f"auth:{hashlib.sha256(authorization).hexdigest()[:32]}"
+        return None
+
+    async def _wait(self, key: str, timeout: float) -> None:
+        """Wait for the request holding a key on this replica, else for one poll interval."""
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            await asyncio.sleep(min(timeout, POLL_INTERVAL_SECONDS))
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(in_flight), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _execute(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        key: str,
+        fingerprint: str,
+        body: bytes
+    ) -> None:
+        """Run the request, storing its response for retries when final."""
+        done = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = done
+        status_code = 500
+        response_headers: List[Tuple[str, str]] = []
+        chunks: List[bytes] = []
+        body_sent = False
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def send_capturing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers.extend(
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                    if name.lower() != b"content-length"
+                )
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, send_capturing)
+            if is_storable(status_code):
+                await self.store.save(key, fingerprint, status_code, response_headers, b"".join(chunks))
+            else:
+                await self.store.release(key)
+        except BaseException:
+            await self.store.release(key)
+            raise
+        finally:
+            # With a store that fails open, a duplicate may have replaced the future
+            if self._in_flight.get(key) is done:
+                del self._in_flight[key]
+            done.set_result(None)
+
+
+async def _read_body(receive: Receive) -> Tuple[bytes, bool]:
+    """Whole request body, and whether the client went away first."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return b"", True
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks), False
+
+
+async def _replay(record: dict, send: Send) -> None:
+    """Send a stored response."""
+    body = IdempotencyStore.body(record)
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in record["headers"]]
+    headers.append((b"content-length", str(len(body)).encode("latin-1")))
+    headers.append((REPLAYED_HEADER, b"true"))
+    await send({"type": "http.response.start", "status": record["status"], "headers": headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,231 @@
+"""Non-blocking logging: records are queued and handled on a background thread."""
+
+import copy
+import logging
+import queue
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app.config import config
+
+# One pass over the text for all PII patterns. Lookarounds instead of \b so
+# digit runs inside UUIDs, hyphenated ids, decimals and +-prefixed phone
+# numbers are left alone.
+_PII_PATTERN = re.compile(
+    r"(?<![\w.+-])(?:"
+    r"(?P<pan>[A-Z]{5}[0-9]{4}[A-Z])"
+    r"|(?P<aadhaar>[2-9][0-9]{3}[ -]?[0-9]{4}[ -]?[0-9]{4})"
+    r"|(?P<account>[0-9]{9,18})"
+    r")(?![\w-]|\.[0-9])"
+)
+
+_REPLACEMENTS = {
+    "pan": "[REDACTED_PAN]",
+    "aadhaar": "[REDACTED_AADHAAR]",
+    "account": "[REDACTED_ACCOUNT]",
+}
+
+
+def _replace(match: "re.Match") -> str:
+    return _REPLACEMENTS[match.lastgroup]
+
+
+def redact(text: str) -> str:
+    """Mask PAN, Aadhaar and bank account numbers in a piece of log text."""
+    return _PII_PATTERN.sub(_replace, text)
+
+
+# Attributes every LogRecord has; anything else on a record came from `extra`
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime"}
+
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+def prepare(record: logging.LogRecord) -> logging.LogRecord:
+    """Copy of a record that is safe to format later on another thread.
+
+    As `logging.handlers.QueueHandler.prepare`: %-style args are merged into
+    the message, so later mutation of them can't change it, and the
+    traceback is rendered to `exc_text` and `exc_info` cleared, so queued
+    records don't keep request frames alive. Formatters print `exc_text`.
+    """
+    record = copy.copy(record)
+    record.msg = record.getMessage()
+    record.args = None
+    if record.exc_info:
+        if not record.exc_text:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+        record.exc_info = None
+    return record
+
+
+def redact_record(record: logging.LogRecord) -> logging.LogRecord:
+    """Copy of a record with PII masked in its message, traceback and string-valued extras."""
+    redacted = copy.copy(record)
+    redacted.msg = redact(record.getMessage())
+    redacted.args = None
+    if record.exc_info and not record.exc_text:
+        redacted.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+        redacted.exc_info = None
+    if redacted.exc_text:
+        redacted.exc_text = redact(redacted.exc_text)
+    for name, value in record.__dict__.items():
+        if name not in _RECORD_ATTRIBUTES and isinstance(value, str):
+            setattr(redacted, name, redact(value))
+    return redacted
+
+
+class RedactingFormatter(logging.Formatter):
+    """Redacts PII in a record, then formats it with another formatter.
+
+    Redaction runs on the record's text, never on the formatted line, so
+    numbers in structured (JSON) output such as durations and timestamps
+    are left intact and the output stays valid.
+    """
+
+    def __init__(self, inner: Optional[logging.Formatter]):
+        super().__init__()
+        self.inner = inner or logging.Formatter()
+
+    def format(self, record: logging.LogRecord) -> str:
+        return self.inner.format(redact_record(record))
+
+
+class _QueueHandler(logging.Handler):
+    """Stands in for a logger's handlers, forwarding records to the pipeline."""
+
+    def __init__(self, pipeline: "LoggingPipeline", targets: List[logging.Handler]):
+        super().__init__()
+        self.pipeline = pipeline
+        self.targets = targets
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Skip the handler lock; the queue is already thread-safe
+        if self.filter(record):
+            self.pipeline.enqueue(record, self.targets)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.pipeline.enqueue(record, self.targets)
+
+
+_STOP = object()
+
+
+class LoggingPipeline:
+    """Moves log handling off the event loop thread.
+
+    `start()` swaps each logger's handlers for a queue handler; a listener
+    thread formats and writes the records with the original handlers, so a
+    logger keeps writing to the same destinations. The queue is bounded.
+    With the `sample` policy, INFO/DEBUG records are sampled once the queue
+    passes a fill threshold; anything that still does not fit is dropped.
+    """
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        overflow_policy: Optional[str] = None,
+        sample_every: Optional[int] = None,
+        sample_threshold_percent: Optional[int] = None
+    ):
+        settings = config.async_logging
+        self.queue_size = queue_size or settings.queue_size
+        self.overflow_policy = overflow_policy or settings.overflow_policy
+        self.sample_every = max(1, sample_every or settings.sample_every)
+        threshold = sample_threshold_percent if sample_threshold_percent is not None else settings.sample_threshold_percent
+        self._sample_depth = self.queue_size * threshold // 100
+        self._queue: "queue.Queue" = queue.Queue(self.queue_size)
+        self._sample_counter = 0
+        self._thread: Optional[threading.Thread] = None
+        self._installed: List[Tuple[logging.Logger, List[logging.Handler]]] = []
+        self._formatters: Dict[logging.Handler, Optional[logging.Formatter]] = {}
+        self.counters = {"enqueued": 0, "dropped": 0, "sampled_out": 0}
+
+    def enqueue(self, record: logging.LogRecord, targets: List[logging.Handler]) -> None:
+        """Queue a record without blocking; it is prepared on the caller's thread."""
+        if (
+            self.overflow_policy == "sample"
+            and record.levelno < logging.WARNING
+            and self._queue.qsize() >= self._sample_depth
+        ):
+            self._sample_counter += 1
+            if self._sample_counter % self.sample_every:
+                self.counters["sampled_out"] += 1
+                return
+
+        try:
+            record = prepare(record)
+        except Exception:
+            # Unformattable args: let the handlers report it as logging does
+            pass
+        try:
+            self._queue.put_nowait((record, targets))
+        except queue.Full:
+            self.counters["dropped"] += 1
+            return
+        self.counters["enqueued"] += 1
+
+    def start(self, loggers: Optional[List[logging.Logger]] = None) -> None:
+        """Route the given loggers (default: root and every configured logger) through the queue."""
+        if self._thread is not None:
+            return
+        if loggers is None:
+            loggers = [logging.getLogger()] + [
+                logger for logger in logging.Logger.manager.loggerDict.values()
+                if isinstance(logger, logging.Logger) and logger.handlers
+            ]
+
+        for logger in loggers:
+            targets = list(logger.handlers)
+            if not targets:
+                continue
+            for handler in targets:
+                if handler not in self._formatters:
+                    self._formatters[handler] = handler.formatter
+                    if config.async_logging.redact:
+                        handler.setFormatter(RedactingFormatter(handler.formatter))
+            self._installed.append((logger, targets))
+            logger.handlers = [_QueueHandler(self, targets)]
+
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush queued records and restore the original handlers."""
+        if self._thread is None:
+            return
+        for logger, targets in self._installed:
+            logger.handlers = targets
+        self._installed.clear()
+
+        # Blocking is fine here: shutdown, and the listener is draining
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+        for handler, formatter in self._formatters.items():
+            handler.setFormatter(formatter)
+        self._formatters.clear()
+
+    def stats(self) -> dict:
+        """Queue depth and drop counters."""
+        return {"queued": self._queue.qsize(), **self.counters}
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            record, targets = item
+            for handler in targets:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+# Global logging pipeline instance
+logging_pipeline = LoggingPipeline()
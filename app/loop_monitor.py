@@ -0,0 +1,113 @@
+"""Event-loop lag monitoring and blocking-call detection."""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.config import config
+from app.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+loop_lag = registry.histogram(
+    "event_loop_lag_seconds", "Delay between when a loop timer was due and when it ran.", buckets=LAG_BUCKETS
+)
+loop_lag_current = registry.gauge("event_loop_lag_current_seconds", "Most recently sampled event-loop lag.")
+loop_blocked = registry.counter("event_loop_blocked_total", "Times the watchdog saw the event loop blocked.")
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop runs a timer.
+
+    A task sleeps for a fixed interval and records how much later than
+    requested it woke up. Sustained lag means callbacks are queueing behind
+    CPU work or blocking calls.
+
+    With the watchdog on (`loop_monitor.watchdog` or debug mode), a thread
+    checks that the task keeps waking up. If it has been overdue for longer
+    than `blocking_threshold_ms`, the loop is stuck in a callback right now,
+    so the watchdog logs the loop thread's current stack, once per stall.
+    """
+
+    def __init__(
+        self,
+        interval_ms: Optional[int] = None,
+        blocking_threshold_ms: Optional[int] = None,
+        watchdog: Optional[bool] = None
+    ):
+        settings = config.loop_monitor
+        self.interval = (interval_ms or settings.interval_ms) / 1000
+        self.blocking_threshold = (blocking_threshold_ms or settings.blocking_threshold_ms) / 1000
+        self.watchdog = watchdog if watchdog is not None else (settings.watchdog or config.service.debug)
+        self.lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self.last_blocking_stack: Optional[str] = None
+        self._heartbeat = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._loop_thread_id: Optional[int] = None
+        self._watchdog_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    async def run(self) -> None:
+        """Sample lag until cancelled."""
+        while True:
+            self._heartbeat = time.perf_counter()
+            expected = self._heartbeat + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag_seconds = max(0.0, time.perf_counter() - expected)
+            self.max_lag_seconds = max(self.max_lag_seconds, self.lag_seconds)
+            loop_lag.observe(self.lag_seconds)
+            loop_lag_current.set(self.lag_seconds)
+
+    def start(self) -> None:
+        """Start sampling, and the watchdog if enabled."""
+        if self._task is not None:
+            return
+        self._heartbeat = time.perf_counter()
+        self._task = asyncio.create_task(self.run())
+        if self.watchdog:
+            self._loop_thread_id = threading.get_ident()
+            self._stop_event.clear()
+            self._watchdog_thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog_thread.start()
+
+    async def stop(self) -> None:
+        """Stop sampling and the watchdog."""
+        if self._watchdog_thread is not None:
+            self._stop_event.set()
+            self._watchdog_thread.join()
+            self._watchdog_thread = None
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _watch(self) -> None:
+        reported = None
+        while not self._stop_event.wait(self.blocking_threshold / 2):
+            heartbeat = self._heartbeat
+            overdue = time.perf_counter() - heartbeat - self.interval
+            if overdue < self.blocking_threshold or heartbeat == reported:
+                continue
+            reported = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            self.last_blocking_stack = stack
+            loop_blocked.inc()
+            logger.warning(f"Event loop blocked for at least {overdue * 1000:.0f}ms in:\n{stack}")
+
+
+# Global loop lag monitor instance
+loop_monitor = LoopLagMonitor()
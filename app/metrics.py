@@ -0,0 +1,286 @@
+"""In-process metrics registry rendered in the Prometheus text format."""
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Request latency buckets in seconds, dense around the 100-500ms SLOs
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """Base for metrics holding one child per label combination."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increment the child for a label combination."""
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """Decrement the child for a label combination."""
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set the child for a label combination."""
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets.
+
+    Observing is a bisect and two additions; buckets are made cumulative
+    only when rendered.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per child: [bucket counts..., +Inf count, sum]
+        self._children: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record an observation for a label combination."""
+        child = self._children.get(labels)
+        if child is None:
+            child = self._children[labels] = [0] * (len(self.buckets) + 2)
+        child[bisect_left(self.buckets, value)] += 1
+        child[-1] += value
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {int(cumulative)}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(child[-1])}")
+            lines.append(f"{self.name}_count{label_str} {int(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics and scrape-time collectors."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[_Metric]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[_Metric]]) -> None:
+        """Add a callable producing metrics at scrape time, for values read from elsewhere."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        metrics = list(self._metrics.values())
+        for collector in self._collectors:
+            metrics.extend(collector())
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template, method and status.", ("route", "method", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template, method and status.",
+    ("route", "method", "status")
+)
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+cache_requests = registry.counter(
+    "cache_requests_total", "CacheManager lookups by namespace and result.", ("namespace", "result")
+)
+upstream_duration = registry.histogram(
+    "upstream_request_duration_seconds", "Upstream call attempts by service, method and outcome.",
+    ("service", "method", "outcome")
+)
+
+
+def _collect_components() -> Iterable[_Metric]:
+    """Read sizes and counters kept by storage, caches and background workers."""
+    # Imported here: those modules record into this one
+    from app.admission import admission_controller
+    from app.clients import entity_near_cache
+    from app.logging_pipeline import logging_pipeline
+    from app.rate_limit import rate_limiter
+    from app.security import claims_cache
+    from app.services import storage
+    from app.services.entity_sync_service import entity_sync_service
+    from app.services.notification_dispatcher import notification_dispatcher
+
+    tables = Gauge("storage_table_rows", "Rows held in each storage table.", ("table",))
+    for table, rows in (
+        ("profiles", storage.profiles_db),
+        ("addresses", storage.addresses_db),
+        ("kyc_workflows", storage.kyc_workflows_db),
+        ("documents", storage.documents_db),
+        ("consents", storage.consents_db),
+        ("enrichments", storage.enrichments_db),
+        ("audit_entries", storage.audit_entries_db),
+        ("entity_outbox", storage.entity_outbox_db),
+        ("notification_outbox", storage.notification_outbox_db),
+    ):
+        tables.set(len(rows), table)
+
+    near_cache = Counter("entity_near_cache_events_total", "Entity near-cache events.", ("event",))
+    for event, value in entity_near_cache.counters.items():
+        near_cache.inc(event, amount=value)
+
+    claims = Counter("jwt_claims_cache_requests_total", "Verified-claims cache lookups by result.", ("result",))
+    claims.inc("hit", amount=claims_cache.counters["hits"])
+    claims.inc("miss", amount=claims_cache.counters["misses"])
+
+    limited = Counter("rate_limited_requests_total", "Requests rejected by rate limit rule.", ("rule",))
+    for rule, value in rate_limiter.counters.items():
+        limited.inc(rule, amount=value)
+
+    sync = Counter("entity_sync_events_total", "Entity-service outbox events.", ("event",))
+    for event, value in entity_sync_service.counters.items():
+        sync.inc(event, amount=value)
+
+    notifications = Counter("notification_events_total", "Notification outbox events.", ("event",))
+    for event, value in notification_dispatcher.counters.items():
+        notifications.inc(event, amount=value)
+
+    log_stats = logging_pipeline.stats()
+    log_queue = Gauge("log_queue_depth", "Log records waiting for the listener thread.")
+    log_queue.set(log_stats["queued"])
+    log_records = Counter("log_records_total", "Log records by pipeline outcome.", ("outcome",))
+    for outcome in ("enqueued", "dropped", "sampled_out"):
+        log_records.inc(outcome, amount=log_stats[outcome])
+
+    shed = Counter("admission_shed_requests_total", "Requests rejected by admission control by priority class.", ("priority",))
+    for priority, value in admission_controller.shed.items():
+        shed.inc(priority, amount=value)
+
+    return [tables, near_cache, claims, limited, sync, notifications, log_queue, log_records, shed]
+
+
+registry.register_collector(_collect_components)
+
+
+def _route_template(scope: Scope) -> str:
+    # Templates rather than raw paths keep label cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Records per-route request counts, latency and in-flight requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = "500"
+        http_in_flight.inc()
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            # The router records the matched route in the scope
+            route = _route_template(scope)
+            http_in_flight.dec()
+            http_requests.inc(route, scope["method"], status)
+            http_request_duration.observe(time.perf_counter() - start, route, scope["method"], status)
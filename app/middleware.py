@@ -3,23 +3,39 @@
 import logging
 import time
 import uuid
-from typing import Callable
+from typing import Any, Dict, Optional
 
-from fastapi import Request, Response
+from fastapi import Request
 from fastapi.responses import JSONResponse
-from jose import JWTError, jwt
-from starlette.middleware.base import BaseHTTPMiddleware
+from jose import JWTError
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.config import config
+from app.deadline import DeadlineExceeded, deadline_for_request, reset_deadline, set_deadline
+from app.rate_limit import RateLimitExceeded
+from app.security import verify_token_async
 
 logger = logging.getLogger(__name__)
 
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    """Middleware to manage request context (correlation ID, JWT extraction)."""
+class RequestContextMiddleware:
+    """Middleware to manage request context (correlation ID, JWT extraction).
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    Implemented as plain ASGI rather than `BaseHTTPMiddleware`, which adds a
+    task and stream wrapper per request and buffers streaming responses.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and add context."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
+        
         # Generate or extract correlation ID
         correlation_id = request.headers.get("X-Correlation-Id", str(uuid.uuid4()))
         request.state.correlation_id = correlation_id
@@ -29,11 +45,7 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
         if auth_header.startswith("Bearer "):
             token = auth_header.split(" ")[1]
             try:
-                payload = jwt.decode(
-                    token,
-                    config.security.jwt_secret_key,
-                    algorithms=[config.security.jwt_algorithm]
-                )
+                payload = await verify_token_async(token)
                 request.state.user_id = payload.get("user_id")
                 request.state.tenant_id = payload.get("tenant_id")
                 request.state.role = payload.get("role")
@@ -44,61 +56,141 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
         else:
             request.state.authenticated = False
         
+        # Derive the request deadline so upstream calls can respect it
+        deadline = deadline_for_request(request.url.path, request.headers)
+        request.state.deadline = deadline
+        deadline_token = set_deadline(deadline)
+        
         # Process request
         start_time = time.time()
-        response = await call_next(request)
-        duration = time.time() - start_time
+        status_code = 500
         
-        # Add headers to response
-        response.headers["X-Correlation-Id"] = correlation_id
-        response.headers["X-Response-Time"] = f"{duration:.3f}s"
+        async def send_with_context(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add headers to response
+                headers = MutableHeaders(scope=message)
+                headers["X-Correlation-Id"] = correlation_id
+                headers["X-Response-Time"] = f"{time.time() - start_time:.3f}s"
+            await send(message)
         
-        # Log request
-        logger.info(
-            f"{request.method} {request.url.path} - {response.status_code}",
-            extra={
-                "correlation_id": correlation_id,
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "duration": duration,
-                "user_id": getattr(request.state, "user_id", None)
-            }
-        )
-        
-        return response
+        try:
+            await self.app(scope, receive, send_with_context)
+        finally:
+            reset_deadline(deadline_token)
+            duration = time.time() - start_time
+            
+            # Log request
+            logger.info(
+                f"{request.method} {request.url.path} - {status_code}",
+                extra={
+                    "correlation_id": correlation_id,
+                    "method": request.method,
+                    "path": request.url.path,
+                    "status_code": status_code,
+                    "duration": duration,
+                    "user_id": getattr(request.state, "user_id", None)
+                }
+            )
 
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
+class ErrorHandlingMiddleware:
     """Middleware for global error handling."""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Handle errors globally."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_tracking_start)
         except Exception as e:
-            logger.error(
-                f"Unhandled exception: {str(e)}",
-                exc_info=True,
-                extra={"correlation_id": getattr(request.state, "correlation_id", "unknown")}
-            )
-            return JSONResponse(
-                status_code=500,
-                content={
-                    "success": False,
-                    "error": {
-                        "code": "INTERNAL_SERVER_ERROR",
-                        "message": "An unexpected error occurred",
-                        "details": None
-                    },
-                    "data": None,
-                    "metadata": {
-                        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                        "correlation_id": getattr(request.state, "correlation_id", "unknown")
-                    }
-                }
-            )
+            # Once headers are on the wire the response can't be replaced
+            if response_started:
+                raise
+            correlation_id = scope.get("state", {}).get("correlation_id", "unknown")
+            response = _exception_response(e, correlation_id)
+            await response(scope, receive, send)
+
+
+def _exception_response(exc: Exception, correlation_id: str) -> JSONResponse:
+    """Map an unhandled exception to an error envelope response."""
+    if isinstance(exc, RateLimitExceeded):
+        logger.info(
+            f"Rate limited: {exc.rule}",
+            extra={"correlation_id": correlation_id}
+        )
+        return error_response(
+            429,
+            "RATE_LIMITED",
+            "Too many requests, please retry later",
+            correlation_id,
+            details={"limit": exc.rule},
+            headers={"Retry-After": exc.retry_after_header}
+        )
+    if isinstance(exc, DeadlineExceeded):
+        logger.warning(
+            f"Request deadline exceeded: {str(exc)}",
+            extra={"correlation_id": correlation_id}
+        )
+        return error_response(
+            504,
+            "DEADLINE_EXCEEDED",
+            "The request could not be completed within its deadline",
+            correlation_id
+        )
+    logger.error(
+        f"Unhandled exception: {str(exc)}",
+        exc_info=exc,
+        extra={"correlation_id": correlation_id}
+    )
+    return error_response(
+        500,
+        "INTERNAL_SERVER_ERROR",
+        "An unexpected error occurred",
+        correlation_id
+    )
+
+
+def error_response(
+    status_code: int,
+    code: str,
+    message: str,
+    correlation_id: Optional[str],
+    details: Any = None,
+    headers: Optional[Dict[str, str]] = None
+) -> JSONResponse:
+    """Build a response in the standard error envelope."""
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "success": False,
+            "error": {
+                "code": code,
+                "message": message,
+                "details": details
+            },
+            "data": None,
+            "metadata": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "correlation_id": correlation_id or "unknown"
+            }
+        },
+        headers=headers
+    )
 
 
 def extract_user_context(request: Request) -> dict:
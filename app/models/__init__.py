@@ -8,6 +8,7 @@ from app.models.document import *
 from app.models.consent import *
 from app.models.enrichment import *
 from app.models.audit import *
+from app.models.change import *
 from app.models.common import *
 
 __all__ = [
@@ -24,5 +25,6 @@ __all__ = [
     "Consent", "ConsentDecision", "ConsentResponse",
     "Enrichment", "EnrichmentCreate", "EnrichmentReview", "EnrichmentResponse",
     "AuditEntry", "AuditResponse",
+    "ChangeRecord", "ChangeFeedResponse",
     "ErrorResponse", "SuccessResponse", "PaginationMetadata",
 ]
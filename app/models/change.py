@@ -0,0 +1,23 @@
+"""Change feed models."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ChangeRecord(BaseModel):
+    """A storage mutation in the change feed."""
+    sequence: int
+    entity: str
+    id: str
+    profile_id: Optional[str] = None
+    operation: str
+    fields: List[str]
+    version: int
+
+
+class ChangeFeedResponse(BaseModel):
+    """A page of the change feed."""
+    changes: List[ChangeRecord]
+    next_token: str
+    has_more: bool
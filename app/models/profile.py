@@ -1,11 +1,15 @@
 """Profile models."""
 
 from datetime import date, datetime, timezone
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
+from app.models.address import AddressResponse
+from app.models.common import ErrorDetail
+from app.models.consent import ConsentResponse
+from app.models.document import DocumentResponse
 from app.models.enums import (
     EmploymentStatus,
     Gender,
@@ -13,6 +17,7 @@ from app.models.enums import (
     MaritalStatus,
     ProfileStatus,
 )
+from app.models.kyc import KYCStatusResponse
 
 
 class ProfileBase(BaseModel):
@@ -128,6 +133,47 @@ class ProfileResponse(BaseModel):
     aadhaar_masked: Optional[str] = None
 
 
+class ProfileBatchGetRequest(BaseModel):
+    """Batch profile read request."""
+    profile_ids: List[str] = Field(..., min_length=1)
+    fields: Optional[List[str]] = None
+
+
+class ProfileBatchItem(BaseModel):
+    """One result of a batch profile read, in request order."""
+    profile_id: str
+    data: Optional[ProfileResponse] = None
+    error: Optional[ErrorDetail] = None
+
+
+class ProfileBundleResponse(BaseModel):
+    """Profile with the sub-resources requested through `include`."""
+    profile: ProfileResponse
+    addresses: Optional[List[AddressResponse]] = None
+    kyc: Optional[KYCStatusResponse] = None
+    consents: Optional[List[ConsentResponse]] = None
+    documents: Optional[List[DocumentResponse]] = None
+
+
+class SyncDeletedRecord(BaseModel):
+    """A record soft-deleted since the client's version."""
+    entity: str
+    id: str
+    deleted_at: datetime
+
+
+class ProfileSyncResponse(BaseModel):
+    """Records changed since the client's last sync, and the token to sync from next."""
+    since: str
+    full: bool
+    profile: Optional[ProfileResponse] = None
+    addresses: List[AddressResponse] = []
+    documents: List[DocumentResponse] = []
+    consents: List[ConsentResponse] = []
+    kyc: Optional[KYCStatusResponse] = None
+    deleted: List[SyncDeletedRecord] = []
+
+
 class ProfileCompletenessResponse(BaseModel):
     """Profile completeness response."""
     overall_completeness: float
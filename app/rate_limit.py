@@ -0,0 +1,221 @@
+"""Rate limiting with the generic cell rate algorithm (GCRA)."""
+
+import logging
+import math
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from fastapi import Depends, Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 86400
+MONTH = 30 * DAY
+
+# Paths never subject to the global request limits
+EXEMPT_PATH_PREFIXES = ("/health", "/healthz", "/readyz", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+# GCRA in Redis: one key per limited identity holding its theoretical arrival
+# time. Uses the server clock so replicas with skewed clocks agree.
+GCRA_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0'}
+"""
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request exceeds a rate limit."""
+
+    def __init__(self, rule: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded: {rule}")
+        self.rule = rule
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After value in whole seconds."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class RateLimitRule(NamedTuple):
+    """At most `limit` requests per `period` seconds, allowing a full burst."""
+
+    limit: int
+    period: float
+
+    @property
+    def interval(self) -> float:
+        return self.period / self.limit
+
+
+class InMemoryRateLimitBackend:
+    """Per-replica GCRA state: one float per key.
+
+    GCRA needs only the key's theoretical arrival time, so memory per key is
+    constant regardless of the limit, unlike a sliding log.
+    """
+
+    SWEEP_EVERY = 10000
+
+    def __init__(self):
+        self._tat: Dict[str, float] = {}
+        self._calls = 0
+
+    async def hit(self, key: str, rule: RateLimitRule) -> Tuple[bool, float]:
+        """Record a request; returns (allowed, seconds until allowed)."""
+        return self.hit_sync(key, rule, time.monotonic())
+
+    def hit_sync(self, key: str, rule: RateLimitRule, now: float) -> Tuple[bool, float]:
+        """Check and update a key's GCRA state."""
+        tat = self._tat.get(key, now)
+        if tat < now:
+            tat = now
+        new_tat = tat + rule.interval
+        allow_at = new_tat - rule.period
+        if now < allow_at:
+            return False, allow_at - now
+
+        self._tat[key] = new_tat
+        self._calls += 1
+        if self._calls >= self.SWEEP_EVERY:
+            self._sweep(now)
+        return True, 0.0
+
+    def reset(self) -> None:
+        """Forget all keys."""
+        self._tat.clear()
+        self._calls = 0
+
+    def _sweep(self, now: float) -> None:
+        # A key whose arrival time has passed is indistinguishable from a new one
+        self._calls = 0
+        for key in [k for k, tat in self._tat.items() if tat <= now]:
+            del self._tat[key]
+
+
+class RedisRateLimitBackend:
+    """GCRA state shared across replicas, updated atomically by a Lua script."""
+
+    def __init__(self, redis_url: Optional[str] = None):
+        try:
+            import redis.asyncio as aioredis
+            self.redis = aioredis.from_url(redis_url or config.caching.redis_url)
+            self._script = self.redis.register_script(GCRA_LUA)
+        except Exception as e:
+            logger.warning(f"Failed to connect to Redis for rate limiting: {e}. Rate limits are not enforced.")
+            self.redis = None
+            self._script = None
+
+    async def hit(self, key: str, rule: RateLimitRule) -> Tuple[bool, float]:
+        """Record a request; returns (allowed, seconds until allowed)."""
+        if not self._script:
+            return True, 0.0
+        try:
+            allowed, retry_after = await self._script(keys=[key], args=[rule.interval, rule.period])
+        except Exception as e:
+            # Fail open: an unavailable limiter must not take the API down
+            logger.error(f"Redis rate limit error: {e}")
+            return True, 0.0
+        return bool(int(allowed)), float(retry_after)
+
+    def reset(self) -> None:
+        """Keys expire on their own in Redis."""
+
+
+class RateLimiter:
+    """Applies the configured rate limit rules."""
+
+    def __init__(self, backend=None):
+        if backend is None:
+            if config.rate_limiting.backend == "redis":
+                backend = RedisRateLimitBackend()
+            else:
+                backend = InMemoryRateLimitBackend()
+        self.backend = backend
+        window = config.rate_limiting.window_ms / 1000
+        self.rules: Dict[str, RateLimitRule] = {
+            "user": RateLimitRule(config.rate_limiting.max_requests_per_user, window),
+            "tenant": RateLimitRule(config.rate_limiting.max_requests_per_tenant, window),
+            "ip": RateLimitRule(config.rate_limiting.max_requests_per_ip, window),
+            "profile_update": RateLimitRule(config.rate_limiting.profile_update_per_hour, HOUR),
+            "address_add": RateLimitRule(config.rate_limiting.address_add_per_month, MONTH),
+            "document_upload": RateLimitRule(config.rate_limiting.document_upload_per_day, DAY),
+        }
+        self.counters: Dict[str, int] = {name: 0 for name in self.rules}
+
+    async def check(self, rule_name: str, identity: str) -> None:
+        """Count a request against a rule, raising `RateLimitExceeded` if over the limit."""
+        allowed, retry_after = await self.backend.hit(f"rl:{rule_name}:{identity}", self.rules[rule_name])
+        if not allowed:
+            self.counters[rule_name] += 1
+            raise RateLimitExceeded(rule_name, retry_after)
+
+    def reset(self) -> None:
+        """Clear limiter state."""
+        self.backend.reset()
+        for name in self.counters:
+            self.counters[name] = 0
+
+
+def _client_ip(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def rate_limit(rule_name: str):
+    """Route dependency enforcing a per-user operation limit."""
+    async def dependency(request: Request) -> None:
+        if not config.rate_limiting.enabled:
+            return
+        identity = getattr(request.state, "user_id", None) or _client_ip(request.scope)
+        await rate_limiter.check(rule_name, identity)
+
+    return Depends(dependency)
+
+
+class RateLimitMiddleware:
+    """Enforces the global per-user, per-tenant and per-IP request limits.
+
+    Must run inside `RequestContextMiddleware`, which sets the user and
+    tenant on the request state.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not config.rate_limiting.enabled or scope["path"].startswith(EXEMPT_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.get("state", {})
+        user_id = state.get("user_id")
+        if user_id:
+            await rate_limiter.check("user", user_id)
+            if state.get("tenant_id"):
+                await rate_limiter.check("tenant", state["tenant_id"])
+        else:
+            await rate_limiter.check("ip", _client_ip(scope))
+
+        await self.app(scope, receive, send)
+
+
+# Global rate limiter instance
+rate_limiter = RateLimiter()
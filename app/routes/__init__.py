@@ -1,9 +1,10 @@
 """API routes."""
 
-from app.routes import health, profiles, addresses, kyc, documents, consents, enrichment, audit, reference
+from app.routes import health, metrics, profiles, addresses, kyc, documents, consents, enrichment, audit, reference, events, changes
 
 __all__ = [
     "health",
+    "metrics",
     "profiles",
     "addresses",
     "kyc",
@@ -12,4 +13,6 @@ __all__ = [
     "enrichment",
     "audit",
     "reference",
+    "events",
+    "changes",
 ]
@@ -6,52 +6,45 @@ from fastapi import APIRouter, HTTPException, Request, status
 
 from app.middleware import extract_user_context
 from app.models.address import AddressCreate, AddressResponse, AddressUpdate
-from app.models.common import ResponseMetadata, SuccessResponse
+from app.models.common import SuccessResponse
+from app.rate_limit import rate_limit
+from app.serialization import Projection, conditional_response, fields_query, sparse, success_response
 from app.services.address_service import address_service
 from app.services.profile_service import profile_service
+from app.tracing import TracedRoute
 
-router = APIRouter(prefix="/api/v1/profiles/me/addresses", tags=["Addresses"])
+router = APIRouter(prefix="/api/v1/profiles/me/addresses", tags=["Addresses"], route_class=TracedRoute)
+
+address_projection = Projection(AddressResponse)
 
 
 @router.get("", response_model=SuccessResponse[List[AddressResponse]])
 async def get_addresses(
     request: Request,
-    type: Optional[str] = None
+    type: Optional[str] = None,
+    fields: Optional[str] = fields_query()
 ):
     """Get user's addresses."""
     context = extract_user_context(request)
     if not context["authenticated"]:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
     
+    projection = sparse(address_projection, fields)
     profile = await profile_service.get_own_profile(context["user_id"], context["role"])
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
     
     addresses = await address_service.get_addresses(profile["id"], type)
     
-    address_responses = [
-        AddressResponse(
-            id=addr["id"],
-            type=addr["type"],
-            address_line1=addr["address_line1"],
-            address_line2=addr.get("address_line2"),
-            city=addr["city"],
-            state=addr["state"],
-            postal_code=addr["postal_code"],
-            country=addr["country"],
-            is_primary=addr["is_primary"],
-            verification_status=addr["verification_status"],
-            verified_at=addr.get("verified_at"),
-            created_at=addr["created_at"],
-            updated_at=addr["updated_at"]
-        )
-        for addr in addresses
-    ]
-    
-    return SuccessResponse(data=address_responses, metadata=ResponseMetadata(correlation_id=context["correlation_id"]))
+    return conditional_response(request, projection.many(addresses), context["correlation_id"])
 
 
-@router.post("", response_model=SuccessResponse[AddressResponse], status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=SuccessResponse[AddressResponse],
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[rate_limit("address_add")]
+)
 async def create_address(
     request: Request,
     address_data: AddressCreate
@@ -75,23 +68,7 @@ async def create_address(
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    response = AddressResponse(
-        id=address["id"],
-        type=address["type"],
-        address_line1=address["address_line1"],
-        address_line2=address.get("address_line2"),
-        city=address["city"],
-        state=address["state"],
-        postal_code=address["postal_code"],
-        country=address["country"],
-        is_primary=address["is_primary"],
-        verification_status=address["verification_status"],
-        verified_at=address.get("verified_at"),
-        created_at=address["created_at"],
-        updated_at=address["updated_at"]
-    )
-    
-    return SuccessResponse(data=response, metadata=ResponseMetadata(correlation_id=context["correlation_id"]))
+    return success_response(address_projection(address), context["correlation_id"], status_code=status.HTTP_201_CREATED)
 
 
 @router.patch("/{address_id}", response_model=SuccessResponse[AddressResponse])
@@ -115,23 +92,7 @@ async def update_address(
     if not address:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
     
-    response = AddressResponse(
-        id=address["id"],
-        type=address["type"],
-        address_line1=address["address_line1"],
-        address_line2=address.get("address_line2"),
-        city=address["city"],
-        state=address["state"],
-        postal_code=address["postal_code"],
-        country=address["country"],
-        is_primary=address["is_primary"],
-        verification_status=address["verification_status"],
-        verified_at=address.get("verified_at"),
-        created_at=address["created_at"],
-        updated_at=address["updated_at"]
-    )
-    
-    return SuccessResponse(data=response, metadata=ResponseMetadata(correlation_id=context["correlation_id"]))
+    return success_response(address_projection(address), context["correlation_id"])
 
 
 @router.delete("/{address_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -6,11 +6,15 @@ from fastapi import APIRouter, HTTPException, Query, Request, status
 
 from app.middleware import extract_user_context
 from app.models.audit import AuditResponse
-from app.models.common import ResponseMetadata, SuccessResponse
+from app.models.common import SuccessResponse
+from app.serialization import Projection, success_response
 from app.services.audit_service import audit_service
 from app.services.profile_service import profile_service
+from app.tracing import TracedRoute
 
-router = APIRouter(prefix="/api/v1/profiles/me/audit", tags=["Audit"])
+router = APIRouter(prefix="/api/v1/profiles/me/audit", tags=["Audit"], route_class=TracedRoute)
+
+_audit_entry = Projection(AuditResponse)
 
 
 @router.get("", response_model=SuccessResponse[List[AuditResponse]])
@@ -36,20 +40,4 @@ async def get_audit_trail(
         action_type=action_type
     )
     
-    responses = [
-        AuditResponse(
-            id=entry["id"],
-            action=entry["action"],
-            actor_id=entry["actor_id"],
-            actor_role=entry.get("actor_role"),
-            from_value=entry.get("from_value"),
-            to_value=entry.get("to_value"),
-            field_name=entry.get("field_name"),
-            reason=entry.get("reason"),
-            timestamp=entry["timestamp"],
-            correlation_id=entry.get("correlation_id")
-        )
-        for entry in entries
-    ]
-    
-    return SuccessResponse(data=responses, metadata=ResponseMetadata(correlation_id=context["correlation_id"]))
+    return success_response(_audit_entry.many(entries), context["correlation_id"])
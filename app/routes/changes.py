@@ -0,0 +1,44 @@
+"""Change feed routes."""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+
+from app.config import config
+from app.middleware import extract_user_context
+from app.models.change import ChangeFeedResponse
+from app.models.common import SuccessResponse
+from app.serialization import success_response
+from app.services.change_feed_service import ResumeTokenExpired, change_feed_service
+from app.tracing import TracedRoute
+
+router = APIRouter(prefix="/api/v1/changes", tags=["Changes"], route_class=TracedRoute)
+
+
+@router.get("", response_model=SuccessResponse[ChangeFeedResponse])
+async def get_changes(
+    request: Request,
+    after: Optional[str] = Query(None, description="Resume token from the previous page's next_token"),
+    limit: int = Query(default=config.changes.default_limit, ge=1, le=config.changes.max_limit)
+):
+    """Get storage changes in sequence order, for downstream systems to sync incrementally.
+
+    Without `after` the feed starts at the oldest retained change. A 410
+    means the token's position is no longer retained: re-read full state
+    and start again without `after`.
+    """
+    context = extract_user_context(request)
+    if not context["authenticated"]:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    
+    if not await change_feed_service.can_read(context["user_id"], context["correlation_id"]):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        page = change_feed_service.get_changes(after, limit)
+    except ResumeTokenExpired as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return success_response(page, context["correlation_id"])
@@ -7,10 +7,14 @@ from fastapi import APIRouter, HTTPException, Request, status
 from app.middleware import extract_user_context
 from app.models.common import ResponseMetadata, SuccessResponse
 from app.models.consent import ConsentDecision, ConsentResponse
+from app.serialization import Projection, success_response
 from app.services.consent_service import consent_service
 from app.services.profile_service import profile_service
+from app.tracing import TracedRoute
 
-router = APIRouter(prefix="/api/v1/profiles/me/consents", tags=["Consents"])
+router = APIRouter(prefix="/api/v1/profiles/me/consents", tags=["Consents"], route_class=TracedRoute)
+
+consent_projection = Projection(ConsentResponse, sources={"version": "consent_version"})
 
 
 @router.get("", response_model=SuccessResponse[List[ConsentResponse]])
@@ -26,19 +30,7 @@ async def get_consents(request: Request):
     
     consents = await consent_service.get_consents(profile["id"])
     
-    responses = [
-        ConsentResponse(
-            id=c["id"],
-            consent_type=c["consent_type"],
-            status=c["status"],
-            accepted_at=c.get("accepted_at"),
-            version=c["consent_version"],
-            created_at=c["created_at"]
-        )
-        for c in consents
-    ]
-    
-    return SuccessResponse(data=responses, metadata=ResponseMetadata(correlation_id=context["correlation_id"]))
+    return success_response(consent_projection.many(consents), context["correlation_id"])
 
 
 @router.post("/{consent_type}", response_model=SuccessResponse[ConsentResponse])
@@ -7,13 +7,23 @@ from fastapi import APIRouter, HTTPException, Request, status
 from app.middleware import extract_user_context
 from app.models.common import ResponseMetadata, SuccessResponse
 from app.models.document import DocumentResponse, DocumentUpload, DocumentVerify
+from app.rate_limit import rate_limit
+from app.serialization import Projection, conditional_response, fields_query, sparse
 from app.services.document_service import document_service
 from app.services.profile_service import profile_service
+from app.tracing import TracedRoute
 
-router = APIRouter(prefix="/api/v1/profiles/me/documents", tags=["Documents"])
+router = APIRouter(prefix="/api/v1/profiles/me/documents", tags=["Documents"], route_class=TracedRoute)
 
+document_projection = Projection(DocumentResponse, sources={"uploaded_at": "created_at"})
 
-@router.post("", response_model=SuccessResponse[DocumentResponse], status_code=status.HTTP_201_CREATED)
+
+@router.post(
+    "",
+    response_model=SuccessResponse[DocumentResponse],
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[rate_limit("document_upload")]
+)
 async def upload_document(
     request: Request,
     document_upload: DocumentUpload
@@ -57,13 +67,15 @@ async def upload_document(
 async def get_documents(
     request: Request,
     document_type: Optional[str] = None,
-    verification_status: Optional[str] = None
+    verification_status: Optional[str] = None,
+    fields: Optional[str] = fields_query()
 ):
     """Get documents."""
     context = extract_user_context(request)
     if not context["authenticated"]:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
     
+    projection = sparse(document_projection, fields)
     profile = await profile_service.get_own_profile(context["user_id"], context["role"])
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
@@ -71,26 +83,11 @@ async def get_documents(
     documents = await document_service.get_documents(
         profile_id=profile["id"],
         document_type=document_type,
-        verification_status=verification_status
+        verification_status=verification_status,
+        correlation_id=context["correlation_id"]
     )
     
-    responses = [
-        DocumentResponse(
-            id=doc["id"],
-            document_id=doc["document_id"],
-            document_type=doc["document_type"],
-            issue_date=doc.get("issue_date"),
-            expiry_date=doc.get("expiry_date"),
-            verification_status=doc["verification_status"],
-            verified_by=doc.get("verified_by"),
-            verified_at=doc.get("verified_at"),
-            uploaded_at=doc["created_at"],
-            download_url=doc.get("download_url")
-        )
-        for doc in documents
-    ]
-    
-    return SuccessResponse(data=responses, metadata=ResponseMetadata(correlation_id=context["correlation_id"]))
+    return conditional_response(request, projection.many(documents), context["correlation_id"])
 
 
 @router.post("/{profile_id}/documents/{document_id}/verify", response_model=SuccessResponse[DocumentResponse])
@@ -6,8 +6,9 @@ from app.middleware import extract_user_context
 from app.models.common import ResponseMetadata, SuccessResponse
 from app.models.enrichment import EnrichmentCreate, EnrichmentResponse, EnrichmentReview
 from app.services.enrichment_service import enrichment_service
+from app.tracing import TracedRoute
 
-router = APIRouter(prefix="/api/v1/profiles", tags=["Enrichment"])
+router = APIRouter(prefix="/api/v1/profiles", tags=["Enrichment"], route_class=TracedRoute)
 
 
 @router.post("/{profile_id}/enrichment", response_model=SuccessResponse[EnrichmentResponse], status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,71 @@
+"""Server-sent event stream routes."""
+
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.config import config
+from app.events import ENRICHMENT_TOPIC, StreamLimitExceeded, Subscription, change_bus, profile_topic
+from app.middleware import extract_user_context
+from app.services.profile_service import profile_service
+from app.tracing import TracedRoute
+
+router = APIRouter(prefix="/api/v1/events", tags=["Events"], route_class=TracedRoute)
+
+# Roles that take part in maker-checker enrichment
+OFFICER_ROLES = frozenset({"risk_officer", "credit_officer", "senior_risk_officer", "senior_credit_officer"})
+
+
+async def event_stream(subscription: Subscription) -> AsyncIterator[bytes]:
+    """SSE frames for a subscription, with heartbeats while idle, until it closes."""
+    try:
+        yield f"retry: {config.events.retry_ms}\n\n".encode()
+        while True:
+            frame = await subscription.next_frame(config.events.heartbeat_seconds)
+            if frame is None:
+                return
+            yield frame
+    finally:
+        change_bus.unsubscribe(subscription)
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """Stream KYC status changes for the caller's profile, and maker-checker decisions for officers.
+
+    Events: `kyc.updated` (status and completed checks), `enrichment.submitted`
+    and `enrichment.reviewed`. Reconnect with `Last-Event-ID` to receive
+    missed events; a `reset` event means they are no longer available and
+    current state should be refetched.
+    """
+    context = extract_user_context(request)
+    if not context["authenticated"]:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    topics = []
+    profile = await profile_service.get_own_profile(context["user_id"], context["role"], fields=frozenset({"id"}))
+    if profile:
+        topics.append(profile_topic(profile["id"]))
+    if context["role"] in OFFICER_ROLES:
+        topics.append(ENRICHMENT_TOPIC)
+    if not topics:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    try:
+        subscription = change_bus.subscribe(context["user_id"], topics, last_event_id)
+    except StreamLimitExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS if e.per_user else status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(config.events.retry_ms // 1000 or 1)}
+        )
+
+    return StreamingResponse(
+        event_stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,23 +1,33 @@
 """KYC routes."""
 
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Request, status
 
 from app.middleware import extract_user_context
 from app.models.common import ResponseMetadata, SuccessResponse
 from app.models.kyc import KYCInitiate, KYCInitiateResponse, KYCStatusResponse
+from app.serialization import Projection, conditional_response, fields_query, sparse
 from app.services.kyc_service import kyc_service
 from app.services.profile_service import profile_service
+from app.tracing import TracedRoute
+
+router = APIRouter(prefix="/api/v1/profiles/me/kyc", tags=["KYC"], route_class=TracedRoute)
 
-router = APIRouter(prefix="/api/v1/profiles/me/kyc", tags=["KYC"])
+kyc_status_projection = Projection(KYCStatusResponse, sources={"kyc_id": "id", "kyc_status": "status"})
 
 
 @router.get("", response_model=SuccessResponse[KYCStatusResponse])
-async def get_kyc_status(request: Request):
+async def get_kyc_status(
+    request: Request,
+    fields: Optional[str] = fields_query()
+):
     """Get KYC status."""
     context = extract_user_context(request)
     if not context["authenticated"]:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
     
+    projection = sparse(kyc_status_projection, fields)
     profile = await profile_service.get_own_profile(context["user_id"], context["role"])
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
@@ -27,22 +37,7 @@ async def get_kyc_status(request: Request):
     if not kyc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="KYC not initiated")
     
-    response = KYCStatusResponse(
-        kyc_id=kyc["id"],
-        kyc_status=kyc["status"],
-        kyc_type=kyc["kyc_type"],
-        completed_checks=kyc["completed_checks"],
-        identity_verification_date=kyc.get("identity_verification_date"),
-        address_verification_date=kyc.get("address_verification_date"),
-        income_verification_date=kyc.get("income_verification_date"),
-        document_verification_date=kyc.get("document_verification_date"),
-        rejection_reason=kyc.get("rejection_reason"),
-        expiry_date=kyc.get("expiry_date"),
-        created_at=kyc["created_at"],
-        updated_at=kyc["updated_at"]
-    )
-    
-    return SuccessResponse(data=response, metadata=ResponseMetadata(correlation_id=context["correlation_id"]))
+    return conditional_response(request, projection(kyc), context["correlation_id"])
 
 
 @router.post("/initiate", response_model=SuccessResponse[KYCInitiateResponse], status_code=status.HTTP_201_CREATED)
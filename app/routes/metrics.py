@@ -0,0 +1,13 @@
+"""Metrics routes."""
+
+from fastapi import APIRouter, Response
+
+from app.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,24 +1,54 @@
 """Profile routes."""
 
+import asyncio
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 
+from app.config import config
 from app.middleware import extract_user_context
 from app.models.common import ResponseMetadata, SuccessResponse
 from app.models.profile import (
+    ProfileBatchGetRequest,
+    ProfileBatchItem,
+    ProfileBundleResponse,
     ProfileCompletenessResponse,
     ProfileResponse,
+    ProfileSyncResponse,
     ProfileUpdate,
 )
+from app.rate_limit import rate_limit
+from app.routes.addresses import address_projection
+from app.routes.consents import consent_projection
+from app.routes.documents import document_projection
+from app.routes.kyc import kyc_status_projection
+from app.serialization import (
+    Projection,
+    conditional_response,
+    fields_query,
+    json_datetime,
+    parse_fields,
+    sparse,
+    success_response,
+)
+from app.services.address_service import address_service
+from app.services.consent_service import consent_service
+from app.services.document_service import document_service
+from app.services.kyc_service import kyc_service
 from app.services.profile_service import profile_service
+from app.services.sync_service import sync_service
+from app.tracing import TracedRoute
+
+router = APIRouter(prefix="/api/v1/profiles", tags=["Profiles"], route_class=TracedRoute)
 
-router = APIRouter(prefix="/api/v1/profiles", tags=["Profiles"])
+profile_projection = Projection(ProfileResponse)
+# Updates and bank-side reads have never returned the masked identity fields
+bank_profile_projection = Projection(ProfileResponse, null_fields=("pan_id_masked", "aadhaar_masked"))
 
 
 @router.get("/me", response_model=SuccessResponse[ProfileResponse])
-async def get_own_profile(request: Request):
+async def get_own_profile(request: Request, fields: Optional[str] = fields_query()):
     """Get authenticated user's profile."""
     context = extract_user_context(request)
     
@@ -28,10 +58,12 @@ async def get_own_profile(request: Request):
             detail="Authentication required"
         )
     
+    projection = sparse(profile_projection, fields)
     profile = await profile_service.get_own_profile(
         user_id=context["user_id"],
         role=context["role"],
-        correlation_id=context["correlation_id"]
+        correlation_id=context["correlation_id"],
+        fields=projection.names
     )
     
     if not profile:
@@ -40,35 +72,116 @@ async def get_own_profile(request: Request):
             detail="Profile not found"
         )
     
-    # Convert to response model
-    profile_response = ProfileResponse(
-        id=profile["id"],
-        user_id=profile["user_id"],
-        full_name=profile.get("full_name"),
-        first_name=profile.get("first_name"),
-        last_name=profile.get("last_name"),
-        date_of_birth=profile.get("date_of_birth"),
-        gender=profile.get("gender"),
-        marital_status=profile.get("marital_status"),
-        phone=profile.get("phone"),
-        email=profile.get("email"),
-        occupation_type=profile.get("occupation_type"),
-        employer_name=profile.get("employer_name"),
-        employment_status=profile.get("employment_status"),
-        kyc_status=profile.get("kyc_status"),
-        completeness_percentage=profile.get("completeness_percentage", 0),
-        updated_at=profile.get("updated_at"),
-        pan_id_masked=profile.get("pan_id_masked"),
-        aadhaar_masked=profile.get("aadhaar_masked")
+    return conditional_response(request, projection(profile), context["correlation_id"])
+
+
+BUNDLE_INCLUDES = ("addresses", "kyc", "consents", "documents")
+
+
+@router.get("/me/bundle", response_model=SuccessResponse[ProfileBundleResponse])
+async def get_own_profile_bundle(
+    request: Request,
+    include: Optional[str] = Query(None, description=f"Comma-separated sub-resources: {', '.join(BUNDLE_INCLUDES)}")
+):
+    """Get own profile with its sub-resources in one call."""
+    context = extract_user_context(request)
+    
+    if not context["authenticated"]:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+    
+    includes = parse_fields(include) or frozenset()
+    unknown = includes.difference(BUNDLE_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}"
+        )
+    
+    profile = await profile_service.get_own_profile(
+        user_id=context["user_id"],
+        role=context["role"],
+        correlation_id=context["correlation_id"]
     )
     
-    return SuccessResponse(
-        data=profile_response,
-        metadata=ResponseMetadata(correlation_id=context["correlation_id"])
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    # Sub-resources load concurrently through their services and caches
+    profile_id = profile["id"]
+    loaders = {
+        "addresses": lambda: address_service.get_addresses(profile_id),
+        "kyc": lambda: kyc_service.get_kyc_status(profile_id),
+        "consents": lambda: consent_service.get_consents(profile_id),
+        "documents": lambda: document_service.get_documents(profile_id, correlation_id=context["correlation_id"]),
+    }
+    names = [name for name in BUNDLE_INCLUDES if name in includes]
+    results = await asyncio.gather(*(loaders[name]() for name in names))
+    loaded = dict(zip(names, results))
+    
+    bundle = {"profile": profile_projection(profile)}
+    if "addresses" in loaded:
+        bundle["addresses"] = address_projection.many(loaded["addresses"])
+    if "kyc" in loaded:
+        bundle["kyc"] = kyc_status_projection(loaded["kyc"]) if loaded["kyc"] else None
+    if "consents" in loaded:
+        bundle["consents"] = consent_projection.many(loaded["consents"])
+    if "documents" in loaded:
+        bundle["documents"] = document_projection.many(loaded["documents"])
+    
+    # One ETag over the whole bundle: it changes when any included part does
+    return conditional_response(request, bundle, context["correlation_id"])
+
+
+@router.get("/me/sync", response_model=SuccessResponse[ProfileSyncResponse])
+async def sync_own_profile(
+    request: Request,
+    since: Optional[str] = Query(default=None, description="Token returned by the client's previous sync; omit for a full sync")
+):
+    """Get own profile records created, updated or deleted since a version."""
+    context = extract_user_context(request)
+    
+    if not context["authenticated"]:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+    
+    profile = await profile_service.get_own_profile(
+        user_id=context["user_id"],
+        role=context["role"],
+        correlation_id=context["correlation_id"]
     )
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    try:
+        delta = await sync_service.get_delta(profile["id"], since, context["correlation_id"])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return success_response({
+        "since": delta["since"],
+        "full": delta["full"],
+        "profile": profile_projection(profile) if delta["profile_changed"] else None,
+        "addresses": address_projection.many(delta["addresses"]),
+        "documents": document_projection.many(delta["documents"]),
+        "consents": consent_projection.many(delta["consents"]),
+        "kyc": kyc_status_projection(delta["kyc"]) if delta["kyc"] else None,
+        "deleted": [{**record, "deleted_at": json_datetime(record["deleted_at"])} for record in delta["deleted"]]
+    }, context["correlation_id"])
 
 
-@router.patch("/me", response_model=SuccessResponse[ProfileResponse])
+@router.patch("/me", response_model=SuccessResponse[ProfileResponse], dependencies=[rate_limit("profile_update")])
 async def update_own_profile(
     request: Request,
     profile_update: ProfileUpdate
@@ -94,35 +207,62 @@ async def update_own_profile(
             detail="Profile not found"
         )
     
-    profile_response = ProfileResponse(
-        id=updated_profile["id"],
-        user_id=updated_profile["user_id"],
-        full_name=updated_profile.get("full_name"),
-        first_name=updated_profile.get("first_name"),
-        last_name=updated_profile.get("last_name"),
-        date_of_birth=updated_profile.get("date_of_birth"),
-        gender=updated_profile.get("gender"),
-        marital_status=updated_profile.get("marital_status"),
-        phone=updated_profile.get("phone"),
-        email=updated_profile.get("email"),
-        occupation_type=updated_profile.get("occupation_type"),
-        employer_name=updated_profile.get("employer_name"),
-        employment_status=updated_profile.get("employment_status"),
-        kyc_status=updated_profile.get("kyc_status"),
-        completeness_percentage=updated_profile.get("completeness_percentage", 0),
-        updated_at=updated_profile.get("updated_at")
-    )
+    return success_response(bank_profile_projection(updated_profile), context["correlation_id"])
+
+
+@router.post(":batchGet", response_model=SuccessResponse[List[ProfileBatchItem]])
+async def batch_get_profiles(
+    request: Request,
+    batch: ProfileBatchGetRequest
+):
+    """Get many profiles at once (bank-side dashboards); results follow the request order."""
+    context = extract_user_context(request)
     
-    return SuccessResponse(
-        data=profile_response,
-        metadata=ResponseMetadata(correlation_id=context["correlation_id"])
+    if not context["authenticated"]:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+    
+    if len(batch.profile_ids) > config.business.batch_get_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {config.business.batch_get_max_ids} profile ids per request"
+        )
+    
+    try:
+        projection = bank_profile_projection.select(frozenset(batch.fields) if batch.fields else None)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    profiles = await profile_service.get_profiles_by_ids(
+        profile_ids=batch.profile_ids,
+        user_id=context["user_id"],
+        role=context["role"],
+        correlation_id=context["correlation_id"],
+        fields=projection.names
     )
+    
+    items = []
+    for profile_id in batch.profile_ids:
+        profile = profiles[profile_id]
+        if profile is None:
+            items.append({
+                "profile_id": profile_id,
+                "data": None,
+                "error": {"code": "NOT_FOUND", "message": "Profile not found or access denied", "details": None}
+            })
+        else:
+            items.append({"profile_id": profile_id, "data": projection(profile), "error": None})
+    
+    return success_response(items, context["correlation_id"])
 
 
 @router.get("/{profile_id}", response_model=SuccessResponse[ProfileResponse])
 async def get_profile_by_id(
     profile_id: str,
-    request: Request
+    request: Request,
+    fields: Optional[str] = fields_query()
 ):
     """Get profile by ID (bank-side access)."""
     context = extract_user_context(request)
@@ -133,11 +273,13 @@ async def get_profile_by_id(
             detail="Authentication required"
         )
     
+    projection = sparse(bank_profile_projection, fields)
     profile = await profile_service.get_profile_by_id(
         profile_id=profile_id,
         user_id=context["user_id"],
         role=context["role"],
-        correlation_id=context["correlation_id"]
+        correlation_id=context["correlation_id"],
+        fields=projection.names
     )
     
     if not profile:
@@ -146,29 +288,7 @@ async def get_profile_by_id(
             detail="Profile not found or access denied"
         )
     
-    profile_response = ProfileResponse(
-        id=profile["id"],
-        user_id=profile["user_id"],
-        full_name=profile.get("full_name"),
-        first_name=profile.get("first_name"),
-        last_name=profile.get("last_name"),
-        date_of_birth=profile.get("date_of_birth"),
-        gender=profile.get("gender"),
-        marital_status=profile.get("marital_status"),
-        phone=profile.get("phone"),
-        email=profile.get("email"),
-        occupation_type=profile.get("occupation_type"),
-        employer_name=profile.get("employer_name"),
-        employment_status=profile.get("employment_status"),
-        kyc_status=profile.get("kyc_status"),
-        completeness_percentage=profile.get("completeness_percentage", 0),
-        updated_at=profile.get("updated_at")
-    )
-    
-    return SuccessResponse(
-        data=profile_response,
-        metadata=ResponseMetadata(correlation_id=context["correlation_id"])
-    )
+    return conditional_response(request, projection(profile), context["correlation_id"])
 
 
 @router.get("/me/completeness", response_model=SuccessResponse[ProfileCompletenessResponse])
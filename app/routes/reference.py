@@ -1,63 +1,71 @@
-"""Reference data routes."""
+"""Reference data routes.
 
-from fastapi import APIRouter
+Reference data only changes on deploy, so every response is rendered once at
+import and served from bytes with a strong ETag and a long `Cache-Control`.
+"""
 
-from app.models.common import ResponseMetadata, SuccessResponse
+from typing import Any, Dict
+
+from fastapi import APIRouter, Request
+
+from app.config import config
+from app.models.common import SuccessResponse
 from app.models.enums import AddressType, ConsentType, DocumentType, KYCStatus
+from app.serialization import Prerendered
+from app.tracing import TracedRoute
+
+router = APIRouter(prefix="/api/v1/reference", tags=["Reference"], route_class=TracedRoute)
+
+# Data of each reference endpoint, keyed by path segment
+REFERENCE_DATA: Dict[str, Dict[str, Any]] = {
+    "profile-statuses": {"statuses": ["active", "inactive", "suspended", "deleted"]},
+    "kyc-statuses": {"statuses": [status.value for status in KYCStatus]},
+    "address-types": {"types": [addr_type.value for addr_type in AddressType]},
+    "document-types": {"types": [doc_type.value for doc_type in DocumentType]},
+    "consent-types": {"types": [consent_type.value for consent_type in ConsentType]},
+}
+
+_responses = {
+    name: Prerendered(data, config.caching.reference_data_max_age)
+    for name, data in REFERENCE_DATA.items()
+}
+_combined = Prerendered(
+    {name.replace("-", "_"): data for name, data in REFERENCE_DATA.items()},
+    config.caching.reference_data_max_age
+)
+
 
-router = APIRouter(prefix="/api/v1/reference", tags=["Reference"])
+@router.get("", response_model=SuccessResponse[dict])
+async def get_reference_data(request: Request):
+    """Get all reference data in one document, keyed by endpoint name."""
+    return _combined.response(request)
 
 
 @router.get("/profile-statuses", response_model=SuccessResponse[dict])
-async def get_profile_statuses():
+async def get_profile_statuses(request: Request):
     """Get profile status enum values."""
-    return SuccessResponse(
-        data={
-            "statuses": ["active", "inactive", "suspended", "deleted"]
-        },
-        metadata=ResponseMetadata()
-    )
+    return _responses["profile-statuses"].response(request)
 
 
 @router.get("/kyc-statuses", response_model=SuccessResponse[dict])
-async def get_kyc_statuses():
+async def get_kyc_statuses(request: Request):
     """Get KYC status enum values."""
-    return SuccessResponse(
-        data={
-            "statuses": [status.value for status in KYCStatus]
-        },
-        metadata=ResponseMetadata()
-    )
+    return _responses["kyc-statuses"].response(request)
 
 
 @router.get("/address-types", response_model=SuccessResponse[dict])
-async def get_address_types():
+async def get_address_types(request: Request):
     """Get address type enum values."""
-    return SuccessResponse(
-        data={
-            "types": [addr_type.value for addr_type in AddressType]
-        },
-        metadata=ResponseMetadata()
-    )
+    return _responses["address-types"].response(request)
 
 
 @router.get("/document-types", response_model=SuccessResponse[dict])
-async def get_document_types():
+async def get_document_types(request: Request):
     """Get document type enum values."""
-    return SuccessResponse(
-        data={
-            "types": [doc_type.value for doc_type in DocumentType]
-        },
-        metadata=ResponseMetadata()
-    )
+    return _responses["document-types"].response(request)
 
 
 @router.get("/consent-types", response_model=SuccessResponse[dict])
-async def get_consent_types():
+async def get_consent_types(request: Request):
     """Get consent type enum values."""
-    return SuccessResponse(
-        data={
-            "types": [consent_type.value for consent_type in ConsentType]
-        },
-        metadata=ResponseMetadata()
-    )
+    return _responses["consent-types"].response(request)
@@ -0,0 +1,554 @@
+"""JWT verification: pluggable verifiers, JWKS key cache and a verified-claims cache."""
+
+import abc
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+from jose import JWTError, jwt
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+# JWK curve for each ECDSA algorithm; ECDSA keys are only accepted for their own curve
+EC_CURVES = {"ES256": "P-256", "ES384": "P-384", "ES512": "P-521"}
+
+
+def _token_key(token: str) -> bytes:
+    # Raw tokens are bearer credentials; keep only a digest in memory
+    return hashlib.sha256(token.encode()).digest()
+
+
+class ClaimsCache:
+    """LRU cache of verified JWT claims keyed by token digest.
+
+    An entry lives until the token's `exp` or `max_ttl` seconds, whichever
+    comes first, so a cached token can never outlive its signature check.
+    There is no early revocation: cached claims are served until
+    min(`exp`, `max_ttl`), just as the token itself verifies until `exp`.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_ttl: Optional[int] = None):
+        self.max_entries = max_entries or config.security.claims_cache_max_entries
+        self.max_ttl = max_ttl if max_ttl is not None else config.security.claims_cache_max_ttl
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0}
+
+    def get(self, token: str) -> Optional[dict]:
+        """Get cached claims for a token, or None if it must be verified."""
+        key = _token_key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.counters["misses"] += 1
+            return None
+
+        claims, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            self.counters["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.counters["hits"] += 1
+        return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        """Cache claims of a token that has just been verified."""
+        key = _token_key(token)
+        now = time.time()
+        expires_at = now + self.max_ttl
+        if claims.get("exp") is not None:
+            expires_at = min(expires_at, float(claims["exp"]))
+        if expires_at <= now:
+            return
+
+        self._entries[key] = (claims, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached claims."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters."""
+        return {"entries": len(self._entries), **self.counters}
+
+
+def _b64decode(segment: str) -> bytes:
+    try:
+        return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+    except (binascii.Error, ValueError):
+        raise JWTError("Invalid token encoding")
+
+
+def _numeric_claim(claims: dict, name: str) -> Optional[float]:
+    value = claims.get(name)
+    if value is None:
+        return None
+    # bool is an int subclass but never a valid NumericDate
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise JWTClaimsError(f"Invalid {name} claim")
+    return float(value)
+
+
+def _validate_time_claims(claims: dict) -> None:
+    now = time.time()
+    exp = _numeric_claim(claims, "exp")
+    nbf = _numeric_claim(claims, "nbf")
+    if exp is not None and now > exp:
+        raise ExpiredSignatureError("Signature has expired.")
+    if nbf is not None and now < nbf:
+        raise JWTClaimsError("The token is not yet valid (nbf)")
+
+
+def _validate_issuer_audience(claims: dict, issuer: Optional[str], audience: Optional[str]) -> None:
+    if issuer and claims.get("iss") != issuer:
+        raise JWTClaimsError("Invalid issuer")
+    if audience:
+        aud = claims.get("aud")
+        audiences = [aud] if isinstance(aud, str) else aud
+        if not isinstance(audiences, list) or audience not in audiences:
+            raise JWTClaimsError("Invalid audience")
+
+
+class ParsedKey(NamedTuple):
+    """A JWKS entry parsed once into a backend key object."""
+
+    kid: Optional[str]
+    kty: str
+    crv: Optional[str]
+    alg: Optional[str]
+    key: Any
+
+    def accepts(self, alg: str) -> bool:
+        """Whether a token signed with `alg` may be verified with this key."""
+        if self.alg and self.alg != alg:
+            return False
+        if alg.startswith(("RS", "PS")):
+            return self.kty == "RSA"
+        if alg.startswith("ES"):
+            return self.kty == "EC" and self.crv == EC_CURVES.get(alg)
+        return False
+
+
+class CryptographyBackend:
+    """Verifies signatures directly with `cryptography` using pre-built public keys."""
+
+    name = "cryptography"
+
+    def __init__(self):
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa
+        from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+        self._invalid_signature = InvalidSignature
+        self._ec = ec
+        self._rsa = rsa
+        self._padding = padding
+        self._encode_dss_signature = encode_dss_signature
+        self._hashes = {"256": hashes.SHA256, "384": hashes.SHA384, "512": hashes.SHA512}
+        self._curves = {"P-256": ec.SECP256R1, "P-384": ec.SECP384R1, "P-521": ec.SECP521R1}
+
+    def parse(self, jwk: dict) -> Any:
+        """Build a public key object from a JWK."""
+        if jwk["kty"] == "RSA":
+            return self._rsa.RSAPublicNumbers(_jwk_int(jwk["e"]), _jwk_int(jwk["n"])).public_key()
+        if jwk["kty"] == "EC":
+            curve = self._curves[jwk["crv"]]()
+            return self._ec.EllipticCurvePublicNumbers(_jwk_int(jwk["x"]), _jwk_int(jwk["y"]), curve).public_key()
+        raise ValueError(f"Unsupported key type: {jwk['kty']}")
+
+    def verify(self, key: ParsedKey, alg: str, signing_input: bytes, signature: bytes) -> bool:
+        """Check a signature; returns False rather than raising on mismatch."""
+        digest = self._hashes[alg[2:]]()
+        try:
+            if alg.startswith("RS"):
+                key.key.verify(signature, signing_input, self._padding.PKCS1v15(), digest)
+            elif alg.startswith("PS"):
+                pss = self._padding.PSS(mgf=self._padding.MGF1(digest), salt_length=digest.digest_size)
+                key.key.verify(signature, signing_input, pss, digest)
+            else:
+                # JWS carries ECDSA signatures as raw r || s; cryptography expects DER
+                size = len(signature) // 2
+                if size == 0 or len(signature) % 2:
+                    return False
+                der = self._encode_dss_signature(
+                    int.from_bytes(signature[:size], "big"),
+                    int.from_bytes(signature[size:], "big")
+                )
+                key.key.verify(der, signing_input, self._ec.ECDSA(digest))
+        except self._invalid_signature:
+            return False
+        return True
+
+
+class JoseBackend:
+    """Fallback that verifies with python-jose keys, constructed once per JWK."""
+
+    name = "python-jose"
+
+    def parse(self, jwk: dict) -> Any:
+        """Build a jose key object from a JWK."""
+        from jose import jwk as jose_jwk
+
+        algorithm = jwk.get("alg")
+        if not algorithm:
+            algorithm = "RS256" if jwk["kty"] == "RSA" else {v: k for k, v in EC_CURVES.items()}[jwk["crv"]]
+        return jose_jwk.construct(jwk, algorithm)
+
+    def verify(self, key: ParsedKey, alg: str, signing_input: bytes, signature: bytes) -> bool:
+        """Check a signature with the jose key."""
+        # jose keys are bound to the hash they were built with, so a token
+        # using another algorithm simply fails verification
+        return key.key.verify(signing_input, signature)
+
+
+def _jwk_int(value: str) -> int:
+    return int.from_bytes(_b64decode(value), "big")
+
+
+def default_backend():
+    """The fastest signature backend available in this environment."""
+    try:
+        return CryptographyBackend()
+    except ImportError:
+        logger.warning("cryptography is not installed; falling back to python-jose for JWT verification")
+        return JoseBackend()
+
+
+class JWKSKeySet:
+    """Signing keys from a JWKS document, parsed once and refreshed in the background.
+
+    Keys come from `path` or `url`. A token with an unknown `kid` triggers a
+    refresh, rate-limited to one per `min_refresh_interval`, so key rotation at
+    the identity provider is picked up without a restart.
+    """
+
+    def __init__(
+        self,
+        url: str = "",
+        path: str = "",
+        backend: Any = None,
+        refresh_interval: Optional[int] = None,
+        min_refresh_interval: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.url = url
+        self.path = path
+        self.backend = backend or default_backend()
+        self.refresh_interval = refresh_interval or config.security.jwks_refresh_interval
+        self.min_refresh_interval = (
+            min_refresh_interval if min_refresh_interval is not None
+            else config.security.jwks_min_refresh_interval
+        )
+        self.transport = transport
+        self._keys: Dict[Optional[str], ParsedKey] = {}
+        self._last_refresh_attempt = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refreshing: Any = None
+
+    def get_key(self, kid: Optional[str]) -> ParsedKey:
+        """Select the key for a token's `kid`."""
+        if not self._keys and self.path and not self.url:
+            try:
+                self.load_file()
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to load JWKS file {self.path}: {e}")
+
+        key = self._keys.get(kid)
+        if key is None and kid is None and len(self._keys) == 1:
+            key = next(iter(self._keys.values()))
+        if key is None:
+            self._request_refresh()
+            raise JWTError(f"Unknown signing key: {kid}")
+        return key
+
+    def load(self, document: dict) -> None:
+        """Replace the key set with the keys of a JWKS document."""
+        keys: Dict[Optional[str], ParsedKey] = {}
+        for jwk in document.get("keys", []):
+            if jwk.get("use", "sig") != "sig":
+                continue
+            try:
+                parsed = self.backend.parse(jwk)
+            except (KeyError, ValueError, JWTError) as e:
+                logger.warning(f"Skipping unsupported JWKS key {jwk.get('kid')}: {e}")
+                continue
+            keys[jwk.get("kid")] = ParsedKey(jwk.get("kid"), jwk["kty"], jwk.get("crv"), jwk.get("alg"), parsed)
+        self._keys = keys
+        logger.info(f"Loaded {len(keys)} JWT signing keys")
+
+    def load_file(self) -> None:
+        """Load keys from the configured JWKS file."""
+        self._last_refresh_attempt = time.monotonic()
+        with open(self.path) as f:
+            self.load(json.load(f))
+
+    async def refresh(self) -> None:
+        """Reload keys, keeping the current set if the source is unavailable."""
+        self._last_refresh_attempt = time.monotonic()
+        try:
+            if self.url:
+                async with httpx.AsyncClient(transport=self.transport, timeout=5) as client:
+                    response = await client.get(self.url)
+                    response.raise_for_status()
+                    self.load(response.json())
+            elif self.path:
+                self.load_file()
+        except Exception as e:
+            logger.warning(f"JWKS refresh failed, keeping {len(self._keys)} cached keys: {e}")
+
+    def _request_refresh(self) -> None:
+        if time.monotonic() - self._last_refresh_attempt < self.min_refresh_interval:
+            return
+        if self._refreshing is not None and not self._refreshing.done():
+            return
+        self._last_refresh_attempt = time.monotonic()
+        try:
+            asyncio.get_running_loop()
+            self._refreshing = asyncio.ensure_future(self.refresh())
+        except RuntimeError:
+            # Called from a verification worker thread
+            if self._loop is not None:
+                self._refreshing = asyncio.run_coroutine_threadsafe(self.refresh(), self._loop)
+            elif self.path:
+                try:
+                    self.load_file()
+                except (OSError, ValueError) as e:
+                    logger.warning(f"JWKS reload failed, keeping {len(self._keys)} cached keys: {e}")
+
+    async def start(self) -> None:
+        """Load keys and start periodic refresh."""
+        self._loop = asyncio.get_running_loop()
+        await self.refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop periodic refresh."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+
+class TokenVerifier(abc.ABC):
+    """Verifies a bearer token and returns its claims, raising `JWTError` otherwise."""
+
+    @abc.abstractmethod
+    def verify(self, token: str) -> dict:
+        """Claims of a valid token."""
+
+    async def start(self) -> None:
+        """Prepare keys before serving traffic."""
+
+    async def stop(self) -> None:
+        """Release background resources."""
+
+
+class HMACVerifier(TokenVerifier):
+    """Shared-secret (HS*) verification via python-jose."""
+
+    def __init__(
+        self,
+        secret: str,
+        algorithms: List[str],
+        issuer: Optional[str] = None,
+        audience: Optional[str] = None
+    ):
+        self.secret = secret
+        self.algorithms = algorithms
+        self.issuer = issuer
+        self.audience = audience
+
+    def verify(self, token: str) -> dict:
+        return jwt.decode(
+            token,
+            self.secret,
+            algorithms=self.algorithms,
+            issuer=self.issuer,
+            audience=self.audience
+        )
+
+
+class JWKSVerifier(TokenVerifier):
+    """Asymmetric (RS*/PS*/ES*) verification against a JWKS key set.
+
+    With `issuer` or `audience` set, tokens must carry a matching `iss`, or
+    an `aud` naming the audience, so tokens the IdP minted for other
+    clients are refused.
+    """
+
+    def __init__(
+        self,
+        key_set: JWKSKeySet,
+        algorithms: List[str],
+        issuer: Optional[str] = None,
+        audience: Optional[str] = None
+    ):
+        self.key_set = key_set
+        self.algorithms = algorithms
+        self.issuer = issuer
+        self.audience = audience
+
+    def verify(self, token: str) -> dict:
+        try:
+            header_segment, payload_segment, signature_segment = token.split(".")
+            header = json.loads(_b64decode(header_segment))
+        except ValueError:
+            raise JWTError("Malformed token")
+        if not isinstance(header, dict):
+            raise JWTError("Malformed token")
+
+        alg = header.get("alg")
+        # Only the configured asymmetric algorithms; this also rules out "none"
+        # and HS* tokens forged with a public key as the secret
+        if alg not in self.algorithms:
+            raise JWTError(f"Algorithm not allowed: {alg}")
+
+        key = self.key_set.get_key(header.get("kid"))
+        if not key.accepts(alg):
+            raise JWTError(f"Key {key.kid} cannot verify {alg} tokens")
+
+        signing_input = f"{header_segment}.{payload_segment}".encode()
+        if not self.key_set.backend.verify(key, alg, signing_input, _b64decode(signature_segment)):
+            raise JWTError("Signature verification failed.")
+
+        try:
+            claims = json.loads(_b64decode(payload_segment))
+        except ValueError:
+            raise JWTError("Invalid payload")
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload")
+        _validate_time_claims(claims)
+        _validate_issuer_audience(claims, self.issuer, self.audience)
+        return claims
+
+    async def start(self) -> None:
+        await self.key_set.start()
+
+    async def stop(self) -> None:
+        await self.key_set.stop()
+
+
+def build_verifier() -> TokenVerifier:
+    """Build the verifier for the configured algorithms."""
+    algorithms = [a.strip() for a in config.security.jwt_algorithm.split(",") if a.strip()]
+    asymmetric = [a for a in algorithms if a.startswith(("RS", "PS", "ES"))]
+    issuer = config.security.jwt_issuer or None
+    audience = config.security.jwt_audience or None
+    if not asymmetric:
+        return HMACVerifier(config.security.jwt_secret_key, algorithms, issuer, audience)
+    if len(asymmetric) != len(algorithms):
+        # Accepting both families lets a public key be replayed as an HMAC secret
+        logger.warning(f"Ignoring symmetric JWT algorithms alongside {asymmetric}")
+    if not config.security.jwks_url and not config.security.jwks_file:
+        logger.error(f"JWT algorithms {asymmetric} require jwt.jwks_url or jwt.jwks_file")
+    if not audience:
+        logger.warning("jwt.audience is not set; tokens the IdP issued for other clients will be accepted")
+    return JWKSVerifier(
+        JWKSKeySet(url=config.security.jwks_url, path=config.security.jwks_file),
+        asymmetric,
+        issuer,
+        audience
+    )
+
+
+def decode_token(token: str) -> dict:
+    """Verify a token's signature and expiry and return its claims."""
+    return token_verifier.verify(token)
+
+
+def verify_token(token: str) -> dict:
+    """Return verified claims for a bearer token, using the claims cache.
+
+    Raises `JWTError` for invalid or expired tokens. The returned
+    dict is shared between requests and must not be modified.
+    """
+    claims = _cached_claims(token)
+    if claims is None:
+        claims = _accept(token, decode_token(token))
+    return claims
+
+
+async def verify_token_async(token: str) -> dict:
+    """`verify_token` for the event loop.
+
+    With `verify_in_thread_pool` enabled, signature checks on cache misses
+    run in a worker pool so asymmetric verification never blocks the loop.
+    """
+    if not config.security.verify_in_thread_pool:
+        return verify_token(token)
+
+    claims = _cached_claims(token)
+    if claims is None:
+        loop = asyncio.get_running_loop()
+        claims = _accept(token, await loop.run_in_executor(_get_executor(), decode_token, token))
+    return claims
+
+
+def _cached_claims(token: str) -> Optional[dict]:
+    if not config.security.claims_cache_enabled:
+        return None
+    return claims_cache.get(token)
+
+
+def _accept(token: str, claims: dict) -> dict:
+    if config.security.claims_cache_enabled:
+        claims_cache.put(token, claims)
+    return claims
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=config.security.verify_thread_pool_size,
+            thread_name_prefix="jwt-verify"
+        )
+    return _executor
+
+
+async def start_verifier() -> None:
+    """Load signing keys and start their background refresh."""
+    await token_verifier.start()
+
+
+async def stop_verifier() -> None:
+    """Stop key refresh and the verification pool."""
+    global _executor
+    await token_verifier.stop()
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+# Global claims cache and token verifier instances
+claims_cache = ClaimsCache()
+token_verifier = build_verifier()
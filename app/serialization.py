@@ -0,0 +1,233 @@
+"""Fast response path: projections of trusted records rendered with orjson.
+
+Response models built field by field from storage records re-validate data
+the service wrote itself, and FastAPI validates them again through
+`response_model` before encoding with the stdlib `json` module. For records
+read back from storage, routes instead project the record onto the response
+model's fields and return the envelope pre-rendered, skipping both passes.
+`response_model` stays on the route for the OpenAPI schema.
+"""
+
+import hashlib
+import json
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Type, get_args
+from uuid import UUID
+
+from fastapi import HTTPException, Query, Request, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+from app.tracing import span
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_datetime(value: Any) -> Any:
+    """A datetime (or ISO string) as Pydantic renders it in JSON: UTC as `Z`, not `+00:00`."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    if isinstance(value, str) and value.endswith("+00:00"):
+        return value[:-6] + "Z"
+    return value
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return json_datetime(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode to JSON bytes, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class Projection:
+    """Copies a response model's fields out of a storage record, without validation.
+
+    Field names, record keys (`sources` maps a field to a differently named
+    record key) and defaults are resolved once per model. Fields listed in
+    `null_fields` are always rendered as null. Only the model's fields are
+    copied, so anything else on the record (raw PII, internal columns) never
+    reaches the response. `select()` narrows the projection to a sparse
+    fieldset.
+
+    Datetime fields are rendered as Pydantic would (`Z` for UTC), so the
+    wire format matches `model_dump(mode="json")` for records the service
+    wrote. Values are not coerced or validated: a record holding the wrong
+    type is rendered as stored instead of being rejected.
+    """
+
+    MAX_CACHED_SUBSETS = 256
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        null_fields: Iterable[str] = (),
+        sources: Optional[Dict[str, str]] = None,
+        include: Optional[Iterable[str]] = None
+    ):
+        self.model = model
+        self._null_set = frozenset(null_fields)
+        self._sources = dict(sources or {})
+        names = [name for name in model.model_fields if include is None or name in include]
+        self.names = frozenset(names)
+        self.fields: Tuple[Tuple[str, str, Any], ...] = tuple(
+            (name, self._sources.get(name, name), _field_default(model.model_fields[name]))
+            for name in names
+            if name not in self._null_set
+        )
+        self.null_fields = tuple(name for name in names if name in self._null_set)
+        self.datetime_fields = tuple(
+            name for name in names
+            if name not in self._null_set and _is_datetime(model.model_fields[name].annotation)
+        )
+        self._subsets: Dict[FrozenSet[str], "Projection"] = {}
+
+    def __call__(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        projected = {name: record.get(source, default) for name, source, default in self.fields}
+        for name in self.null_fields:
+            projected[name] = None
+        for name in self.datetime_fields:
+            projected[name] = json_datetime(projected[name])
+        return projected
+
+    def many(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Project each record."""
+        return [self(record) for record in records]
+
+    def select(self, names: Optional[FrozenSet[str]]) -> "Projection":
+        """Projection limited to `names` (all fields when None); raises ValueError for unknown names."""
+        if names is None:
+            return self
+        unknown = names - self.names
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        subset = self._subsets.get(names)
+        if subset is None:
+            subset = Projection(self.model, self._null_set, self._sources, include=names)
+            # Field sets come from clients; stop caching past a bound
+            if len(self._subsets) < self.MAX_CACHED_SUBSETS:
+                self._subsets[names] = subset
+        return subset
+
+
+def _field_default(field: Any) -> Any:
+    return None if field.default is PydanticUndefined else field.default
+
+
+def _is_datetime(annotation: Any) -> bool:
+    return annotation is datetime or datetime in get_args(annotation)
+
+
+def fields_query() -> Any:
+    """The `fields=` query parameter declaration shared by read routes."""
+    return Query(None, description="Comma-separated response fields to return (sparse fieldset)")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[FrozenSet[str]]:
+    """Parse a comma-separated `fields=` parameter; None when absent or empty."""
+    if not fields:
+        return None
+    names = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    return names or None
+
+
+def sparse(projection: Projection, fields: Optional[str]) -> Projection:
+    """Narrow a projection to a `fields=` parameter, rejecting unknown fields with 400."""
+    try:
+        return projection.select(parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def _render(data_json: bytes, correlation_id: Optional[str]) -> bytes:
+    # The envelope is spliced around the encoded data so the data can be
+    # encoded once and also hashed for the ETag
+    metadata = dumps({
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "correlation_id": correlation_id
+    })
+    return b'{"success":true,"error":null,"data":' + data_json + b',"metadata":' + metadata + b"}"
+
+
+def success_response(data: Any, correlation_id: Optional[str], status_code: int = 200) -> Response:
+    """Render the standard success envelope directly to a response."""
+    with span("serialization"):
+        body = _render(dumps(data), correlation_id)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def etag_for(data_json: bytes) -> str:
+    """Strong ETag of an encoded representation."""
+    return '"' + hashlib.blake2b(data_json, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match header, as RFC 9110 requires for it."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def conditional_response(request: Request, data: Any, correlation_id: Optional[str]) -> Response:
+    """Render a read with an ETag over its data, answering 304 when the client's copy matches.
+
+    The ETag covers only the data, not the envelope metadata, so it changes
+    exactly when the (possibly sparse) representation does.
+    """
+    with span("serialization"):
+        data_json = dumps(data)
+        etag = etag_for(data_json)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        body = _render(data_json, correlation_id)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+class Prerendered:
+    """A response whose data never changes while the process runs, encoded once.
+
+    The envelope is rendered when the instance is built, with no correlation
+    id (the `X-Correlation-Id` response header still carries it). The strong
+    ETag is taken over the data alone, so every worker and every restart
+    agree on it until a deploy changes the data.
+    """
+
+    def __init__(self, data: Any, max_age: int):
+        data_json = dumps(data)
+        self.etag = etag_for(data_json)
+        self.body = _render(data_json, None)
+        self.cache_control = f"public, max-age={max_age}"
+
+    def response(self, request: Request) -> Response:
+        """The stored body, or 304 when the client's copy matches."""
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
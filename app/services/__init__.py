@@ -8,6 +8,8 @@ from app.services.consent_service import ConsentService
 from app.services.enrichment_service import EnrichmentService
 from app.services.audit_service import AuditService
 from app.services.validation_service import ValidationService
+from app.services.entity_sync_service import EntitySyncService
+from app.services.notification_dispatcher import NotificationDispatcher
 
 __all__ = [
     "ProfileService",
@@ -18,4 +20,6 @@ __all__ = [
     "EnrichmentService",
     "AuditService",
     "ValidationService",
+    "EntitySyncService",
+    "NotificationDispatcher",
 ]
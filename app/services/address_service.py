@@ -7,6 +7,7 @@ from app.cache import cache_manager
 from app.models.enums import VerificationStatus
 from app.services import storage
 from app.services.audit_service import AuditService
+from app.services.notification_dispatcher import notification_dispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +67,7 @@ class AddressService:
             to_value=address,
             correlation_id=correlation_id
         )
+        notification_dispatcher.notify(profile_id, "profile.updated", ["addresses"], correlation_id)
         
         return address
     
@@ -88,6 +90,7 @@ class AddressService:
         updated = storage.update_address(address_id, update_data)
         
         await cache_manager.delete_addresses(address["profile_id"])
+        notification_dispatcher.notify(address["profile_id"], "profile.updated", ["addresses"], correlation_id)
         
         return updated
     
@@ -114,6 +117,7 @@ class AddressService:
                 from_value=address,
                 correlation_id=correlation_id
             )
+            notification_dispatcher.notify(address["profile_id"], "profile.updated", ["addresses"], correlation_id)
         
         return success
 
@@ -0,0 +1,74 @@
+"""Change feed service: incremental reads of the storage change log."""
+
+import base64
+import logging
+import uuid
+from typing import Optional
+
+from app.clients import authz_service_client
+from app.services import storage
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeTokenExpired(Exception):
+    """Raised when a resume token points before the oldest retained change."""
+
+
+class ChangeFeedService:
+    """Pages through the change log with opaque resume tokens.
+
+    A token encodes the sequence number of the last change a consumer has
+    seen, plus the epoch of the log it came from. Tokens from another epoch
+    (the log was rebuilt) or older than the ring buffer's retention raise
+    ResumeTokenExpired: the consumer must re-read full state and start over.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+
+    async def can_read(self, user_id: str, correlation_id: Optional[str] = None) -> bool:
+        """Whether a caller may read the feed; it spans every profile, so authz decides."""
+        return await authz_service_client.check_permission(user_id, "profile_changes", "*", "read", correlation_id)
+
+    def encode_token(self, sequence: int) -> str:
+        """Resume token for a position in the log."""
+        return base64.urlsafe_b64encode(f"{self.epoch}:{sequence}".encode()).decode().rstrip("=")
+
+    def decode_token(self, token: str) -> int:
+        """Position encoded in a resume token; raises ValueError when malformed."""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            epoch, sequence = raw.split(":")
+            position = int(sequence)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Malformed resume token")
+        if epoch != self.epoch:
+            raise ResumeTokenExpired("Resume token is from a previous change log")
+        if position < 0 or position > storage.last_change_sequence:
+            raise ValueError("Malformed resume token")
+        return position
+
+    def get_changes(self, after: Optional[str], limit: int) -> dict:
+        """Changes after a resume token (from the oldest retained when None), with the next token."""
+        oldest = storage.oldest_change_sequence()
+        if after is None:
+            position = oldest - 1
+        else:
+            position = self.decode_token(after)
+            if position < oldest - 1:
+                raise ResumeTokenExpired("Changes after this token are no longer retained")
+
+        changes = storage.get_changes_after(position, limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        if changes:
+            position = changes[-1]["sequence"]
+        return {
+            "changes": changes,
+            "next_token": self.encode_token(position),
+            "has_more": has_more
+        }
+
+
+change_feed_service = ChangeFeedService()
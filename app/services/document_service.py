@@ -66,7 +66,8 @@ class DocumentService:
         self,
         profile_id: str,
         document_type: Optional[str] = None,
-        verification_status: Optional[str] = None
+        verification_status: Optional[str] = None,
+        correlation_id: Optional[str] = None
     ) -> List[dict]:
         """Get documents for profile."""
         documents = storage.get_documents_by_profile_id(profile_id)
@@ -77,11 +78,13 @@ class DocumentService:
         if verification_status:
             documents = [d for d in documents if d.get("verification_status") == verification_status]
         
-        # Add download URLs (simulated)
-        for doc in documents:
-            doc["download_url"] = f"https://documents.example.com/{doc['document_id']}"
+        # Resolve download URLs in one batch; stored rows are left untouched
+        urls = await document_service_client.resolve_download_urls(
+            [doc["document_id"] for doc in documents],
+            correlation_id=correlation_id
+        )
         
-        return documents
+        return [{**doc, "download_url": urls.get(doc["document_id"])} for doc in documents]
     
     async def verify_document(
         self,
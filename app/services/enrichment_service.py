@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timezone
 from typing import List, Optional
 
+from app.events import ENRICHMENT_TOPIC, change_bus
 from app.models.enums import EnrichmentStatus
 from app.services import storage
 from app.services.audit_service import AuditService
@@ -48,6 +49,13 @@ class EnrichmentService:
             correlation_id=correlation_id
         )
         
+        change_bus.publish(ENRICHMENT_TOPIC, "enrichment.submitted", {
+            "enrichment_id": enrichment["id"],
+            "profile_id": profile_id,
+            "status": enrichment["status"],
+            "maker_id": maker_id
+        })
+        
         return enrichment
     
     async def review_enrichment(
@@ -99,6 +107,14 @@ class EnrichmentService:
             correlation_id=correlation_id
         )
         
+        change_bus.publish(ENRICHMENT_TOPIC, "enrichment.reviewed", {
+            "enrichment_id": enrichment_id,
+            "profile_id": enrichment["profile_id"],
+            "status": status.value,
+            "decision": decision,
+            "checker_id": checker_id
+        })
+        
         return updated
     
     async def get_enrichments(self, profile_id: str) -> List[dict]:
@@ -0,0 +1,249 @@
+"""Write-behind sync of profile metadata to entity-service."""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from pydantic_core import to_jsonable_python
+
+from app.clients import entity_near_cache, entity_service_client
+from app.clients.entity_service import EntityServiceClient
+from app.config import config
+from app.services import storage
+
+logger = logging.getLogger(__name__)
+
+# 4xx responses that are worth retrying; any other 4xx is dead-lettered
+RETRYABLE_CLIENT_ERRORS = {408, 425, 429}
+
+# Profile fields entity-service holds; identity numbers, bank details and
+# income never leave this service
+ENTITY_FIELDS = frozenset({
+    "id", "user_id", "tenant_id",
+    "first_name", "last_name", "full_name", "date_of_birth", "gender", "marital_status",
+    "phone", "email", "alternative_phone",
+    "occupation_type", "employer_name", "job_title", "employment_status",
+    "status", "kyc_status", "completeness_percentage",
+    "created_at", "updated_at", "created_by", "updated_by",
+})
+
+
+class EntitySyncService:
+    """Records profile writes in a local outbox and flushes them in the background.
+
+    Requests only append to the outbox, so their latency does not depend on
+    entity-service. Repeated updates to a profile are coalesced while they
+    wait, entries for one profile are delivered strictly in order, and
+    failures are retried with exponential backoff.
+    """
+
+    def __init__(self, client: Optional[EntityServiceClient] = None):
+        self.client = client or entity_service_client
+        self.counters = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "delivered": 0,
+            "retried": 0,
+            "dead_lettered": 0,
+            "batches": 0,
+        }
+        self.dead_letters: deque = deque(maxlen=1000)
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def record_create(self, profile_id: str, profile_data: dict, correlation_id: Optional[str] = None) -> None:
+        """Record a profile creation for delivery; only `ENTITY_FIELDS` are sent."""
+        self._record(profile_id, "create", profile_data, correlation_id)
+
+    def record_update(self, profile_id: str, changes: dict, correlation_id: Optional[str] = None) -> None:
+        """Record a profile update for delivery."""
+        self._record(profile_id, "update", changes, correlation_id)
+
+    def _record(self, profile_id: str, operation: str, data: dict, correlation_id: Optional[str]) -> None:
+        if not config.entity_sync.enabled:
+            return
+
+        payload = to_jsonable_python({field: value for field, value in data.items() if field in ENTITY_FIELDS})
+        pending = storage.get_outbox_entries_by_profile_id(profile_id)
+        last = pending[-1] if pending else None
+
+        # Fold the change into a waiting entry: an unsent create or update can
+        # carry the newer values, so entity-service sees one call instead of many
+        if operation == "update" and last is not None and not last["in_flight"]:
+            last["payload"].update(payload)
+            last["correlation_id"] = correlation_id or last["correlation_id"]
+            self.counters["coalesced"] += 1
+            return
+
+        storage.create_outbox_entry({
+            "profile_id": profile_id,
+            "operation": operation,
+            "payload": payload,
+            "correlation_id": correlation_id,
+            "attempts": 0,
+            "next_attempt_at": 0.0,
+            "in_flight": False,
+            "last_error": None
+        })
+        self.counters["enqueued"] += 1
+
+        depth = len(storage.entity_outbox_db)
+        if depth >= config.entity_sync.high_water_mark:
+            logger.warning(f"Entity sync outbox above high-water mark: {depth} pending entries")
+        if self._wakeup is not None and depth >= config.entity_sync.batch_size:
+            self._wakeup.set()
+
+    async def flush_once(self) -> int:
+        """Deliver one batch of due entries; returns the number delivered."""
+        now = time.time()
+        due = [
+            e for e in storage.get_outbox_heads()
+            if not e["in_flight"] and e["next_attempt_at"] <= now
+        ]
+        if not due:
+            return 0
+
+        # Only the head entry of each profile is eligible, which keeps
+        # per-profile ordering while different profiles go out concurrently
+        due.sort(key=lambda e: e["created_at"])
+        batch = due[:config.entity_sync.batch_size]
+        for entry in batch:
+            entry["in_flight"] = True
+
+        self.counters["batches"] += 1
+        results = await asyncio.gather(*(self._deliver(entry) for entry in batch))
+        return sum(1 for delivered in results if delivered)
+
+    async def _deliver(self, entry: dict) -> bool:
+        try:
+            if entry["operation"] == "create":
+                response = await self.client.create_profile_entity(
+                    entry["payload"],
+                    correlation_id=entry["correlation_id"]
+                )
+            else:
+                response = await self.client.update_profile_entity(
+                    entry["profile_id"],
+                    entry["payload"],
+                    correlation_id=entry["correlation_id"]
+                )
+        except asyncio.CancelledError:
+            # Shutdown mid-delivery: leave the entry eligible for the drain pass
+            entry["in_flight"] = False
+            raise
+        except Exception as e:
+            self._schedule_retry(entry, str(e))
+            return False
+
+        if response.get("error"):
+            status_code = response.get("status_code", 0)
+            if 400 <= status_code < 500 and status_code not in RETRYABLE_CLIENT_ERRORS:
+                self._dead_letter(entry, f"Client error {status_code}: {response.get('error')}")
+            else:
+                self._schedule_retry(entry, f"Error {status_code}: {response.get('error')}")
+            return False
+
+        storage.delete_outbox_entry(entry["id"])
+        entity_near_cache.invalidate_profile(entry["profile_id"])
+        self.counters["delivered"] += 1
+        return True
+
+    def _schedule_retry(self, entry: dict, error: str) -> None:
+        attempts = entry["attempts"] + 1
+        if attempts >= config.entity_sync.max_attempts:
+            self._dead_letter(entry, error)
+            return
+
+        backoff_ms = min(
+            config.entity_sync.backoff_max_ms,
+            config.entity_sync.backoff_base_ms * (2 ** (attempts - 1))
+        )
+        # Jitter so a recovering entity-service isn't hit by a synchronized wave
+        delay = random.uniform(backoff_ms / 2, backoff_ms) / 1000
+        storage.update_outbox_entry(entry["id"], {
+            "attempts": attempts,
+            "next_attempt_at": time.time() + delay,
+            "in_flight": False,
+            "last_error": error
+        })
+        self.counters["retried"] += 1
+        logger.warning(
+            f"Entity sync of profile {entry['profile_id']} failed (attempt {attempts}), retrying in {delay:.2f}s: {error}",
+            extra={"correlation_id": entry["correlation_id"]}
+        )
+
+    def _dead_letter(self, entry: dict, error: str) -> None:
+        storage.delete_outbox_entry(entry["id"])
+        entry["last_error"] = error
+        self.dead_letters.append(entry)
+        self.counters["dead_lettered"] += 1
+        logger.error(
+            f"Entity sync of profile {entry['profile_id']} abandoned after {entry['attempts'] + 1} attempts: {error}",
+            extra={"correlation_id": entry["correlation_id"]}
+        )
+
+    def stats(self) -> dict:
+        """Backpressure and delivery metrics for the outbox."""
+        entries = list(storage.entity_outbox_db.values())
+        oldest = min((e["created_at"] for e in entries), default=None)
+        oldest_age = 0.0
+        if oldest:
+            oldest_age = time.time() - datetime.fromisoformat(oldest).timestamp()
+
+        return {
+            "pending": len(entries),
+            "in_flight": sum(1 for e in entries if e["in_flight"]),
+            "profiles_pending": len(storage.entity_outbox_by_profile),
+            "oldest_pending_age_seconds": round(oldest_age, 3),
+            **{f"{name}_total": value for name, value in self.counters.items()}
+        }
+
+    async def run(self) -> None:
+        """Flush the outbox until cancelled."""
+        interval = config.entity_sync.flush_interval_ms / 1000
+        while True:
+            try:
+                delivered = await self.flush_once()
+            except Exception as e:
+                logger.error(f"Entity sync flush failed: {e}", exc_info=True)
+                delivered = 0
+
+            # Keep draining while full batches are going out
+            if delivered >= config.entity_sync.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        """Start the background worker."""
+        if not config.entity_sync.enabled or self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """Stop the worker, making one last attempt to drain the outbox."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+
+        try:
+            await asyncio.wait_for(self.flush_once(), drain_timeout)
+        except Exception as e:
+            logger.warning(f"Entity sync drain on shutdown incomplete: {e}")
+
+
+entity_sync_service = EntitySyncService()
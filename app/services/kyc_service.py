@@ -6,8 +6,10 @@ from typing import Optional
 
 from app.cache import cache_manager
 from app.config import config
+from app.events import change_bus, profile_topic
 from app.models.enums import KYCStatus, KYCType
 from app.services import storage
+from app.services.notification_dispatcher import notification_dispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +66,8 @@ class KYCService:
         })
         
         await cache_manager.delete_kyc_status(profile_id)
+        self._publish_change(kyc)
+        notification_dispatcher.notify(profile_id, "kyc.status_changed", ["kyc_status"])
         
         return kyc
     
@@ -105,8 +109,20 @@ class KYCService:
         updated_kyc = storage.update_kyc_workflow(kyc_id, update_data)
         
         await cache_manager.delete_kyc_status(kyc["profile_id"])
+        self._publish_change(updated_kyc)
+        if all_complete:
+            notification_dispatcher.notify(kyc["profile_id"], "kyc.status_changed", ["kyc_status"])
         
         return updated_kyc
+    
+    def _publish_change(self, kyc: dict) -> None:
+        """Push the workflow's status and checks to the profile's event streams."""
+        change_bus.publish(profile_topic(kyc["profile_id"]), "kyc.updated", {
+            "kyc_id": kyc["id"],
+            "kyc_status": kyc["status"],
+            "completed_checks": kyc.get("completed_checks", {}),
+            "expiry_date": kyc.get("expiry_date")
+        })
 
 
 kyc_service = KYCService()
@@ -0,0 +1,230 @@
+"""Debounced, batched delivery of profile event notifications."""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from app.clients import notification_service_client
+from app.clients.notification_service import NotificationServiceClient
+from app.config import config
+from app.services import storage
+from app.services.entity_sync_service import RETRYABLE_CLIENT_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# Notification-service endpoint for each event
+NOTIFICATION_ENDPOINTS: Dict[str, str] = {
+    "profile.updated": "/notifications/profile-updated",
+    "kyc.status_changed": "/notifications/kyc-status",
+}
+
+
+class NotificationDispatcher:
+    """Queues profile events in an outbox and delivers them in the background.
+
+    Requests only touch the outbox, so they never wait on notification-service.
+    Events for the same profile and event type are debounced: while an entry
+    is waiting, later changes fold their field names into it and push its
+    delivery back by `debounce_ms`, up to `max_debounce_ms` after the first
+    change. Due entries go out in one call per endpoint per `batch_size`, and
+    failed batches are retried with exponential backoff.
+    """
+
+    def __init__(self, client: Optional[NotificationServiceClient] = None):
+        self.client = client or notification_service_client
+        self.counters = {
+            "enqueued": 0,
+            "debounced": 0,
+            "delivered": 0,
+            "retried": 0,
+            "dead_lettered": 0,
+            "batches": 0,
+        }
+        self.dead_letters: deque = deque(maxlen=1000)
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(
+        self,
+        profile_id: str,
+        event: str,
+        fields: Iterable[str],
+        correlation_id: Optional[str] = None
+    ) -> None:
+        """Queue a notification that `fields` of a profile changed."""
+        if not config.notifications.enabled:
+            return
+        if event not in NOTIFICATION_ENDPOINTS:
+            raise ValueError(f"Unknown notification event: {event}")
+
+        settings = config.notifications
+        now = time.time()
+        occurred_at = datetime.now(timezone.utc).isoformat()
+        pending = storage.get_latest_notification_entry(profile_id, event)
+        if pending is not None and not pending["in_flight"]:
+            pending["fields"] = sorted(set(pending["fields"]).union(fields))
+            pending["occurred_at"] = occurred_at
+            pending["correlation_id"] = correlation_id or pending["correlation_id"]
+            if pending["attempts"] == 0:
+                pending["next_attempt_at"] = min(
+                    now + settings.debounce_ms / 1000,
+                    pending["first_change_at"] + settings.max_debounce_ms / 1000
+                )
+            self.counters["debounced"] += 1
+            return
+
+        storage.create_notification_entry({
+            "profile_id": profile_id,
+            "event": event,
+            "fields": sorted(set(fields)),
+            "occurred_at": occurred_at,
+            "correlation_id": correlation_id,
+            "first_change_at": now,
+            "next_attempt_at": now + settings.debounce_ms / 1000,
+            "attempts": 0,
+            "in_flight": False,
+            "last_error": None
+        })
+        self.counters["enqueued"] += 1
+
+    async def flush_once(self, now: Optional[float] = None) -> int:
+        """Deliver due entries, one batch per endpoint and `batch_size`; returns the number delivered."""
+        now = time.time() if now is None else now
+        due = [
+            e for e in storage.notification_outbox_db.values()
+            if not e["in_flight"] and e["next_attempt_at"] <= now
+        ]
+        if not due:
+            return 0
+
+        due.sort(key=lambda e: e["first_change_at"])
+        by_endpoint: Dict[str, List[dict]] = {}
+        for entry in due:
+            by_endpoint.setdefault(NOTIFICATION_ENDPOINTS[entry["event"]], []).append(entry)
+
+        batch_size = config.notifications.batch_size
+        batches = [
+            (endpoint, entries[i:i + batch_size])
+            for endpoint, entries in by_endpoint.items()
+            for i in range(0, len(entries), batch_size)
+        ]
+        for _, batch in batches:
+            for entry in batch:
+                entry["in_flight"] = True
+
+        self.counters["batches"] += len(batches)
+        results = await asyncio.gather(*(self._deliver(endpoint, batch) for endpoint, batch in batches))
+        return sum(results)
+
+    async def _deliver(self, endpoint: str, batch: List[dict]) -> int:
+        notifications = [{
+            "id": entry["id"],
+            "profile_id": entry["profile_id"],
+            "event": entry["event"],
+            "fields": entry["fields"],
+            "occurred_at": entry["occurred_at"],
+            "correlation_id": entry["correlation_id"]
+        } for entry in batch]
+        try:
+            response = await self.client.send_notifications(endpoint, notifications)
+        except asyncio.CancelledError:
+            # Shutdown mid-delivery: leave the entries eligible for the drain pass
+            for entry in batch:
+                entry["in_flight"] = False
+            raise
+        except Exception as e:
+            for entry in batch:
+                self._schedule_retry(entry, str(e))
+            return 0
+
+        if response.get("error"):
+            status_code = response.get("status_code", 0)
+            error = f"Error {status_code}: {response.get('error')}"
+            for entry in batch:
+                if 400 <= status_code < 500 and status_code not in RETRYABLE_CLIENT_ERRORS:
+                    self._dead_letter(entry, error)
+                else:
+                    self._schedule_retry(entry, error)
+            return 0
+
+        for entry in batch:
+            storage.delete_notification_entry(entry["id"])
+        self.counters["delivered"] += len(batch)
+        return len(batch)
+
+    def _schedule_retry(self, entry: dict, error: str) -> None:
+        attempts = entry["attempts"] + 1
+        if attempts >= config.notifications.max_attempts:
+            self._dead_letter(entry, error)
+            return
+
+        backoff_ms = min(
+            config.notifications.backoff_max_ms,
+            config.notifications.backoff_base_ms * (2 ** (attempts - 1))
+        )
+        delay = random.uniform(backoff_ms / 2, backoff_ms) / 1000
+        storage.update_notification_entry(entry["id"], {
+            "attempts": attempts,
+            "next_attempt_at": time.time() + delay,
+            "in_flight": False,
+            "last_error": error
+        })
+        self.counters["retried"] += 1
+        logger.warning(
+            f"Notification {entry['event']} for profile {entry['profile_id']} failed (attempt {attempts}), "
+            f"retrying in {delay:.2f}s: {error}",
+            extra={"correlation_id": entry["correlation_id"]}
+        )
+
+    def _dead_letter(self, entry: dict, error: str) -> None:
+        storage.delete_notification_entry(entry["id"])
+        entry["last_error"] = error
+        self.dead_letters.append(entry)
+        self.counters["dead_lettered"] += 1
+        logger.error(
+            f"Notification {entry['event']} for profile {entry['profile_id']} abandoned "
+            f"after {entry['attempts'] + 1} attempts: {error}",
+            extra={"correlation_id": entry["correlation_id"]}
+        )
+
+    async def run(self) -> None:
+        """Flush due notifications until cancelled."""
+        interval = config.notifications.flush_interval_ms / 1000
+        while True:
+            try:
+                delivered = await self.flush_once()
+            except Exception as e:
+                logger.error(f"Notification flush failed: {e}", exc_info=True)
+                delivered = 0
+
+            # Keep draining while full batches are going out
+            if delivered < config.notifications.batch_size:
+                await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        """Start the background worker."""
+        if not config.notifications.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """Stop the worker, sending everything still queued, debounced or not, once more."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        try:
+            await asyncio.wait_for(self.flush_once(now=float("inf")), drain_timeout)
+        except Exception as e:
+            logger.warning(f"Notification drain on shutdown incomplete: {e}")
+
+
+notification_dispatcher = NotificationDispatcher()
@@ -2,7 +2,7 @@
 
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import AbstractSet, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from app.cache import cache_manager
@@ -12,9 +12,41 @@ from app.models.enums import KYCStatus, ProfileStatus
 from app.models.profile import ProfileCreate, ProfileUpdate
 from app.services import storage
 from app.services.audit_service import AuditService
+from app.services.entity_sync_service import entity_sync_service
+from app.services.notification_dispatcher import notification_dispatcher
+from app.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+# Response fields derived from raw identity numbers by masking
+MASKED_FIELDS = frozenset({"pan_id_masked", "aadhaar_masked"})
+
+
+# Customer sees all own data, bank officers see all if authorized
+PARTIAL_MASK_ROLES = frozenset({"customer", "risk_officer", "credit_officer", "loan_officer"})
+
+
+def _masking_plan(role: str, fields: Optional[AbstractSet[str]]) -> Tuple[bool, bool, Tuple[str, ...]]:
+    """(derive aadhaar_masked, derive pan_id_masked, raw keys to drop) for a role."""
+    wanted = MASKED_FIELDS if fields is None else MASKED_FIELDS & fields
+    if role in PARTIAL_MASK_ROLES:
+        # Show last 4 digits of Aadhaar and a partially masked PAN
+        drop = ("aadhaar_id", "pan_id") if role == "customer" else ("aadhaar_id",)
+        return "aadhaar_masked" in wanted, "pan_id_masked" in wanted, drop
+    # Other roles: full masking
+    return False, False, ("aadhaar_id", "pan_id", "salary_account_number")
+
+
+def _mask(profile: dict, derive_aadhaar: bool, derive_pan: bool, drop: Tuple[str, ...]) -> dict:
+    masked = profile.copy()
+    if derive_aadhaar and masked.get("aadhaar_id"):
+        masked["aadhaar_masked"] = "XXXX-XXXX-" + masked["aadhaar_id"][-4:]
+    if derive_pan and masked.get("pan_id"):
+        masked["pan_id_masked"] = masked["pan_id"][:3] + "XXXX" + masked["pan_id"][-1:]
+    for key in drop:
+        masked.pop(key, None)
+    return masked
+
 
 class ProfileService:
     """Service for profile management."""
@@ -27,14 +59,19 @@ class ProfileService:
         profile_id: str,
         user_id: str,
         role: str,
-        correlation_id: Optional[str] = None
+        correlation_id: Optional[str] = None,
+        fields: Optional[AbstractSet[str]] = None
     ) -> Optional[dict]:
-        """Get profile by ID with authorization check."""
-        # Check cache first
+        """Get profile by ID with authorization check.
+
+        `fields` limits the response fields the caller will project, so
+        masking is skipped for identity fields it will not return.
+        """
+        # Check cache first; the full record is cached whatever the fieldset
         cached = await cache_manager.get_profile(profile_id)
         if cached:
             logger.info(f"Profile {profile_id} retrieved from cache")
-            return await self._apply_pii_masking(cached, role)
+            return await self._apply_pii_masking(cached, role, fields)
         
         # Get from storage
         profile = storage.get_profile_by_id(profile_id)
@@ -65,20 +102,61 @@ class ProfileService:
         await cache_manager.set_profile(profile_id, profile)
         
         # Apply PII masking
-        return await self._apply_pii_masking(profile, role)
+        return await self._apply_pii_masking(profile, role, fields)
+    
+    async def get_profiles_by_ids(
+        self,
+        profile_ids: List[str],
+        user_id: str,
+        role: str,
+        correlation_id: Optional[str] = None,
+        fields: Optional[AbstractSet[str]] = None
+    ) -> Dict[str, Optional[dict]]:
+        """Get many profiles with one cache read, one authz call and one masking pass.
+        
+        Returns the masked profile per distinct id, or None when it does not
+        exist or the caller may not read it (as `get_profile_by_id`).
+        """
+        ids = list(dict.fromkeys(profile_ids))
+        profiles = await cache_manager.get_profiles(ids)
+        missing = [profile_id for profile_id in ids if profile_id not in profiles]
+        loaded = storage.get_profiles_by_ids(missing) if missing else {}
+        profiles.update(loaded)
+        
+        # Owners can always read their profile; everything else goes to authz at once
+        not_owned = [profile_id for profile_id, profile in profiles.items() if profile.get("user_id") != user_id]
+        allowed = {}
+        if not_owned:
+            allowed = await authz_service_client.check_permissions(
+                user_id, "profile", not_owned, "read", correlation_id
+            )
+        readable = [profile_id for profile_id in ids if profile_id in profiles and allowed.get(profile_id, True)]
+        if len(readable) < len(profiles):
+            logger.warning(f"User {user_id} unauthorized to view {len(profiles) - len(readable)} profiles in batch")
+        
+        # Cache only what the caller was allowed to read, as `get_profile_by_id` does
+        readable_loaded = {profile_id: loaded[profile_id] for profile_id in readable if profile_id in loaded}
+        if readable_loaded:
+            await cache_manager.set_profiles(readable_loaded)
+        
+        masked = await self._mask_profiles([profiles[profile_id] for profile_id in readable], role, fields)
+        results: Dict[str, Optional[dict]] = dict.fromkeys(ids)
+        results.update(zip(readable, masked))
+        return results
     
     async def get_own_profile(
         self,
         user_id: str,
         role: str,
-        correlation_id: Optional[str] = None
+        correlation_id: Optional[str] = None,
+        fields: Optional[AbstractSet[str]] = None
     ) -> Optional[dict]:
-        """Get user's own profile."""
+        """Get user's own profile, masked for the requested `fields` (all when None)."""
         profile = storage.get_profile_by_user_id(user_id)
         if not profile:
             return None
         
-        return await self._apply_pii_masking(profile, role)
+        return await self._apply_pii_masking(profile, role, fields)
     
     async def create_profile(
         self,
@@ -110,6 +188,9 @@ class ProfileService:
         # Calculate completeness
         await self._update_completeness(profile["id"])
         
+        # Sync to entity-service in the background, with the computed completeness
+        entity_sync_service.record_create(profile["id"], profile, correlation_id)
+        
         return profile
     
     async def update_own_profile(
@@ -135,6 +216,19 @@ class ProfileService:
         
         updated_profile = storage.update_profile(profile_id, update_dict)
         
+        # Sync to entity-service in the background
+        entity_sync_service.record_update(
+            profile_id,
+            {**update_dict, "updated_at": updated_profile["updated_at"]},
+            correlation_id
+        )
+        notification_dispatcher.notify(
+            profile_id,
+            "profile.updated",
+            [field for field in update_dict if field != "updated_by"],
+            correlation_id
+        )
+        
         # Create audit entries for each changed field
         for field, new_value in update_dict.items():
             if field != "updated_by" and old_values.get(field) != new_value:
@@ -157,29 +251,25 @@ class ProfileService:
         
         return updated_profile
     
-    async def _apply_pii_masking(self, profile: dict, role: str) -> dict:
-        """Apply PII masking based on role."""
-        masked = profile.copy()
-        
-        # Customer sees all own data, bank officers see all if authorized
-        if role in ["customer", "risk_officer", "credit_officer", "loan_officer"]:
-            # Show last 4 digits of Aadhaar
-            if masked.get("aadhaar_id"):
-                masked["aadhaar_masked"] = "XXXX-XXXX-" + masked["aadhaar_id"][-4:]
-                masked.pop("aadhaar_id", None)
-            
-            # Partially mask PAN
-            if masked.get("pan_id"):
-                masked["pan_id_masked"] = masked["pan_id"][:3] + "XXXX" + masked["pan_id"][-1:]
-                if role == "customer":
-                    masked.pop("pan_id", None)
-        else:
-            # Other roles: full masking
-            masked.pop("aadhaar_id", None)
-            masked.pop("pan_id", None)
-            masked.pop("salary_account_number", None)
-        
-        return masked
+    @traced("masking")
+    async def _apply_pii_masking(self, profile: dict, role: str, fields: Optional[AbstractSet[str]] = None) -> dict:
+        """Apply PII masking based on role.
+        
+        With `fields`, masked values are only derived for the requested
+        fields; raw identity numbers are dropped either way.
+        """
+        return _mask(profile, *_masking_plan(role, fields))
+    
+    @traced("masking")
+    async def _mask_profiles(
+        self,
+        profiles: List[dict],
+        role: str,
+        fields: Optional[AbstractSet[str]] = None
+    ) -> List[dict]:
+        """Apply PII masking to many profiles, deciding what to mask once for the role."""
+        plan = _masking_plan(role, fields)
+        return [_mask(profile, *plan) for profile in profiles]
     
     async def _update_completeness(self, profile_id: str) -> float:
         """Calculate and update profile completeness."""
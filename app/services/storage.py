@@ -1,10 +1,14 @@
 """In-memory storage for profile data (simulating database)."""
 
 import uuid
+from collections import deque
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
 
+from app.config import config
+from app.tracing import traced
+
 # In-memory storage (simulating database)
 profiles_db: Dict[str, dict] = {}
 addresses_db: Dict[str, dict] = {}
@@ -13,6 +17,32 @@ documents_db: Dict[str, dict] = {}
 consents_db: Dict[str, dict] = {}
 enrichments_db: Dict[str, dict] = {}
 audit_entries_db: Dict[str, dict] = {}
+entity_outbox_db: Dict[str, dict] = {}
+entity_outbox_by_profile: Dict[str, List[str]] = {}
+notification_outbox_db: Dict[str, dict] = {}
+# Newest outbox entry for each profile and event ("profile_id:event")
+notification_outbox_latest: Dict[str, str] = {}
+
+_TABLES: Dict[str, Dict[str, dict]] = {
+    "profile": profiles_db,
+    "address": addresses_db,
+    "kyc": kyc_workflows_db,
+    "document": documents_db,
+    "consent": consents_db,
+    "enrichment": enrichments_db,
+}
+
+# Change log: every mutation of a record below gets the next global sequence
+# number and a compact change record in a ring buffer, oldest first
+change_log: Deque[dict] = deque(maxlen=config.changes.log_size)
+record_versions: Dict[str, int] = {}
+last_change_sequence = 0
+
+# Per-profile version counters: each change to a profile or one of its
+# records bumps the profile's version, and the index maps every changed
+# record ("entity:id") to the version of its latest change, in that order
+profile_versions: Dict[str, int] = {}
+profile_change_index: Dict[str, Dict[str, int]] = {}
 
 
 def generate_uuid() -> str:
@@ -20,11 +50,94 @@ def generate_uuid() -> str:
     return str(uuid.uuid4())
 
 
+def _record_change(entity: str, record: dict, operation: str, fields: Iterable[str]) -> dict:
+    """Append a change of `record` to the change log."""
+    global last_change_sequence
+    last_change_sequence += 1
+    key = f"{entity}:{record['id']}"
+    version = record_versions.get(key, 0) + 1
+    record_versions[key] = version
+    change = {
+        "sequence": last_change_sequence,
+        "entity": entity,
+        "id": record["id"],
+        "profile_id": record["id"] if entity == "profile" else record.get("profile_id"),
+        "operation": operation,
+        "fields": sorted(field for field in fields if field != "id"),
+        "version": version
+    }
+    change_log.append(change)
+    if change["profile_id"]:
+        _bump_profile_version(change["profile_id"], key)
+    return change
+
+
+def _bump_profile_version(profile_id: str, key: str) -> None:
+    version = profile_versions.get(profile_id, 0) + 1
+    profile_versions[profile_id] = version
+    index = profile_change_index.setdefault(profile_id, {})
+    # Re-insert so the index stays ordered by version
+    index.pop(key, None)
+    index[key] = version
+
+
+def get_profile_version(profile_id: str) -> int:
+    """Current version of a profile and its records (0 when never changed)."""
+    return profile_versions.get(profile_id, 0)
+
+
+@traced("storage")
+def get_profile_changes_since(profile_id: str, version: int) -> List[Tuple[str, str]]:
+    """(entity, id) of the profile's records changed after `version`, oldest change first.
+
+    Walks the profile's index back from the newest change and stops at the
+    first one at or below `version`, so the cost is the size of the delta.
+    """
+    changed = []
+    for key, changed_at in reversed(profile_change_index.get(profile_id, {}).items()):
+        if changed_at <= version:
+            break
+        entity, _, record_id = key.partition(":")
+        changed.append((entity, record_id))
+    changed.reverse()
+    return changed
+
+
+def get_record(entity: str, record_id: str) -> Optional[dict]:
+    """Get a record by entity name (as in change records) and ID."""
+    table = _TABLES.get(entity)
+    return table.get(record_id) if table is not None else None
+
+
+def oldest_change_sequence() -> int:
+    """Sequence number of the oldest change still in the log (the next one when empty)."""
+    return change_log[0]["sequence"] if change_log else last_change_sequence + 1
+
+
+@traced("storage")
+def get_changes_after(sequence: int, limit: int) -> List[dict]:
+    """Up to `limit` logged changes with a sequence number above `sequence`."""
+    if not change_log:
+        return []
+    # Sequence numbers in the log are contiguous, so positions are computed
+    start = max(0, sequence + 1 - change_log[0]["sequence"])
+    end = min(len(change_log), start + limit)
+    return [change_log[i] for i in range(start, end)]
+
+
+@traced("storage")
 def get_profile_by_id(profile_id: str) -> Optional[dict]:
     """Get profile by ID."""
     return profiles_db.get(profile_id)
 
 
+@traced("storage")
+def get_profiles_by_ids(profile_ids: List[str]) -> Dict[str, dict]:
+    """Get several profiles by ID; missing ids are omitted."""
+    return {profile_id: profiles_db[profile_id] for profile_id in profile_ids if profile_id in profiles_db}
+
+
+@traced("storage")
 def get_profile_by_user_id(user_id: str) -> Optional[dict]:
     """Get profile by user ID."""
     for profile in profiles_db.values():
@@ -33,6 +146,7 @@ def get_profile_by_user_id(user_id: str) -> Optional[dict]:
     return None
 
 
+@traced("storage")
 def create_profile(profile_data: dict) -> dict:
     """Create new profile."""
     profile_id = generate_uuid()
@@ -40,18 +154,22 @@ def create_profile(profile_data: dict) -> dict:
     profile_data["created_at"] = datetime.now(timezone.utc).isoformat()
     profile_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     profiles_db[profile_id] = profile_data
+    _record_change("profile", profile_data, "create", profile_data)
     return profile_data
 
 
+@traced("storage")
 def update_profile(profile_id: str, update_data: dict) -> Optional[dict]:
     """Update profile."""
     if profile_id not in profiles_db:
         return None
     profiles_db[profile_id].update(update_data)
     profiles_db[profile_id]["updated_at"] = datetime.now(timezone.utc).isoformat()
+    _record_change("profile", profiles_db[profile_id], "update", update_data)
     return profiles_db[profile_id]
 
 
+@traced("storage")
 def get_addresses_by_profile_id(profile_id: str) -> List[dict]:
     """Get all addresses for profile."""
     return [addr for addr in addresses_db.values() if addr.get("profile_id") == profile_id]
@@ -64,6 +182,7 @@ def create_address(address_data: dict) -> dict:
     address_data["created_at"] = datetime.now(timezone.utc).isoformat()
     address_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     addresses_db[address_id] = address_data
+    _record_change("address", address_data, "create", address_data)
     return address_data
 
 
@@ -78,6 +197,7 @@ def update_address(address_id: str, update_data: dict) -> Optional[dict]:
         return None
     addresses_db[address_id].update(update_data)
     addresses_db[address_id]["updated_at"] = datetime.now(timezone.utc).isoformat()
+    _record_change("address", addresses_db[address_id], "update", update_data)
     return addresses_db[address_id]
 
 
@@ -86,6 +206,7 @@ def delete_address(address_id: str) -> bool:
     if address_id not in addresses_db:
         return False
     addresses_db[address_id]["deleted_at"] = datetime.now(timezone.utc).isoformat()
+    _record_change("address", addresses_db[address_id], "delete", ("deleted_at",))
     return True
 
 
@@ -96,9 +217,11 @@ def create_kyc_workflow(kyc_data: dict) -> dict:
     kyc_data["created_at"] = datetime.now(timezone.utc).isoformat()
     kyc_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     kyc_workflows_db[kyc_id] = kyc_data
+    _record_change("kyc", kyc_data, "create", kyc_data)
     return kyc_data
 
 
+@traced("storage")
 def get_kyc_by_profile_id(profile_id: str) -> Optional[dict]:
     """Get KYC workflow by profile ID."""
     for kyc in kyc_workflows_db.values():
@@ -113,6 +236,7 @@ def update_kyc_workflow(kyc_id: str, update_data: dict) -> Optional[dict]:
         return None
     kyc_workflows_db[kyc_id].update(update_data)
     kyc_workflows_db[kyc_id]["updated_at"] = datetime.now(timezone.utc).isoformat()
+    _record_change("kyc", kyc_workflows_db[kyc_id], "update", update_data)
     return kyc_workflows_db[kyc_id]
 
 
@@ -122,9 +246,11 @@ def create_document(document_data: dict) -> dict:
     document_data["id"] = doc_id
     document_data["created_at"] = datetime.now(timezone.utc).isoformat()
     documents_db[doc_id] = document_data
+    _record_change("document", document_data, "create", document_data)
     return document_data
 
 
+@traced("storage")
 def get_documents_by_profile_id(profile_id: str) -> List[dict]:
     """Get all documents for profile."""
     return [doc for doc in documents_db.values() if doc.get("profile_id") == profile_id]
@@ -140,6 +266,7 @@ def update_document(doc_id: str, update_data: dict) -> Optional[dict]:
     if doc_id not in documents_db:
         return None
     documents_db[doc_id].update(update_data)
+    _record_change("document", documents_db[doc_id], "update", update_data)
     return documents_db[doc_id]
 
 
@@ -150,9 +277,11 @@ def create_consent(consent_data: dict) -> dict:
     consent_data["created_at"] = datetime.now(timezone.utc).isoformat()
     consent_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     consents_db[consent_id] = consent_data
+    _record_change("consent", consent_data, "create", consent_data)
     return consent_data
 
 
+@traced("storage")
 def get_consents_by_profile_id(profile_id: str) -> List[dict]:
     """Get all consents for profile."""
     return [c for c in consents_db.values() if c.get("profile_id") == profile_id]
@@ -164,6 +293,7 @@ def update_consent(consent_id: str, update_data: dict) -> Optional[dict]:
         return None
     consents_db[consent_id].update(update_data)
     consents_db[consent_id]["updated_at"] = datetime.now(timezone.utc).isoformat()
+    _record_change("consent", consents_db[consent_id], "update", update_data)
     return consents_db[consent_id]
 
 
@@ -173,6 +303,7 @@ def create_enrichment(enrichment_data: dict) -> dict:
     enrichment_data["id"] = enrichment_id
     enrichment_data["created_at"] = datetime.now(timezone.utc).isoformat()
     enrichments_db[enrichment_id] = enrichment_data
+    _record_change("enrichment", enrichment_data, "create", enrichment_data)
     return enrichment_data
 
 
@@ -191,6 +322,7 @@ def update_enrichment(enrichment_id: str, update_data: dict) -> Optional[dict]:
     if enrichment_id not in enrichments_db:
         return None
     enrichments_db[enrichment_id].update(update_data)
+    _record_change("enrichment", enrichments_db[enrichment_id], "update", update_data)
     return enrichments_db[enrichment_id]
 
 
@@ -203,9 +335,86 @@ def create_audit_entry(audit_data: dict) -> dict:
     return audit_data
 
 
+@traced("storage")
 def get_audit_entries_by_profile_id(profile_id: str, limit: int = 50, offset: int = 0) -> List[dict]:
     """Get audit entries for profile."""
     entries = [e for e in audit_entries_db.values() if e.get("profile_id") == profile_id]
     # Sort by timestamp descending
     entries.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
     return entries[offset:offset + limit]
+
+
+def create_outbox_entry(entry_data: dict) -> dict:
+    """Append entry to the entity-service outbox (ordered per profile)."""
+    entry_id = generate_uuid()
+    entry_data["id"] = entry_id
+    entry_data["created_at"] = datetime.now(timezone.utc).isoformat()
+    entity_outbox_db[entry_id] = entry_data
+    entity_outbox_by_profile.setdefault(entry_data["profile_id"], []).append(entry_id)
+    return entry_data
+
+
+def get_outbox_entries_by_profile_id(profile_id: str) -> List[dict]:
+    """Get pending outbox entries for profile, oldest first."""
+    return [entity_outbox_db[entry_id] for entry_id in entity_outbox_by_profile.get(profile_id, [])]
+
+
+def get_outbox_heads() -> List[dict]:
+    """Get the oldest pending outbox entry of every profile."""
+    return [entity_outbox_db[entry_ids[0]] for entry_ids in entity_outbox_by_profile.values() if entry_ids]
+
+
+def update_outbox_entry(entry_id: str, update_data: dict) -> Optional[dict]:
+    """Update outbox entry."""
+    if entry_id not in entity_outbox_db:
+        return None
+    entity_outbox_db[entry_id].update(update_data)
+    return entity_outbox_db[entry_id]
+
+
+def delete_outbox_entry(entry_id: str) -> bool:
+    """Remove delivered (or dead-lettered) entry from the outbox."""
+    entry = entity_outbox_db.pop(entry_id, None)
+    if entry is None:
+        return False
+    entry_ids = entity_outbox_by_profile.get(entry["profile_id"], [])
+    if entry_id in entry_ids:
+        entry_ids.remove(entry_id)
+    if not entry_ids:
+        entity_outbox_by_profile.pop(entry["profile_id"], None)
+    return True
+
+
+def create_notification_entry(entry_data: dict) -> dict:
+    """Append entry to the notification outbox."""
+    entry_id = generate_uuid()
+    entry_data["id"] = entry_id
+    entry_data["created_at"] = datetime.now(timezone.utc).isoformat()
+    notification_outbox_db[entry_id] = entry_data
+    notification_outbox_latest[f"{entry_data['profile_id']}:{entry_data['event']}"] = entry_id
+    return entry_data
+
+
+def get_latest_notification_entry(profile_id: str, event: str) -> Optional[dict]:
+    """Get the newest pending notification entry for a profile and event."""
+    entry_id = notification_outbox_latest.get(f"{profile_id}:{event}")
+    return notification_outbox_db.get(entry_id) if entry_id else None
+
+
+def update_notification_entry(entry_id: str, update_data: dict) -> Optional[dict]:
+    """Update notification outbox entry."""
+    if entry_id not in notification_outbox_db:
+        return None
+    notification_outbox_db[entry_id].update(update_data)
+    return notification_outbox_db[entry_id]
+
+
+def delete_notification_entry(entry_id: str) -> bool:
+    """Remove delivered (or dead-lettered) entry from the notification outbox."""
+    entry = notification_outbox_db.pop(entry_id, None)
+    if entry is None:
+        return False
+    key = f"{entry['profile_id']}:{entry['event']}"
+    if notification_outbox_latest.get(key) == entry_id:
+        del notification_outbox_latest[key]
+    return True
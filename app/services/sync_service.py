@@ -0,0 +1,94 @@
+"""Delta sync service for mobile clients."""
+
+import base64
+import logging
+import uuid
+from typing import Optional
+
+from app.clients import document_service_client
+from app.services import storage
+
+logger = logging.getLogger(__name__)
+
+# Change-log entities a customer's device keeps a copy of
+SYNC_ENTITIES = frozenset({"profile", "address", "document", "consent", "kyc"})
+
+
+class SyncService:
+    """Computes what changed in a profile since a client's last sync.
+    
+    Clients hold an opaque `since` token carrying the profile version they
+    synced to and the epoch of the storage it came from. Versions restart
+    when storage is rebuilt, so a token from another epoch gets a full sync
+    rather than a delta that would silently miss records.
+    """
+    
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+    
+    def encode_token(self, version: int) -> str:
+        """Sync token for a profile version."""
+        return base64.urlsafe_b64encode(f"{self.epoch}:{version}".encode()).decode().rstrip("=")
+    
+    def decode_token(self, token: str) -> Optional[int]:
+        """Version in a sync token, None when it is from another epoch; raises ValueError when malformed."""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            epoch, version = raw.split(":")
+            position = int(version)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Malformed sync token")
+        if position < 0:
+            raise ValueError("Malformed sync token")
+        return position if epoch == self.epoch else None
+    
+    async def get_delta(self, profile_id: str, since: Optional[str], correlation_id: Optional[str] = None) -> dict:
+        """Records created, updated or soft-deleted after the `since` token.
+        
+        The delta comes from the profile's change index, not from scanning
+        tables. No token, a token from another epoch, or one ahead of the
+        server's version gets a full sync instead; soft-deleted records are
+        then left out rather than listed as deletions. Raises ValueError for
+        a malformed token.
+        """
+        version = storage.get_profile_version(profile_id)
+        since_version = self.decode_token(since) if since else None
+        full = not since_version or since_version > version
+        delta = {
+            "since": self.encode_token(version),
+            "full": full,
+            "profile_changed": full,
+            "addresses": [],
+            "documents": [],
+            "consents": [],
+            "kyc": None,
+            "deleted": []
+        }
+        
+        for entity, record_id in storage.get_profile_changes_since(profile_id, 0 if full else since_version):
+            if entity not in SYNC_ENTITIES:
+                continue
+            record = storage.get_record(entity, record_id)
+            if record is None:
+                continue
+            if entity == "profile":
+                delta["profile_changed"] = True
+            elif record.get("deleted_at"):
+                if not full:
+                    delta["deleted"].append({"entity": entity, "id": record_id, "deleted_at": record["deleted_at"]})
+            elif entity == "kyc":
+                delta["kyc"] = record
+            else:
+                delta[f"{entity}s"].append(record)
+        
+        if delta["documents"]:
+            urls = await document_service_client.resolve_download_urls(
+                [doc["document_id"] for doc in delta["documents"]],
+                correlation_id=correlation_id
+            )
+            delta["documents"] = [{**doc, "download_url": urls.get(doc["document_id"])} for doc in delta["documents"]]
+        
+        return delta
+
+
+sync_service = SyncService()
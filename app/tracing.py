@@ -0,0 +1,201 @@
+"""Lightweight request tracing with optional OpenTelemetry export.
+
+Spans are only recorded for sampled requests; elsewhere `span()` returns a
+shared no-op context manager. When the OpenTelemetry API is installed each
+recorded span is also emitted through it, carrying the correlation id.
+"""
+
+import asyncio
+import functools
+import logging
+import random
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+_NOOP = nullcontext()
+
+_current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar("current_trace", default=None)
+
+
+def _load_otel_tracer() -> Any:
+    if not config.tracing.opentelemetry:
+        return None
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return None
+    return trace.get_tracer("profile-service")
+
+
+_otel_tracer = _load_otel_tracer()
+
+
+class RequestTrace:
+    """Spans recorded for one sampled request."""
+
+    __slots__ = ("correlation_id", "spans", "serialization_start")
+
+    def __init__(self, correlation_id: Optional[str]):
+        self.correlation_id = correlation_id
+        self.spans: List[Tuple[str, float, float]] = []
+        self.serialization_start: Optional[float] = None
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """Record a finished span (perf_counter timestamps)."""
+        self.spans.append((name, start, end - start))
+
+    def timings(self) -> Dict[str, float]:
+        """Total milliseconds per span name."""
+        totals: Dict[str, float] = {}
+        for name, _, duration in self.spans:
+            totals[name] = totals.get(name, 0.0) + duration * 1000
+        return totals
+
+    def server_timing(self) -> str:
+        """Timing breakdown as a Server-Timing header value."""
+        return ", ".join(f"{name};dur={ms:.3f}" for name, ms in self.timings().items())
+
+
+class _Span:
+    __slots__ = ("trace", "name", "attributes", "start", "otel_context")
+
+    def __init__(self, trace: RequestTrace, name: str, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+        self.otel_context = None
+
+    def __enter__(self) -> "_Span":
+        if _otel_tracer is not None:
+            self.otel_context = _otel_tracer.start_as_current_span(
+                self.name,
+                attributes={**self.attributes, "correlation_id": self.trace.correlation_id or ""}
+            )
+            self.otel_context.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.trace.record(self.name, self.start, time.perf_counter())
+        if self.otel_context is not None:
+            self.otel_context.__exit__(exc_type, exc, tb)
+        return False
+
+
+def span(name: str, **attributes: Any):
+    """Context manager timing a step of the current request, if it is traced."""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, name, attributes)
+
+
+def traced(name: str) -> Callable:
+    """Decorator recording each call of a function as a span."""
+    def decorator(fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """The trace of the current request, if it is sampled."""
+    return _current_trace.get()
+
+
+class TracedRoute(APIRoute):
+    """Route that marks when the endpoint returns.
+
+    Everything between that point and the response start is FastAPI's
+    response-model validation and encoding, recorded as `serialization`.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any):
+        if asyncio.iscoroutinefunction(endpoint):
+            endpoint = _mark_endpoint_return(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _mark_endpoint_return(endpoint: Callable) -> Callable:
+    # functools.wraps keeps the signature FastAPI inspects for parameters
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.serialization_start = time.perf_counter()
+        return result
+
+    return wrapper
+
+
+class TracingMiddleware:
+    """Samples requests and attaches their span breakdown.
+
+    Must run inside `RequestContextMiddleware` so the correlation id is known.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not config.tracing.enabled:
+            await self.app(scope, receive, send)
+            return
+        sample_rate = config.tracing.sample_rate
+        if sample_rate < 1 and random.random() >= sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(scope.get("state", {}).get("correlation_id"))
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                if trace.serialization_start is not None:
+                    trace.record("serialization", trace.serialization_start, now)
+                trace.record("total", start, now)
+                if config.tracing.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", trace.server_timing())
+            await send(message)
+
+        root = _NOOP
+        if _otel_tracer is not None:
+            root = _otel_tracer.start_as_current_span(
+                f"{scope['method']} {scope['path']}",
+                attributes={"correlation_id": trace.correlation_id or "", "http.method": scope["method"]}
+            )
+
+        try:
+            with root:
+                await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Trace {scope['method']} {scope['path']}: {trace.server_timing()}",
+                    extra={"correlation_id": trace.correlation_id}
+                )
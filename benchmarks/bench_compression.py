@@ -0,0 +1,96 @@
+"""CPU cost versus bytes saved for each response encoding.
+
+Run with: python -m benchmarks.bench_compression
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+
+from app.compression import available_encodings
+from app.config import config
+from benchmarks.common import print_results, time_per_call
+
+
+def _envelope(data) -> bytes:
+    return json.dumps({
+        "success": True,
+        "data": data,
+        "error": None,
+        "metadata": {"timestamp": datetime.now(timezone.utc).isoformat(), "correlation_id": str(uuid.uuid4())}
+    }).encode()
+
+
+def audit_page(entries: int = 100) -> bytes:
+    """A full audit trail page with from/to value blobs."""
+    profile_id = str(uuid.uuid4())
+    return _envelope([{
+        "id": str(uuid.uuid4()),
+        "profile_id": profile_id,
+        "action": "update",
+        "actor_id": "user-123",
+        "actor_role": "customer",
+        "field_name": "address",
+        "from_value": {"line1": f"{i} MG Road", "city": "Bengaluru", "state": "Karnataka", "postal_code": "560001"},
+        "to_value": {"line1": f"{i + 1} MG Road", "city": "Bengaluru", "state": "Karnataka", "postal_code": "560001"},
+        "reason": None,
+        "correlation_id": str(uuid.uuid4()),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    } for i in range(entries)])
+
+
+def document_list(documents: int = 20) -> bytes:
+    """A profile's document list."""
+    return _envelope([{
+        "id": str(uuid.uuid4()),
+        "profile_id": str(uuid.uuid4()),
+        "document_type": "pan_card",
+        "file_name": f"pan_{i}.pdf",
+        "file_size": 245760,
+        "mime_type": "application/pdf",
+        "status": "verified",
+        "metadata": {"issue_date": "2020-01-01", "expiry_date": None},
+        "created_at": datetime.now(timezone.utc).isoformat()
+    } for i in range(documents)])
+
+
+def profile() -> bytes:
+    """A single masked profile, below the default size threshold."""
+    return _envelope({
+        "id": str(uuid.uuid4()),
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": "j***@example.com",
+        "phone": "******3210",
+        "pan_id": "******234F",
+        "status": "active",
+        "kyc_status": "pending"
+    })
+
+
+def _compress(factory, body: bytes) -> bytes:
+    compressor = factory()
+    return compressor.compress(body) + compressor.finish()
+
+
+def main(iterations: int = 500) -> None:
+    rows = []
+    for name, body in (("audit page (100)", audit_page()), ("document list (20)", document_list()), ("profile", profile())):
+        if len(body) < config.compression.minimum_size:
+            rows.append([name, len(body), "identity", len(body), 0.0, "below minimum_size"])
+            continue
+        for encoding, factory in available_encodings().items():
+            compressed = _compress(factory, body)
+            micros = time_per_call(lambda: _compress(factory, body), iterations)
+            saved = 100 * (1 - len(compressed) / len(body))
+            rows.append([name, len(body), encoding, len(compressed), micros, f"{saved:.0f}% saved"])
+
+    print_results(
+        f"Response compression ({iterations} iterations)",
+        rows,
+        ["payload", "bytes", "encoding", "encoded bytes", "us/response", "ratio"]
+    )
+
+
+if __name__ == "__main__":
+    main()
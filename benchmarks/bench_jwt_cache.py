@@ -0,0 +1,36 @@
+"""Per-request authentication overhead with and without the verified-claims cache.
+
+Run with: python -m benchmarks.bench_jwt_cache
+"""
+
+from app.config import config
+from app.security import claims_cache, decode_token, verify_token
+from benchmarks.common import make_token, print_results, time_per_call
+
+
+def main(iterations: int = 50000) -> None:
+    token = make_token()
+    header = f"Bearer {token}"
+
+    def uncached() -> dict:
+        return decode_token(header.split(" ")[1])
+
+    def cached() -> dict:
+        return verify_token(header.split(" ")[1])
+
+    config.security.claims_cache_enabled = True
+    claims_cache.clear()
+    rows = [
+        ["jose.jwt.decode", time_per_call(uncached, iterations)],
+        ["claims cache hit", time_per_call(cached, iterations)],
+    ]
+    print_results(
+        f"JWT verification per request ({config.security.jwt_algorithm}, {iterations} iterations)",
+        rows,
+        ["path", "us/request"]
+    )
+    print(f"cache stats: {claims_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Asymmetric JWT verification cost: python-jose decode vs the JWKS verifier backends.
+
+Run with: python -m benchmarks.bench_jwt_verify
+"""
+
+import json
+import tempfile
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk, jwt
+
+from app.security import CryptographyBackend, JoseBackend, JWKSKeySet, JWKSVerifier
+from benchmarks.common import print_results, time_per_call
+
+
+def _keypair(alg: str):
+    if alg == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+
+def main(iterations: int = 2000) -> None:
+    rows = []
+    for alg in ("RS256", "ES256"):
+        private_pem, public_pem = _keypair(alg)
+        public_jwk = {**jwk.construct(public_pem, alg).to_dict(), "kid": "bench", "use": "sig"}
+        token = jwt.encode(
+            {"user_id": "bench-user", "exp": int(time.time()) + 3600},
+            private_pem,
+            algorithm=alg,
+            headers={"kid": "bench"}
+        )
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"keys": [public_jwk]}, f)
+
+        rows.append([alg, "jose.jwt.decode (JWK per call)",
+                     time_per_call(lambda: jwt.decode(token, public_jwk, algorithms=[alg]), iterations)])
+        for backend in (JoseBackend(), CryptographyBackend()):
+            verifier = JWKSVerifier(JWKSKeySet(path=f.name, backend=backend), [alg])
+            rows.append([alg, f"JWKSVerifier ({backend.name})", time_per_call(lambda: verifier.verify(token), iterations)])
+
+    print_results(f"Asymmetric JWT verification ({iterations} iterations)", rows, ["alg", "verifier", "us/token"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Requests/sec of the request-context and error middleware, before and after the ASGI rewrite.
+
+Run with: python -m benchmarks.bench_middleware
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Callable
+
+from fastapi import FastAPI, Request, Response
+from jose import JWTError, jwt
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config import config
+from app.deadline import DeadlineExceeded, deadline_for_request, reset_deadline, set_deadline
+from app.middleware import ErrorHandlingMiddleware, RequestContextMiddleware, error_response
+from app.routes import health, profiles
+from benchmarks.common import make_token, measure_rps, print_results, seed_profile
+
+
+class LegacyRequestContextMiddleware(BaseHTTPMiddleware):
+    """The previous `BaseHTTPMiddleware` implementation, kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        correlation_id = request.headers.get("X-Correlation-Id", str(uuid.uuid4()))
+        request.state.correlation_id = correlation_id
+
+        auth_header = request.headers.get("Authorization", "")
+        if auth_header.startswith("Bearer "):
+            try:
+                payload = jwt.decode(
+                    auth_header.split(" ")[1],
+                    config.security.jwt_secret_key,
+                    algorithms=[config.security.jwt_algorithm]
+                )
+                request.state.user_id = payload.get("user_id")
+                request.state.tenant_id = payload.get("tenant_id")
+                request.state.role = payload.get("role")
+                request.state.authenticated = True
+            except JWTError:
+                request.state.authenticated = False
+        else:
+            request.state.authenticated = False
+
+        deadline = deadline_for_request(request.url.path, request.headers)
+        request.state.deadline = deadline
+        deadline_token = set_deadline(deadline)
+
+        start_time = time.time()
+        try:
+            response = await call_next(request)
+        finally:
+            reset_deadline(deadline_token)
+        response.headers["X-Correlation-Id"] = correlation_id
+        response.headers["X-Response-Time"] = f"{time.time() - start_time:.3f}s"
+        return response
+
+
+class LegacyErrorHandlingMiddleware(BaseHTTPMiddleware):
+    """The previous `BaseHTTPMiddleware` implementation, kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        correlation_id = getattr(request.state, "correlation_id", "unknown")
+        try:
+            return await call_next(request)
+        except DeadlineExceeded:
+            return error_response(504, "DEADLINE_EXCEEDED", "Deadline exceeded", correlation_id)
+        except Exception:
+            return error_response(500, "INTERNAL_SERVER_ERROR", "An unexpected error occurred", correlation_id)
+
+
+def build_app(error_middleware, context_middleware) -> FastAPI:
+    """Build an app with the same middleware stack and routes as main.py."""
+    app = FastAPI()
+    app.add_middleware(error_middleware)
+    app.add_middleware(context_middleware)
+    app.include_router(health.router)
+    app.include_router(profiles.router)
+    return app
+
+
+async def main(requests: int = 5000, concurrency: int = 50) -> None:
+    seed_profile()
+    headers = {"Authorization": f"Bearer {make_token()}"}
+    apps = {
+        "BaseHTTPMiddleware": build_app(LegacyErrorHandlingMiddleware, LegacyRequestContextMiddleware),
+        "pure ASGI": build_app(ErrorHandlingMiddleware, RequestContextMiddleware),
+    }
+
+    rows = []
+    for path in ("/health", "/api/v1/profiles/me"):
+        for name, app in apps.items():
+            result = await measure_rps(app, path, headers=headers, requests=requests, concurrency=concurrency)
+            rows.append([path, name, result["rps"], result["p50_ms"], result["p95_ms"]])
+
+    print_results(
+        f"Middleware throughput ({requests} requests, concurrency {concurrency})",
+        rows,
+        ["path", "middleware", "req/s", "p50 ms", "p95 ms"]
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+"""Per-request overhead of the in-memory rate limiter.
+
+Run with: python -m benchmarks.bench_rate_limit
+"""
+
+import asyncio
+import time
+
+from app.rate_limit import InMemoryRateLimitBackend, RateLimiter, RateLimitExceeded
+from benchmarks.common import print_results, time_per_call
+
+
+async def _check_loop(limiter: RateLimiter, identities: int, iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        try:
+            await limiter.check("user", f"user-{i % identities}")
+        except RateLimitExceeded:
+            pass
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main(iterations: int = 200000) -> None:
+    backend = InMemoryRateLimitBackend()
+    limiter = RateLimiter(backend=backend)
+    rule = limiter.rules["user"]
+
+    rows = [["GCRA update (sync core)", time_per_call(lambda: backend.hit_sync("user-1", rule, time.monotonic()), iterations)]]
+    for identities in (1, 1000, 100000):
+        backend.reset()
+        rows.append([f"RateLimiter.check, {identities} keys", asyncio.run(_check_loop(limiter, identities, iterations))])
+
+    print_results(f"Rate limiter overhead ({iterations} iterations)", rows, ["path", "us/request"])
+
+
+if __name__ == "__main__":
+    main()
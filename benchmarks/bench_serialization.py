@@ -0,0 +1,99 @@
+"""Serialization cost per endpoint: validated response models versus projections rendered with orjson.
+
+Run with: python -m benchmarks.bench_serialization
+"""
+
+import asyncio
+import json
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.address import AddressResponse
+from app.models.audit import AuditResponse
+from app.models.common import ResponseMetadata, SuccessResponse
+from app.models.profile import ProfileResponse
+from app.serialization import Projection, success_response
+from app.services import storage
+from app.services.profile_service import profile_service
+from benchmarks.common import BENCH_USER_ID, make_token, measure_rps, print_results, seed_profile, time_per_call
+
+
+def seed(addresses: int = 5, audit_entries: int = 100) -> dict:
+    """Store a profile with addresses and a full audit page."""
+    profile = seed_profile()
+    for i in range(addresses):
+        storage.create_address({
+            "profile_id": profile["id"],
+            "type": "current" if i == 0 else "permanent",
+            "address_line1": f"{i + 1} MG Road",
+            "address_line2": "Near Metro Station",
+            "city": "Bengaluru",
+            "state": "Karnataka",
+            "postal_code": "560001",
+            "country": "India",
+            "is_primary": i == 0,
+            "verification_status": "unverified",
+        })
+    for i in range(audit_entries):
+        storage.create_audit_entry({
+            "profile_id": profile["id"],
+            "action": "update",
+            "actor_id": BENCH_USER_ID,
+            "actor_role": "customer",
+            "field_name": "address",
+            "from_value": {"address_line1": f"{i} MG Road", "city": "Bengaluru", "postal_code": "560001"},
+            "to_value": {"address_line1": f"{i + 1} MG Road", "city": "Bengaluru", "postal_code": "560001"},
+            "correlation_id": "bench",
+        })
+    return profile
+
+
+def _validated(model, response_type, records) -> bytes:
+    # What the routes did before: build models, then FastAPI dumps, re-validates
+    # against response_model, runs jsonable_encoder and encodes with json.dumps
+    data = [model(**record) for record in records] if isinstance(records, list) else model(**records)
+    envelope = SuccessResponse(data=data, metadata=ResponseMetadata(correlation_id="bench"))
+    validated = response_type.model_validate(envelope.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def _projected(projection: Projection, records) -> bytes:
+    data = projection.many(records) if isinstance(records, list) else projection(records)
+    return success_response(data, "bench").body
+
+
+async def main(iterations: int = 2000, requests: int = 3000, concurrency: int = 50) -> None:
+    from main import app
+
+    profile = seed()
+    masked = await profile_service._apply_pii_masking(storage.get_profile_by_id(profile["id"]), "customer")
+    cases = [
+        ("profile", "/api/v1/profiles/me", ProfileResponse, SuccessResponse[ProfileResponse], masked),
+        ("address list", "/api/v1/profiles/me/addresses", AddressResponse, SuccessResponse[List[AddressResponse]],
+         storage.get_addresses_by_profile_id(profile["id"])),
+        ("audit list", "/api/v1/profiles/me/audit?limit=100", AuditResponse, SuccessResponse[List[AuditResponse]],
+         storage.get_audit_entries_by_profile_id(profile["id"], limit=100)),
+    ]
+
+    rows = []
+    for name, _, model, response_type, records in cases:
+        projection = Projection(model)
+        rows.append([name, "validated models + json", time_per_call(lambda: _validated(model, response_type, records), iterations)])
+        rows.append([name, "projection + orjson", time_per_call(lambda: _projected(projection, records), iterations)])
+    print_results(f"Serialization per response ({iterations} iterations)", rows, ["endpoint", "path", "us/response"])
+
+    headers = {"Authorization": f"Bearer {make_token()}"}
+    rows = []
+    for name, path, *_ in cases:
+        result = await measure_rps(app, path, headers=headers, requests=requests, concurrency=concurrency)
+        rows.append([name, result["rps"], result["p50_ms"], result["p95_ms"]])
+    print_results(
+        f"End-to-end throughput ({requests} requests, concurrency {concurrency})",
+        rows,
+        ["endpoint", "req/s", "p50 ms", "p95 ms"]
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
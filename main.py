@@ -7,16 +7,31 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.admission import AdmissionMiddleware
+from app.compression import CompressionMiddleware
 from app.config import config
+from app.events import change_bus
+from app.idempotency import IdempotencyMiddleware
+from app.logging_pipeline import logging_pipeline
+from app.loop_monitor import loop_monitor
+from app.metrics import MetricsMiddleware
 from app.middleware import ErrorHandlingMiddleware, RequestContextMiddleware
+from app.rate_limit import RateLimitMiddleware
+from app.tracing import TracingMiddleware
+from app.security import start_verifier, stop_verifier
+from app.services.entity_sync_service import entity_sync_service
+from app.services.notification_dispatcher import notification_dispatcher
 from app.routes import (
     addresses,
     audit,
+    changes,
     consents,
     documents,
     enrichment,
+    events,
     health,
     kyc,
+    metrics,
     profiles,
     reference,
 )
@@ -30,14 +45,27 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup: Initialize utils-service configuration and logging
     init_utils(CONFIG_DIR)
+    if config.async_logging.enabled:
+        logging_pipeline.start()
     logger.info(f"Starting {config.service.name} v{config.service.version}")
     logger.info(f"Environment: {config.service.environment}")
     logger.info(f"Port: {config.service.port}")
+    await start_verifier()
+    entity_sync_service.start()
+    notification_dispatcher.start()
+    await change_bus.start()
+    loop_monitor.start()
     
     yield
     
     # Shutdown
     logger.info(f"Shutting down {config.service.name}")
+    await loop_monitor.stop()
+    await change_bus.stop()
+    await entity_sync_service.stop()
+    await notification_dispatcher.stop()
+    await stop_verifier()
+    logging_pipeline.stop()
 
 
 # Create FastAPI application
@@ -61,11 +89,18 @@ app.add_middleware(
 )
 
 # Add custom middleware
+app.add_middleware(IdempotencyMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(ErrorHandlingMiddleware)
+app.add_middleware(TracingMiddleware)
 app.add_middleware(RequestContextMiddleware)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 # Register routes
 app.include_router(health.router)
+app.include_router(metrics.router)
 app.include_router(profiles.router)
 app.include_router(addresses.router)
 app.include_router(kyc.router)
@@ -74,6 +109,8 @@ app.include_router(consents.router)
 app.include_router(enrichment.router)
 app.include_router(audit.router)
 app.include_router(reference.router)
+app.include_router(events.router)
+app.include_router(changes.router)
 
 
 @app.get("/")
@@ -3,8 +3,10 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.rate_limit import rate_limiter
 from app.services import storage
 from main import app
+from tests.upstream_simulator import UpstreamSimulator
 
 
 @pytest.fixture
@@ -13,6 +15,12 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def simulator():
+    """In-process simulator of the upstream services, with seeded faults."""
+    return UpstreamSimulator(seed=42)
+
+
 @pytest.fixture
 def auth_headers():
     """Mock authentication headers."""
@@ -33,6 +41,21 @@ def reset_storage():
     storage.consents_db.clear()
     storage.enrichments_db.clear()
     storage.audit_entries_db.clear()
+    storage.entity_outbox_db.clear()
+    storage.entity_outbox_by_profile.clear()
+    storage.notification_outbox_db.clear()
+    storage.notification_outbox_latest.clear()
+    storage.change_log.clear()
+    storage.record_versions.clear()
+    storage.profile_versions.clear()
+    storage.profile_change_index.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Reset rate limiter state before each test."""
+    rate_limiter.reset()
     yield
 
 
@@ -0,0 +1,43 @@
+"""Tests for admission control."""
+
+from app.admission import CRITICAL, HIGH, LOW, NORMAL, admission_controller, classify
+from app.config import config
+from app.loop_monitor import loop_monitor
+
+
+def test_classify_priorities():
+    """Test requests are assigned their priority class."""
+    assert classify("GET", "/health") == CRITICAL
+    assert classify("GET", "/metrics") == CRITICAL
+    assert classify("POST", "/api/v1/profiles/p-1/enrichment") == HIGH
+    assert classify("POST", "/api/v1/profiles/p-1/enrichment/e-1/review") == HIGH
+    assert classify("GET", "/api/v1/profiles/p-1/enrichment") == NORMAL
+    assert classify("GET", "/api/v1/profiles/me/audit") == LOW
+    assert classify("GET", "/api/v1/profiles/me") == NORMAL
+
+
+def test_overloaded_requests_shed_with_503(client, monkeypatch):
+    """Test requests over the in-flight limit get a fast 503 while health stays up."""
+    monkeypatch.setattr(config.admission, "max_in_flight", 0)
+    admission_controller.reset()
+
+    response = client.get("/api/v1/profiles/me", headers={"X-Correlation-Id": "corr-1"})
+    assert response.status_code == 503
+    assert response.json()["error"]["code"] == "SERVICE_OVERLOADED"
+    assert response.json()["metadata"]["correlation_id"] == "corr-1"
+    assert response.headers["Retry-After"] == str(config.admission.retry_after_seconds)
+
+    assert client.get("/health").status_code == 200
+    assert admission_controller.shed[NORMAL] == 1
+
+
+def test_loop_lag_sheds_low_priority_first(monkeypatch):
+    """Test lag between the class thresholds sheds bulk reads but not maker-checker decisions."""
+    monkeypatch.setattr(config.admission, "max_loop_lag_ms", 100)
+    monkeypatch.setattr(loop_monitor, "lag_seconds", 0.12)
+    admission_controller.reset()
+
+    assert admission_controller.overloaded(LOW)
+    assert admission_controller.overloaded(NORMAL)
+    assert not admission_controller.overloaded(HIGH)
+    assert not admission_controller.overloaded(CRITICAL)
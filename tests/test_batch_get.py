@@ -0,0 +1,83 @@
+"""Tests for the batch profile read endpoint."""
+
+from unittest.mock import AsyncMock, patch
+
+from app.services import storage
+
+OFFICER_CONTEXT = {
+    "authenticated": True,
+    "user_id": "officer-1",
+    "tenant_id": "test-tenant-id",
+    "role": "risk_officer",
+    "correlation_id": "test-corr-id"
+}
+
+
+def _store(profile_id: str, **fields) -> None:
+    storage.profiles_db[profile_id] = {
+        "id": profile_id,
+        "user_id": f"user-{profile_id}",
+        "first_name": "John",
+        "kyc_status": "pending",
+        "completeness_percentage": 0.0,
+        "updated_at": "2026-01-10T00:00:00",
+        "pan_id": "ABCDE1234F",
+        **fields
+    }
+
+
+@patch("app.services.profile_service.authz_service_client.check_permissions", new_callable=AsyncMock)
+@patch("app.routes.profiles.extract_user_context")
+def test_batch_get_in_order_with_item_errors(mock_context, mock_check, client):
+    """Test results follow request order, with per-item errors for missing and denied ids."""
+    mock_context.return_value = OFFICER_CONTEXT
+    mock_check.return_value = {"p-1": True, "p-2": False, "p-3": True}
+    for profile_id in ("p-1", "p-2", "p-3"):
+        _store(profile_id)
+
+    response = client.post(
+        "/api/v1/profiles:batchGet",
+        json={"profile_ids": ["p-3", "missing", "p-1", "p-2", "p-3"], "fields": ["id", "first_name"]}
+    )
+    assert response.status_code == 200
+    items = response.json()["data"]
+    assert [item["profile_id"] for item in items] == ["p-3", "missing", "p-1", "p-2", "p-3"]
+    assert items[0]["data"] == {"id": "p-3", "first_name": "John"}
+    assert items[1]["error"]["code"] == "NOT_FOUND"
+    assert items[3]["error"]["code"] == "NOT_FOUND"
+    assert items[4]["data"] == items[0]["data"]
+
+    # One bulk authz call for the distinct, existing, not-owned ids
+    mock_check.assert_awaited_once()
+    assert sorted(mock_check.await_args.args[2]) == ["p-1", "p-2", "p-3"]
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_batch_get_limits(mock_context, client, monkeypatch):
+    """Test oversized batches and unknown fields are rejected."""
+    from app.config import config
+
+    mock_context.return_value = OFFICER_CONTEXT
+    monkeypatch.setattr(config.business, "batch_get_max_ids", 2)
+
+    response = client.post("/api/v1/profiles:batchGet", json={"profile_ids": ["a", "b", "c"]})
+    assert response.status_code == 400
+
+    response = client.post("/api/v1/profiles:batchGet", json={"profile_ids": ["a"], "fields": ["pan_id"]})
+    assert response.status_code == 400
+
+
+@patch("app.services.profile_service.authz_service_client.check_permission", new_callable=AsyncMock, return_value=False)
+@patch("app.services.profile_service.authz_service_client.check_ownership", new_callable=AsyncMock, return_value=False)
+@patch("app.services.profile_service.authz_service_client.check_permissions", new_callable=AsyncMock)
+@patch("app.routes.profiles.extract_user_context")
+def test_denied_batch_item_not_cached(mock_context, mock_check, mock_owner, mock_permission, client):
+    """Test a profile denied in a batch is not cached for the single-profile read."""
+    mock_context.return_value = OFFICER_CONTEXT
+    mock_check.return_value = {"denied-1": False}
+    _store("denied-1")
+
+    items = client.post("/api/v1/profiles:batchGet", json={"profile_ids": ["denied-1"]}).json()["data"]
+    assert items[0]["error"]["code"] == "NOT_FOUND"
+
+    assert client.get("/api/v1/profiles/denied-1").status_code == 404
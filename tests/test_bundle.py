@@ -0,0 +1,48 @@
+"""Tests for the profile bundle endpoint."""
+
+from unittest.mock import patch
+
+USER_CONTEXT = {
+    "authenticated": True,
+    "user_id": "test-user-id",
+    "tenant_id": "test-tenant-id",
+    "role": "customer",
+    "correlation_id": "test-corr-id"
+}
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_bundle_includes_requested_parts(mock_context, client, sample_profile):
+    """Test only the included sub-resources are loaded and returned."""
+    mock_context.return_value = USER_CONTEXT
+    response = client.get("/api/v1/profiles/me/bundle?include=addresses,kyc,documents")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert set(data) == {"profile", "addresses", "kyc", "documents"}
+    assert data["profile"]["id"] == sample_profile["id"]
+    assert data["addresses"] == []
+    assert data["kyc"] is None
+
+    response = client.get("/api/v1/profiles/me/bundle")
+    assert set(response.json()["data"]) == {"profile"}
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_bundle_unknown_include_rejected(mock_context, client, sample_profile):
+    """Test an unknown include is a 400."""
+    mock_context.return_value = USER_CONTEXT
+    assert client.get("/api/v1/profiles/me/bundle?include=addresses,secrets").status_code == 400
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_bundle_combined_etag(mock_context, client, sample_profile):
+    """Test the bundle ETag validates the whole bundle and changes with any part."""
+    mock_context.return_value = USER_CONTEXT
+    url = "/api/v1/profiles/me/bundle?include=addresses,consents"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    client.patch("/api/v1/profiles/me", json={"first_name": "Jane"})
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
@@ -0,0 +1,80 @@
+"""Tests for the change feed."""
+
+from unittest.mock import AsyncMock, patch
+
+from app.services import storage
+from app.services.change_feed_service import change_feed_service
+
+USER_CONTEXT = {
+    "authenticated": True,
+    "user_id": "crm-service",
+    "tenant_id": "test-tenant-id",
+    "role": "system",
+    "correlation_id": "test-corr-id"
+}
+
+
+def _seed():
+    profile = storage.create_profile({"user_id": "u1", "first_name": "John"})
+    address = storage.create_address({"profile_id": profile["id"], "city": "Pune"})
+    storage.update_profile(profile["id"], {"first_name": "Jane"})
+    storage.delete_address(address["id"])
+    return profile, address
+
+
+def test_mutations_are_sequenced():
+    """Test each mutation gets the next sequence number and a per-record version."""
+    profile, address = _seed()
+    changes = storage.get_changes_after(0, 10)
+    assert [c["sequence"] for c in changes] == list(range(changes[0]["sequence"], changes[0]["sequence"] + 4))
+    assert [(c["entity"], c["operation"]) for c in changes] == [
+        ("profile", "create"), ("address", "create"), ("profile", "update"), ("address", "delete")
+    ]
+    assert changes[2]["fields"] == ["first_name"]
+    assert changes[2]["version"] == 2
+    assert changes[3]["fields"] == ["deleted_at"]
+    assert changes[3]["profile_id"] == profile["id"]
+
+
+@patch("app.services.change_feed_service.authz_service_client.check_permission", new_callable=AsyncMock, return_value=True)
+@patch("app.routes.changes.extract_user_context")
+def test_feed_pages_with_resume_token(mock_context, mock_authz, client):
+    """Test paging through the feed and resuming from next_token."""
+    mock_context.return_value = USER_CONTEXT
+    _seed()
+
+    page = client.get("/api/v1/changes?limit=3").json()["data"]
+    assert len(page["changes"]) == 3
+    assert page["has_more"] is True
+
+    page = client.get(f"/api/v1/changes?after={page['next_token']}&limit=3").json()["data"]
+    assert [c["operation"] for c in page["changes"]] == ["delete"]
+    assert page["has_more"] is False
+
+    token = page["next_token"]
+    page = client.get(f"/api/v1/changes?after={token}").json()["data"]
+    assert page["changes"] == []
+    assert page["next_token"] == token
+
+
+@patch("app.services.change_feed_service.authz_service_client.check_permission", new_callable=AsyncMock, return_value=True)
+@patch("app.routes.changes.extract_user_context")
+def test_feed_rejects_bad_and_expired_tokens(mock_context, mock_authz, client):
+    """Test malformed tokens are 400 and positions no longer retained are 410."""
+    mock_context.return_value = USER_CONTEXT
+    _seed()
+    token = change_feed_service.encode_token(storage.oldest_change_sequence())
+
+    assert client.get("/api/v1/changes?after=not-a-token").status_code == 400
+
+    storage.change_log.popleft()
+    storage.change_log.popleft()
+    assert client.get(f"/api/v1/changes?after={token}").status_code == 410
+
+
+@patch("app.services.change_feed_service.authz_service_client.check_permission", new_callable=AsyncMock, return_value=False)
+@patch("app.routes.changes.extract_user_context")
+def test_feed_requires_permission(mock_context, mock_authz, client):
+    """Test callers without the feed permission are rejected."""
+    mock_context.return_value = USER_CONTEXT
+    assert client.get("/api/v1/changes").status_code == 403
@@ -0,0 +1,54 @@
+"""Tests for response compression."""
+
+from unittest.mock import patch
+
+from app.compression import negotiate
+from app.services import storage
+
+USER_CONTEXT = {
+    "authenticated": True,
+    "user_id": "test-user-id",
+    "tenant_id": "test-tenant-id",
+    "role": "customer",
+    "correlation_id": "test-corr-id"
+}
+
+
+def test_negotiate_respects_weights():
+    """Test the client's weights decide, and q=0 or unknown codings are refused."""
+    assert negotiate("gzip") == "gzip"
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("identity") is None
+    assert negotiate("") is None
+    assert negotiate("*") is not None
+
+
+@patch("app.routes.audit.extract_user_context")
+def test_large_audit_page_compressed(mock_context, client, sample_profile):
+    """Test a large JSON response is gzip-encoded with Vary set."""
+    mock_context.return_value = USER_CONTEXT
+    for i in range(50):
+        storage.create_audit_entry({
+            "profile_id": sample_profile["id"],
+            "action": "update",
+            "actor_id": "test-user-id",
+            "field_name": "address",
+            "from_value": {"line1": f"{i} MG Road", "city": "Bengaluru"},
+            "to_value": {"line1": f"{i + 1} MG Road", "city": "Bengaluru"}
+        })
+
+    response = client.get("/api/v1/profiles/me/audit", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()["data"]) == 50
+
+
+def test_small_and_health_responses_not_compressed(client):
+    """Test small bodies and health probes are sent as is."""
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/api/v1/profiles/me", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 401
+    assert "content-encoding" not in response.headers
@@ -0,0 +1,89 @@
+"""Tests for request deadline propagation."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.clients.base_client import BaseHTTPClient
+from app.config import config
+from app.deadline import Deadline, DeadlineExceeded, deadline_for_request, reset_deadline, set_deadline
+from tests.upstream_simulator import FaultProfile, LatencyDistribution
+
+
+def test_deadline_from_header():
+    """Test deadline budget taken from the request header."""
+    deadline = deadline_for_request("/api/v1/profiles/me", {config.deadlines.header: "250"})
+    assert deadline.budget == pytest.approx(0.25)
+    assert 0 < deadline.remaining_ms() <= 250
+
+
+def test_deadline_from_route_slo():
+    """Test deadline budget falls back to the longest matching route SLO."""
+    deadline = deadline_for_request("/api/v1/profiles/me/kyc", {})
+    expected = config.deadlines.route_slos_ms["/api/v1/profiles/me/kyc"]
+    assert deadline.budget == pytest.approx(expected / 1000)
+
+
+def test_deadline_capped_at_max():
+    """Test header budgets are capped at the configured maximum."""
+    deadline = deadline_for_request("/health", {config.deadlines.header: "99999999"})
+    assert deadline.budget == pytest.approx(config.deadlines.max_ms / 1000)
+
+
+@pytest.mark.asyncio
+async def test_client_gives_up_when_deadline_exhausted():
+    """Test upstream calls are not attempted once the budget is spent."""
+    client = BaseHTTPClient("http://upstream.invalid", timeout=5, retry_attempts=3)
+    token = set_deadline(Deadline(0))
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await client.get("/anything")
+    finally:
+        reset_deadline(token)
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_raises_deadline_exceeded_when_budget_runs_out_mid_attempt(simulator):
+    """Test an attempt cut short by the budget surfaces as DeadlineExceeded, not a timeout."""
+    simulator.set_faults("/entities/profiles", FaultProfile(latency=LatencyDistribution.parse("fixed:500")))
+    client = BaseHTTPClient("http://upstream.test", timeout=5, retry_attempts=3, transport=simulator.transport())
+    token = set_deadline(Deadline(0.05))
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await client.get("/entities/profiles/profile-1")
+    finally:
+        reset_deadline(token)
+        await client.close()
+    assert simulator.call_count("GET", "/entities/profiles") == 1
+
+
+@pytest.mark.asyncio
+async def test_client_does_not_modify_caller_headers():
+    """Test deadline and correlation headers are added to a copy of the caller's headers."""
+    client = BaseHTTPClient("http://upstream.invalid", timeout=5, retry_attempts=1)
+    headers = {"If-None-Match": '"abc"'}
+    token = set_deadline(Deadline(0))
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await client.get("/anything", headers=headers, correlation_id="corr-1")
+    finally:
+        reset_deadline(token)
+        await client.close()
+    assert headers == {"If-None-Match": '"abc"'}
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_spent_budget_in_authz_check_is_504(mock_context, client, sample_profile):
+    """Test a deadline hit inside a client wrapper reaches the 504 mapping instead of a denial."""
+    mock_context.return_value = {
+        "authenticated": True,
+        "user_id": "officer-1",
+        "tenant_id": "test-tenant-id",
+        "role": "risk_officer",
+        "correlation_id": "test-corr-id"
+    }
+
+    response = client.get(f"/api/v1/profiles/{sample_profile['id']}", headers={config.deadlines.header: "0"})
+    assert response.status_code == 504
+    assert response.json()["error"]["code"] == "DEADLINE_EXCEEDED"
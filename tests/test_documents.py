@@ -0,0 +1,84 @@
+"""Tests for document listing and download URL resolution."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.clients.document_service import DocumentServiceClient
+from app.services import storage
+from app.services.document_service import document_service
+
+
+@pytest.fixture
+def document_client(simulator):
+    """Document service client wired to the simulator."""
+    return DocumentServiceClient(transport=simulator.transport())
+
+
+@pytest.mark.asyncio
+async def test_download_urls_resolved_in_one_call(document_client, simulator):
+    """Test many documents resolve through a single bulk call."""
+    document_ids = [f"doc-{i}" for i in range(20)]
+
+    urls = await document_client.resolve_download_urls(document_ids)
+
+    assert all(urls[document_id] for document_id in document_ids)
+    assert simulator.call_count("POST", "/documents/batch") == 1
+    assert simulator.call_count("GET", "/documents") == 0
+
+
+@pytest.mark.asyncio
+async def test_download_urls_cached_until_near_expiry(document_client, simulator):
+    """Test cached URLs are reused and expiring ones are refetched."""
+    first = await document_client.resolve_download_urls(["doc-1", "doc-2"])
+    second = await document_client.resolve_download_urls(["doc-1", "doc-2"])
+    assert first == second
+    assert simulator.call_count("POST", "/documents/batch") == 1
+
+    url, _ = document_client._url_cache["doc-1"]
+    document_client._url_cache["doc-1"] = (url, 0)
+    await document_client.resolve_download_urls(["doc-1", "doc-2"])
+    assert simulator.call_count("POST", "/documents/batch") == 2
+
+
+@pytest.mark.asyncio
+async def test_download_urls_fall_back_without_bulk_endpoint(document_client, simulator):
+    """Test per-document calls are used when there is no bulk endpoint."""
+    simulator.bulk_documents_enabled = False
+
+    urls = await document_client.resolve_download_urls(["doc-1", "doc-2", "doc-3"])
+
+    assert all(urls.values())
+    assert simulator.call_count("GET", "/documents/") == 3
+    assert document_client.bulk_supported is False
+
+
+@pytest.mark.asyncio
+async def test_bulk_endpoint_reprobed_after_cooldown(document_client, simulator):
+    """Test a bulk endpoint that answered 404 is tried again once the cooldown ends."""
+    document_client.bulk_reprobe_seconds = 0
+    simulator.bulk_documents_enabled = False
+    await document_client.resolve_download_urls(["doc-1"])
+
+    simulator.bulk_documents_enabled = True
+    await document_client.resolve_download_urls(["doc-2"])
+
+    assert document_client.bulk_supported is True
+    assert simulator.call_count("POST", "/documents/batch") == 2
+
+
+@pytest.mark.asyncio
+async def test_get_documents_does_not_mutate_storage(document_client, sample_profile):
+    """Test listing attaches download URLs without writing to stored rows."""
+    storage.create_document({
+        "profile_id": sample_profile["id"],
+        "document_id": "doc-1",
+        "document_type": "pan",
+        "verification_status": "pending"
+    })
+
+    with patch("app.services.document_service.document_service_client", document_client):
+        documents = await document_service.get_documents(sample_profile["id"])
+
+    assert documents[0]["download_url"].startswith("https://documents.example.com/doc-1")
+    assert "download_url" not in storage.get_documents_by_profile_id(sample_profile["id"])[0]
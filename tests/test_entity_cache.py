@@ -0,0 +1,106 @@
+"""Tests for the entity-service near-cache."""
+
+import asyncio
+
+import pytest
+
+from app.clients.entity_cache import EntityNearCache
+from app.clients.entity_service import EntityServiceClient
+from app.deadline import Deadline, DeadlineExceeded, set_deadline
+from tests.upstream_simulator import FaultProfile, LatencyDistribution
+
+
+@pytest.fixture
+def simulator(simulator):
+    """Upstream simulator seeded with one profile entity."""
+    simulator.profiles["profile-1"] = {
+        "id": "profile-1",
+        "first_name": "John",
+        "updated_at": "2026-01-10T00:00:00+00:00"
+    }
+    return simulator
+
+
+@pytest.fixture
+def near_cache(simulator):
+    """Near-cache wired to the simulator."""
+    return EntityNearCache(client=EntityServiceClient(transport=simulator.transport()), ttl=30)
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_served_locally(near_cache, simulator):
+    """Test repeated reads within the TTL make one upstream call."""
+    for _ in range(5):
+        entity = await near_cache.get_profile_entity("profile-1")
+        assert entity["first_name"] == "John"
+
+    assert simulator.call_count("GET", "/entities/profiles/profile-1") == 1
+    assert near_cache.counters["hits"] == 4
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_revalidates_with_304(near_cache, simulator):
+    """Test an unchanged entity is revalidated conditionally."""
+    await near_cache.get_profile_entity("profile-1")
+    near_cache._entries["profile:profile-1"].expires_at = 0
+
+    entity = await near_cache.get_profile_entity("profile-1")
+
+    assert entity["first_name"] == "John"
+    assert simulator.stats["not_modified"] == 1
+    assert near_cache.counters["revalidated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch(near_cache, simulator):
+    """Test concurrent readers of a cold key make a single upstream call."""
+    results = await asyncio.gather(*(near_cache.get_addresses_by_profile("profile-1") for _ in range(10)))
+
+    assert results == [[]] * 10
+    assert simulator.call_count("GET", "/entities/profiles/profile-1/addresses") == 1
+
+
+@pytest.mark.asyncio
+async def test_hot_entry_is_refreshed_ahead(near_cache, simulator):
+    """Test hot entries near expiry are revalidated in the background."""
+    await near_cache.get_profile_entity("profile-1")
+    entry = near_cache._entries["profile:profile-1"]
+    entry.refresh_at = 0
+    entry.hits = near_cache.hot_hits
+
+    await near_cache.get_profile_entity("profile-1")
+    await asyncio.sleep(0.05)
+
+    assert near_cache.counters["refreshed_ahead"] == 1
+    assert simulator.call_count("GET", "/entities/profiles/profile-1") == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_revalidation_is_kept(near_cache, simulator):
+    """Test a revalidation in flight when the profile is invalidated does not re-cache the old value."""
+    await near_cache.get_profile_entity("profile-1")
+    near_cache._entries["profile:profile-1"].expires_at = 0
+    simulator.set_faults("/entities", FaultProfile(latency=LatencyDistribution.parse("fixed:50")))
+
+    revalidation = asyncio.create_task(near_cache.get_profile_entity("profile-1"))
+    await asyncio.sleep(0.01)
+    near_cache.invalidate_profile("profile-1")
+    await revalidation
+
+    assert "profile:profile-1" not in near_cache._entries
+
+
+@pytest.mark.asyncio
+async def test_shared_fetch_honours_each_callers_deadline(near_cache, simulator):
+    """Test a short-deadline caller times out alone while a caller sharing the fetch gets the value."""
+    simulator.set_faults("/entities", FaultProfile(latency=LatencyDistribution.parse("fixed:50")))
+
+    async def read(budget: float):
+        set_deadline(Deadline(budget))
+        return await near_cache.get_profile_entity("profile-1")
+
+    short, long = await asyncio.gather(read(0.01), read(5), return_exceptions=True)
+
+    assert isinstance(short, DeadlineExceeded)
+    assert long["first_name"] == "John"
+    assert simulator.call_count("GET", "/entities/profiles/profile-1") == 1
@@ -0,0 +1,90 @@
+"""Tests for write-behind sync to entity-service."""
+
+import pytest
+
+from app.clients.entity_service import EntityServiceClient
+from app.models.profile import ProfileCreate
+from app.services import storage
+from app.services.entity_sync_service import EntitySyncService
+from app.services.profile_service import profile_service
+from tests.upstream_simulator import FaultProfile
+
+
+@pytest.fixture
+def sync_service(simulator):
+    """Entity sync service wired to the simulator."""
+    return EntitySyncService(client=EntityServiceClient(transport=simulator.transport()))
+
+
+def test_repeated_updates_are_coalesced(sync_service):
+    """Test updates waiting in the outbox are merged into one entry."""
+    sync_service.record_update("profile-1", {"first_name": "Jane"})
+    sync_service.record_update("profile-1", {"last_name": "Smith"})
+    sync_service.record_update("profile-1", {"first_name": "Janet"})
+
+    entries = storage.get_outbox_entries_by_profile_id("profile-1")
+    assert len(entries) == 1
+    assert entries[0]["payload"] == {"first_name": "Janet", "last_name": "Smith"}
+    assert sync_service.counters["coalesced"] == 2
+
+
+def test_only_entity_fields_are_queued(sync_service):
+    """Test identity numbers and bank details in the stored row are not sent."""
+    sync_service.record_create("profile-1", {
+        "id": "profile-1",
+        "first_name": "John",
+        "pan_id": "ABCDE1234F",
+        "aadhaar_id": "123456789012",
+        "salary_account_number": "1234567890",
+    })
+    sync_service.record_update("profile-1", {"annual_income": 1200000.0, "last_name": "Doe"})
+
+    entries = storage.get_outbox_entries_by_profile_id("profile-1")
+    assert entries[0]["payload"] == {"id": "profile-1", "first_name": "John", "last_name": "Doe"}
+
+
+@pytest.mark.asyncio
+async def test_created_profile_is_queued_with_its_completeness():
+    """Test the create entry carries the completeness computed for the new profile."""
+    profile = await profile_service.create_profile(
+        ProfileCreate(user_id="user-1", tenant_id="tenant-1", first_name="John", last_name="Doe"),
+        created_by="user-1"
+    )
+
+    payload = storage.get_outbox_entries_by_profile_id(profile["id"])[0]["payload"]
+    assert payload["completeness_percentage"] == profile["completeness_percentage"] > 0
+
+
+@pytest.mark.asyncio
+async def test_flush_delivers_in_order_per_profile(sync_service, simulator):
+    """Test a create is delivered before later updates to the same profile."""
+    sync_service.record_create("profile-1", {"id": "profile-1", "first_name": "John"})
+    create_entry = storage.get_outbox_entries_by_profile_id("profile-1")[0]
+    # An update arriving while the create is on the wire gets its own entry
+    storage.update_outbox_entry(create_entry["id"], {"in_flight": True})
+    sync_service.record_update("profile-1", {"first_name": "Jane"})
+    storage.update_outbox_entry(create_entry["id"], {"in_flight": False})
+
+    assert await sync_service.flush_once() == 1
+    assert await sync_service.flush_once() == 1
+    assert simulator.calls == [
+        ("POST", "/entities/profiles"),
+        ("PATCH", "/entities/profiles/profile-1"),
+    ]
+    assert simulator.profiles["profile-1"]["first_name"] == "Jane"
+    assert storage.entity_outbox_db == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_is_retried_with_backoff(sync_service, simulator):
+    """Test upstream failures keep the entry queued with a backoff."""
+    simulator.set_faults("/entities", FaultProfile(error_rate=1.0))
+    sync_service.record_update("profile-1", {"first_name": "Jane"})
+
+    assert await sync_service.flush_once() == 0
+
+    entry = storage.get_outbox_entries_by_profile_id("profile-1")[0]
+    assert entry["attempts"] == 1
+    assert entry["in_flight"] is False
+    assert await sync_service.flush_once() == 0  # not yet due
+    assert sync_service.stats()["pending"] == 1
@@ -0,0 +1,139 @@
+"""Tests for the change bus and the server-sent event stream."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.events import HEARTBEAT, ChangeBus, StreamLimitExceeded, change_bus, profile_topic
+from app.routes.events import event_stream
+from app.services.kyc_service import kyc_service
+
+USER_CONTEXT = {
+    "authenticated": True,
+    "user_id": "test-user-id",
+    "tenant_id": "test-tenant-id",
+    "role": "customer",
+    "correlation_id": "test-corr-id"
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_change_bus():
+    """Close streams and clear the replay buffer between tests."""
+    change_bus.reset()
+    yield
+    change_bus.reset()
+
+
+@pytest.mark.asyncio
+async def test_subscribers_receive_only_their_topics():
+    """Test events are delivered to subscribers of the event's topic."""
+    bus = ChangeBus()
+    mine = bus.subscribe("user-1", [profile_topic("p1")])
+    other = bus.subscribe("user-2", [profile_topic("p2")])
+
+    event = bus.publish(profile_topic("p1"), "kyc.updated", {"kyc_status": "verified"})
+
+    assert await mine.next_frame(1) == event.frame
+    assert event.frame.startswith(f"id: {event.id}\nevent: kyc.updated\ndata: ".encode())
+    assert await other.next_frame(0.01) == HEARTBEAT
+
+
+@pytest.mark.asyncio
+async def test_resume_from_last_event_id():
+    """Test a reconnecting subscriber gets the events after its last id."""
+    bus = ChangeBus()
+    first = bus.publish(profile_topic("p1"), "kyc.updated", {"n": 1})
+    bus.publish(profile_topic("p2"), "kyc.updated", {"n": 2})
+    third = bus.publish(profile_topic("p1"), "kyc.updated", {"n": 3})
+
+    subscription = bus.subscribe("user-1", [profile_topic("p1")], last_event_id=first.id)
+    assert await subscription.next_frame(1) == third.frame
+
+    stale = bus.subscribe("user-1", [profile_topic("p1")], last_event_id="unknown-1")
+    assert b"event: reset" in await stale.next_frame(1)
+
+
+def test_connection_limits():
+    """Test per-user and total connection limits."""
+    bus = ChangeBus()
+    with patch("app.events.config.events.max_connections_per_user", 2), \
+            patch("app.events.config.events.max_connections", 3):
+        bus.subscribe("user-1", ["t"])
+        second = bus.subscribe("user-1", ["t"])
+        with pytest.raises(StreamLimitExceeded) as exc:
+            bus.subscribe("user-1", ["t"])
+        assert exc.value.per_user
+
+        bus.subscribe("user-2", ["t"])
+        with pytest.raises(StreamLimitExceeded) as exc:
+            bus.subscribe("user-3", ["t"])
+        assert not exc.value.per_user
+
+        bus.unsubscribe(second)
+        bus.subscribe("user-1", ["t"])
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_closed():
+    """Test a subscriber whose queue fills up is closed instead of buffering."""
+    with patch("app.events.config.events.subscriber_queue_size", 2):
+        bus = ChangeBus()
+        subscription = bus.subscribe("user-1", ["t"])
+    for n in range(3):
+        bus.publish("t", "kyc.updated", {"n": n})
+
+    assert subscription.closed
+    assert await subscription.next_frame(1) is None
+
+
+@pytest.mark.asyncio
+async def test_kyc_check_update_publishes_event(sample_profile):
+    """Test completing a KYC check pushes the new status to the profile topic."""
+    kyc = await kyc_service.initiate_kyc(sample_profile["id"])
+    subscription = change_bus.subscribe("test-user-id", [profile_topic(sample_profile["id"])])
+
+    await kyc_service.update_kyc_check(kyc["id"], "identity_verified", True)
+
+    frame = await subscription.next_frame(1)
+    assert b"event: kyc.updated" in frame
+    assert b'"identity_verified":true' in frame
+
+
+@pytest.mark.asyncio
+async def test_event_stream_frames_and_cleanup():
+    """Test the stream starts with a retry hint and releases its slot when closed."""
+    subscription = change_bus.subscribe("test-user-id", ["t"])
+    stream = event_stream(subscription)
+    assert (await stream.__anext__()).startswith(b"retry: ")
+
+    event = change_bus.publish("t", "kyc.updated", {})
+    assert await stream.__anext__() == event.frame
+
+    subscription.close()
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert change_bus.connections == 0
+
+
+@patch("app.routes.events.extract_user_context")
+def test_stream_requires_profile_or_officer_role(mock_context, client):
+    """Test callers with nothing to subscribe to get 404."""
+    mock_context.return_value = USER_CONTEXT
+    assert client.get("/api/v1/events").status_code == 404
+
+
+@patch("app.routes.events.extract_user_context")
+def test_stream_per_user_limit(mock_context, client, sample_profile):
+    """Test a user past the per-user stream limit gets 429."""
+    mock_context.return_value = USER_CONTEXT
+    with patch("app.events.config.events.max_connections_per_user", 1):
+        change_bus.subscribe("test-user-id", [profile_topic(sample_profile["id"])])
+        response = client.get("/api/v1/events")
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
+
+
+def test_stream_requires_authentication(client):
+    """Test unauthenticated callers are rejected."""
+    assert client.get("/api/v1/events").status_code == 401
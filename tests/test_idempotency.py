@@ -0,0 +1,196 @@
+"""Tests for Idempotency-Key handling."""
+
+import asyncio
+import json
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from app.cache import InMemoryCache
+from app.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+USER_CONTEXT = {
+    "authenticated": True,
+    "user_id": "test-user-id",
+    "tenant_id": "test-tenant-id",
+    "role": "customer",
+    "correlation_id": "test-corr-id"
+}
+
+ADDRESS = {
+    "type": "residential",
+    "address_line1": "123 Main St",
+    "city": "Mumbai",
+    "state": "Maharashtra",
+    "postal_code": "400001",
+    "country": "India",
+    "is_primary": True
+}
+
+
+@pytest.mark.asyncio
+async def test_add_sets_only_absent_keys():
+    """Test the cache's set-if-absent used to claim keys."""
+    cache = InMemoryCache()
+    assert await cache.add("k", "first", 60) is True
+    assert await cache.add("k", "second", 60) is False
+    assert await cache.get("k") == "first"
+
+    await cache.set("expired", "value", -1)
+    assert await cache.add("expired", "fresh", 60) is True
+
+
+@patch("app.routes.addresses.extract_user_context")
+def test_retry_is_replayed_without_executing(mock_context, client, sample_profile, auth_headers):
+    """Test a retry with the same key gets the stored response and creates nothing."""
+    mock_context.return_value = USER_CONTEXT
+    headers = {**auth_headers, "Idempotency-Key": str(uuid.uuid4())}
+
+    first = client.post("/api/v1/profiles/me/addresses", json=ADDRESS, headers=headers)
+    retry = client.post("/api/v1/profiles/me/addresses", json=ADDRESS, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json()["data"] == first.json()["data"]
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert len(client.get("/api/v1/profiles/me/addresses", headers=auth_headers).json()["data"]) == 1
+
+
+@patch("app.routes.addresses.extract_user_context")
+def test_key_reused_with_different_body_rejected(mock_context, client, sample_profile, auth_headers):
+    """Test a key cannot be replayed for a different request."""
+    mock_context.return_value = USER_CONTEXT
+    headers = {**auth_headers, "Idempotency-Key": str(uuid.uuid4())}
+
+    client.post("/api/v1/profiles/me/addresses", json=ADDRESS, headers=headers)
+    response = client.post("/api/v1/profiles/me/addresses", json={**ADDRESS, "city": "Pune"}, headers=headers)
+
+    assert response.status_code == 422
+    assert response.json()["error"]["code"] == "IDEMPOTENCY_KEY_REUSED"
+
+
+@patch("app.routes.addresses.extract_user_context")
+def test_requests_without_key_execute(mock_context, client, sample_profile, auth_headers):
+    """Test requests without a key are not deduplicated."""
+    mock_context.return_value = USER_CONTEXT
+
+    client.post("/api/v1/profiles/me/addresses", json=ADDRESS, headers=auth_headers)
+    client.post("/api/v1/profiles/me/addresses", json=ADDRESS, headers=auth_headers)
+
+    assert len(client.get("/api/v1/profiles/me/addresses", headers=auth_headers).json()["data"]) == 2
+
+
+def _scope(key: str) -> dict:
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/v1/profiles/me/addresses",
+        "headers": [(b"idempotency-key", key.encode()), (b"authorization", b"Bearer token")],
+        "state": {"user_id": "user-1", "correlation_id": "corr-1"},
+    }
+
+
+async def _call(middleware: IdempotencyMiddleware, scope: dict, body: bytes) -> list:
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_waits_for_in_flight_result():
+    """Test a duplicate arriving mid-request gets the first result instead of executing."""
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append((await receive())["body"])
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.start", "status": 201, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": json.dumps({"id": len(calls)}).encode()})
+
+    middleware = IdempotencyMiddleware(app, store=IdempotencyStore())
+    middleware.store.cache = InMemoryCache()
+    scope = _scope("key-1")
+
+    first, duplicate = await asyncio.gather(_call(middleware, scope, b"{}"), _call(middleware, scope, b"{}"))
+
+    assert calls == [b"{}"]
+    assert first[1]["body"] == duplicate[1]["body"] == b'{"id": 1}'
+    assert (b"idempotent-replayed", b"true") in duplicate[0]["headers"]
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_not_stored():
+    """Test a failed request releases its key so a retry executes again."""
+    statuses = [503, 201]
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": statuses.pop(0), "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = IdempotencyMiddleware(app, store=IdempotencyStore())
+    middleware.store.cache = InMemoryCache()
+    scope = _scope("key-2")
+
+    assert (await _call(middleware, scope, b"{}"))[0]["status"] == 503
+    assert (await _call(middleware, scope, b"{}"))[0]["status"] == 201
+    assert statuses == []
+
+
+class _UnavailableCache:
+    """Cache backend that stores nothing, refusing or granting every claim."""
+
+    def __init__(self, grant: bool):
+        self.grant = grant
+
+    async def add(self, key, value, ttl):
+        return self.grant
+
+    async def get(self, key):
+        return None
+
+    async def set(self, key, value, ttl):
+        pass
+
+    async def delete(self, key):
+        pass
+
+
+async def _created(scope, receive, send):
+    await asyncio.sleep(0.01)
+    await send({"type": "http.response.start", "status": 201, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+@pytest.mark.asyncio
+async def test_fail_open_store_runs_duplicates_cleanly():
+    """Test duplicates that both claim the key (store unavailable) each complete."""
+    middleware = IdempotencyMiddleware(_created, store=IdempotencyStore())
+    middleware.store.cache = _UnavailableCache(grant=True)
+    scope = _scope("key-3")
+
+    first, duplicate = await asyncio.gather(_call(middleware, scope, b"{}"), _call(middleware, scope, b"{}"))
+
+    assert first[0]["status"] == duplicate[0]["status"] == 201
+    assert middleware._in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_unclaimable_key_times_out(monkeypatch):
+    """Test a store that refuses claims but has no record waits out the deadline, then 409s."""
+    from app.config import config
+
+    monkeypatch.setattr(config.idempotency, "wait_timeout_ms", 120)
+    middleware = IdempotencyMiddleware(_created, store=IdempotencyStore())
+    middleware.store.cache = _UnavailableCache(grant=False)
+
+    sent = await _call(middleware, _scope("key-4"), b"{}")
+
+    assert sent[0]["status"] == 409
@@ -0,0 +1,135 @@
+"""Tests for asymmetric JWT verification against a JWKS key set."""
+
+import base64
+import json
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import JWTError, jwt
+
+from app.security import CryptographyBackend, JoseBackend, JWKSKeySet, JWKSVerifier
+
+
+def _b64(value: int, length: int = None) -> str:
+    raw = value.to_bytes(length or (value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _pem(private_key) -> bytes:
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+
+
+@pytest.fixture(scope="module")
+def keys():
+    """An RSA and a P-256 signing key."""
+    return {
+        "rsa-1": rsa.generate_private_key(public_exponent=65537, key_size=2048),
+        "ec-1": ec.generate_private_key(ec.SECP256R1()),
+    }
+
+
+@pytest.fixture
+def jwks_file(tmp_path, keys):
+    """JWKS document for the signing keys."""
+    rsa_numbers = keys["rsa-1"].public_key().public_numbers()
+    ec_numbers = keys["ec-1"].public_key().public_numbers()
+    document = {"keys": [
+        {"kty": "RSA", "kid": "rsa-1", "use": "sig", "alg": "RS256",
+         "n": _b64(rsa_numbers.n), "e": _b64(rsa_numbers.e)},
+        {"kty": "EC", "kid": "ec-1", "use": "sig", "crv": "P-256",
+         "x": _b64(ec_numbers.x, 32), "y": _b64(ec_numbers.y, 32)},
+    ]}
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps(document))
+    return str(path)
+
+
+def _sign(keys, kid: str, alg: str, ttl: int = 3600, **extra) -> str:
+    claims = {"user_id": "test-user-id", "role": "customer", "exp": int(time.time()) + ttl, **extra}
+    return jwt.encode(claims, _pem(keys[kid]).decode(), algorithm=alg, headers={"kid": kid})
+
+
+@pytest.mark.parametrize("backend", [CryptographyBackend, JoseBackend])
+@pytest.mark.parametrize("kid,alg", [("rsa-1", "RS256"), ("ec-1", "ES256")])
+def test_verifies_signed_tokens(jwks_file, keys, backend, kid, alg):
+    """Test RS256 and ES256 tokens verify with each backend."""
+    verifier = JWKSVerifier(JWKSKeySet(path=jwks_file, backend=backend()), ["RS256", "ES256"])
+    claims = verifier.verify(_sign(keys, kid, alg))
+    assert claims["user_id"] == "test-user-id"
+
+
+def test_rejects_unknown_kid(jwks_file, keys):
+    """Test tokens signed with an unknown key are rejected."""
+    verifier = JWKSVerifier(JWKSKeySet(path=jwks_file, min_refresh_interval=0), ["RS256"])
+    other = {"rsa-2": rsa.generate_private_key(public_exponent=65537, key_size=2048)}
+    with pytest.raises(JWTError):
+        verifier.verify(_sign(other, "rsa-2", "RS256"))
+
+
+def test_rejects_tampered_payload(jwks_file, keys):
+    """Test signature checks cover the payload."""
+    verifier = JWKSVerifier(JWKSKeySet(path=jwks_file), ["RS256"])
+    header, _, signature = _sign(keys, "rsa-1", "RS256").split(".")
+    forged = base64.urlsafe_b64encode(json.dumps({"user_id": "admin", "role": "admin"}).encode()).rstrip(b"=").decode()
+    with pytest.raises(JWTError):
+        verifier.verify(f"{header}.{forged}.{signature}")
+
+
+def test_rejects_disallowed_algorithm(jwks_file, keys):
+    """Test HS256 tokens are refused by an asymmetric verifier."""
+    verifier = JWKSVerifier(JWKSKeySet(path=jwks_file), ["RS256"])
+    token = jwt.encode({"user_id": "x"}, "secret", algorithm="HS256", headers={"kid": "rsa-1"})
+    with pytest.raises(JWTError):
+        verifier.verify(token)
+
+
+def test_rejects_expired_token(jwks_file, keys):
+    """Test expiry is enforced after signature verification."""
+    verifier = JWKSVerifier(JWKSKeySet(path=jwks_file), ["ES256"])
+    with pytest.raises(JWTError):
+        verifier.verify(_sign(keys, "ec-1", "ES256", ttl=-10))
+
+
+@pytest.mark.parametrize("claims", [{"exp": "soon"}, {"exp": None, "nbf": [1]}, {"exp": True}])
+def test_malformed_time_claims_rejected(jwks_file, keys, claims):
+    """Test non-numeric exp/nbf claims are rejected as JWT errors, not crashes."""
+    verifier = JWKSVerifier(JWKSKeySet(path=jwks_file), ["RS256"])
+    with pytest.raises(JWTError):
+        verifier.verify(_sign(keys, "rsa-1", "RS256", **claims))
+
+
+def test_issuer_and_audience_enforced(jwks_file, keys):
+    """Test configured iss/aud must match, with aud as a string or a list."""
+    verifier = JWKSVerifier(JWKSKeySet(path=jwks_file), ["RS256"], issuer="https://idp.test", audience="profile-service")
+
+    assert verifier.verify(_sign(keys, "rsa-1", "RS256", iss="https://idp.test", aud="profile-service"))
+    assert verifier.verify(_sign(keys, "rsa-1", "RS256", iss="https://idp.test", aud=["other", "profile-service"]))
+    for claims in (
+        {"iss": "https://evil.test", "aud": "profile-service"},
+        {"iss": "https://idp.test", "aud": "other-service"},
+        {"iss": "https://idp.test"},
+        {"aud": "profile-service"},
+    ):
+        with pytest.raises(JWTError):
+            verifier.verify(_sign(keys, "rsa-1", "RS256", **claims))
+
+
+@pytest.mark.asyncio
+async def test_key_rotation_picked_up_on_refresh(tmp_path, keys, jwks_file):
+    """Test a refreshed JWKS replaces the parsed keys."""
+    key_set = JWKSKeySet(path=jwks_file)
+    verifier = JWKSVerifier(key_set, ["RS256"])
+    verifier.verify(_sign(keys, "rsa-1", "RS256"))
+
+    with open(jwks_file, "w") as f:
+        json.dump({"keys": []}, f)
+    await key_set.refresh()
+
+    with pytest.raises(JWTError):
+        verifier.verify(_sign(keys, "rsa-1", "RS256"))
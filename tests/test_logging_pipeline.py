@@ -0,0 +1,124 @@
+"""Tests for the asynchronous logging pipeline."""
+
+import json
+import logging
+import sys
+
+import pytest
+
+from app.logging_pipeline import LoggingPipeline, RedactingFormatter, prepare, redact
+
+
+class _JSONFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps({
+            "message": record.getMessage(),
+            "duration": record.duration,
+            "timestamp_ms": record.timestamp_ms,
+            "account": record.account
+        })
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("pan ABCDE1234F", "pan [REDACTED_PAN]"),
+    ("aadhaar 2345 6789 0123", "aadhaar [REDACTED_AADHAAR]"),
+    ("account 12345678901", "account [REDACTED_ACCOUNT]"),
+    ("profile 550e8400-e29b-41d4-a716-446655440000", "profile 550e8400-e29b-41d4-a716-446655440000"),
+    ("GET /api/v1/profiles/me - 200 in 0.012s", "GET /api/v1/profiles/me - 200 in 0.012s"),
+    ("took 0.123456789123s", "took 0.123456789123s"),
+    ("phone +919876543210", "phone +919876543210"),
+])
+def test_redaction(text, expected):
+    """Test PII patterns are masked and ordinary ids are kept."""
+    assert redact(text) == expected
+
+
+def test_records_written_by_listener_with_redaction():
+    """Test records reach the original handler, formatted and redacted."""
+    logger = logging.getLogger("test.pipeline")
+    logger.propagate = False
+    handler = _ListHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logger.addHandler(handler)
+
+    pipeline = LoggingPipeline(queue_size=100)
+    pipeline.start(loggers=[logger])
+    try:
+        logger.warning("PAN %s submitted", "ABCDE1234F")
+    finally:
+        pipeline.stop()
+        logger.removeHandler(handler)
+
+    assert handler.lines == ["WARNING PAN [REDACTED_PAN] submitted"]
+    assert logger.handlers == []
+
+
+def test_overflow_drops_instead_of_blocking():
+    """Test a full queue drops records rather than blocking the caller."""
+    pipeline = LoggingPipeline(queue_size=2, overflow_policy="drop")
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "message", None, None)
+    for _ in range(5):
+        pipeline.enqueue(record, [])
+
+    assert pipeline.stats()["dropped"] == 3
+
+
+def test_sampling_keeps_warnings():
+    """Test INFO records are sampled under pressure while warnings are kept."""
+    pipeline = LoggingPipeline(queue_size=100, overflow_policy="sample", sample_every=10, sample_threshold_percent=0)
+    info = logging.LogRecord("x", logging.INFO, __file__, 1, "info", None, None)
+    warning = logging.LogRecord("x", logging.WARNING, __file__, 1, "warning", None, None)
+    for _ in range(20):
+        pipeline.enqueue(info, [])
+    pipeline.enqueue(warning, [])
+
+    stats = pipeline.stats()
+    assert stats["sampled_out"] == 18
+    assert stats["enqueued"] == 3
+
+
+def test_prepare_detaches_args_and_traceback():
+    """Test queued records hold the merged message and rendered traceback, not live objects."""
+    fields = ["first_name"]
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("x", logging.ERROR, __file__, 1, "Update of %s failed", (fields,), sys.exc_info())
+
+    prepared = prepare(record)
+    fields.append("last_name")
+
+    assert prepared.msg == "Update of ['first_name'] failed"
+    assert prepared.args is None
+    assert prepared.exc_info is None
+    assert "ValueError: boom" in prepared.exc_text
+    assert record.exc_info is not None
+    assert logging.Formatter().format(prepared).startswith("Update of ['first_name'] failed\nTraceback")
+
+
+def test_redaction_keeps_json_output_valid():
+    """Test redaction masks message text and string extras but leaves numbers in structured output."""
+    formatter = RedactingFormatter(_JSONFormatter())
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "PAN %s verified", ("ABCDE1234F",), None)
+    record.duration = 0.123456789123
+    record.timestamp_ms = 1767225600123
+    record.account = "12345678901"
+
+    line = json.loads(formatter.format(record))
+
+    assert line == {
+        "message": "PAN [REDACTED_PAN] verified",
+        "duration": 0.123456789123,
+        "timestamp_ms": 1767225600123,
+        "account": "[REDACTED_ACCOUNT]"
+    }
+    assert record.account == "12345678901"
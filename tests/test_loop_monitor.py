@@ -0,0 +1,39 @@
+"""Tests for the event-loop lag monitor."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.loop_monitor import LoopLagMonitor
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_lag_measured_after_blocking_call():
+    """Test a blocking call shows up as loop lag."""
+    monitor = LoopLagMonitor(interval_ms=10, watchdog=False)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    _block_the_loop(0.1)
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+
+    assert monitor.max_lag_seconds >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_watchdog_captures_blocking_stack():
+    """Test the watchdog records the stack of the callback blocking the loop."""
+    monitor = LoopLagMonitor(interval_ms=10, blocking_threshold_ms=50, watchdog=True)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    _block_the_loop(0.3)
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+
+    assert monitor.last_blocking_stack is not None
+    assert "_block_the_loop" in monitor.last_blocking_stack
@@ -0,0 +1,41 @@
+"""Tests for the metrics registry and /metrics endpoint."""
+
+from app.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test histogram buckets are cumulative with sum and count."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert 'latency_seconds_sum{route="/a"} 5.55' in text
+
+
+def test_label_values_escaped():
+    """Test label values are escaped in the exposition format."""
+    registry = MetricsRegistry()
+    registry.counter("events_total", "Events.", ("name",)).inc('a"b')
+    assert 'events_total{name="a\\"b"} 1' in registry.render()
+
+
+def test_metrics_endpoint(client, sample_profile):
+    """Test /metrics reports route templates, storage sizes and cache lookups."""
+    client.get("/health")
+    client.get("/api/v1/profiles/some-id")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'http_requests_total{route="/health",method="GET",status="200"}' in text
+    assert 'route="/api/v1/profiles/{profile_id}"' in text
+    assert 'storage_table_rows{table="profiles"} 1' in text
+    assert "# TYPE http_request_duration_seconds histogram" in text
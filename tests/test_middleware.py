@@ -0,0 +1,52 @@
+"""Tests for request context and error handling middleware."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.deadline import DeadlineExceeded
+from app.middleware import ErrorHandlingMiddleware, RequestContextMiddleware
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ErrorHandlingMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    @app.get("/slow")
+    async def slow():
+        raise DeadlineExceeded("budget spent")
+
+    return app
+
+
+def test_context_headers_added(client):
+    """Test correlation ID is echoed and response time is reported."""
+    response = client.get("/health", headers={"X-Correlation-Id": "corr-1"})
+    assert response.status_code == 200
+    assert response.headers["X-Correlation-Id"] == "corr-1"
+    assert response.headers["X-Response-Time"].endswith("s")
+
+
+def test_unhandled_exception_envelope():
+    """Test unhandled exceptions become a 500 error envelope."""
+    client = TestClient(_app(), raise_server_exceptions=False)
+    response = client.get("/boom", headers={"X-Correlation-Id": "corr-2"})
+
+    assert response.status_code == 500
+    body = response.json()
+    assert body["error"]["code"] == "INTERNAL_SERVER_ERROR"
+    assert body["metadata"]["correlation_id"] == "corr-2"
+    assert response.headers["X-Correlation-Id"] == "corr-2"
+
+
+def test_deadline_exceeded_maps_to_504():
+    """Test deadline exhaustion becomes a 504 error envelope."""
+    client = TestClient(_app(), raise_server_exceptions=False)
+    response = client.get("/slow")
+
+    assert response.status_code == 504
+    assert response.json()["error"]["code"] == "DEADLINE_EXCEEDED"
@@ -0,0 +1,86 @@
+"""Tests for debounced, batched profile notifications."""
+
+import time
+
+import pytest
+
+from app.clients.notification_service import NotificationServiceClient
+from app.services import storage
+from app.services.notification_dispatcher import NotificationDispatcher
+from tests.upstream_simulator import FaultProfile
+
+
+@pytest.fixture
+def dispatcher(simulator):
+    """Notification dispatcher wired to the simulator."""
+    return NotificationDispatcher(client=NotificationServiceClient(transport=simulator.transport()))
+
+
+def test_burst_of_changes_is_debounced(dispatcher):
+    """Test changes to one profile fold into one waiting entry."""
+    dispatcher.notify("profile-1", "profile.updated", ["first_name"])
+    dispatcher.notify("profile-1", "profile.updated", ["last_name"])
+    dispatcher.notify("profile-1", "profile.updated", ["addresses"])
+
+    entries = list(storage.notification_outbox_db.values())
+    assert len(entries) == 1
+    assert entries[0]["fields"] == ["addresses", "first_name", "last_name"]
+    assert dispatcher.counters["debounced"] == 2
+
+
+def test_debounce_is_capped(dispatcher):
+    """Test continuous changes cannot postpone delivery past max_debounce_ms."""
+    dispatcher.notify("profile-1", "profile.updated", ["first_name"])
+    entry = storage.get_latest_notification_entry("profile-1", "profile.updated")
+    entry["first_change_at"] -= 60
+
+    dispatcher.notify("profile-1", "profile.updated", ["last_name"])
+    assert entry["next_attempt_at"] < time.time()
+
+
+@pytest.mark.asyncio
+async def test_due_notifications_are_batched_per_endpoint(dispatcher, simulator):
+    """Test one call per endpoint carries every due notification."""
+    for profile_id in ("profile-1", "profile-2", "profile-3"):
+        dispatcher.notify(profile_id, "profile.updated", ["first_name"])
+    dispatcher.notify("profile-1", "kyc.status_changed", ["kyc_status"])
+
+    # Nothing is due while the debounce window is open
+    assert await dispatcher.flush_once() == 0
+
+    assert await dispatcher.flush_once(now=time.time() + 60) == 4
+    assert sorted(simulator.calls) == [
+        ("POST", "/notifications/kyc-status"),
+        ("POST", "/notifications/profile-updated"),
+    ]
+    assert len(simulator.notifications) == 4
+    assert storage.notification_outbox_db == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_with_backoff(dispatcher, simulator):
+    """Test upstream failures keep entries queued with a backoff."""
+    simulator.set_faults("/notifications", FaultProfile(error_rate=1.0))
+    dispatcher.notify("profile-1", "profile.updated", ["first_name"])
+
+    assert await dispatcher.flush_once(now=time.time() + 60) == 0
+    entry = storage.get_latest_notification_entry("profile-1", "profile.updated")
+    assert entry["attempts"] == 1
+    assert entry["next_attempt_at"] > time.time()
+    assert not entry["in_flight"]
+
+    # A change arriving during the backoff joins the entry without hastening it
+    next_attempt_at = entry["next_attempt_at"]
+    dispatcher.notify("profile-1", "profile.updated", ["last_name"])
+    assert entry["fields"] == ["first_name", "last_name"]
+    assert entry["next_attempt_at"] == next_attempt_at
+
+    simulator.set_faults("/notifications", FaultProfile())
+    assert await dispatcher.flush_once(now=time.time() + 600) == 1
+    assert simulator.notifications[0][1]["fields"] == ["first_name", "last_name"]
+
+
+def test_unknown_event_rejected(dispatcher):
+    """Test only events with an endpoint can be queued."""
+    with pytest.raises(ValueError):
+        dispatcher.notify("profile-1", "profile.exploded", ["first_name"])
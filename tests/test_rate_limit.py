@@ -0,0 +1,72 @@
+"""Tests for rate limiting."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.rate_limit import HOUR, InMemoryRateLimitBackend, RateLimitRule, rate_limiter
+
+
+def test_gcra_allows_burst_then_limits():
+    """Test a full burst is allowed and the next request waits one interval."""
+    backend = InMemoryRateLimitBackend()
+    rule = RateLimitRule(limit=3, period=60)
+
+    assert [backend.hit_sync("k", rule, 100.0)[0] for _ in range(3)] == [True, True, True]
+    allowed, retry_after = backend.hit_sync("k", rule, 100.0)
+    assert allowed is False
+    assert retry_after == pytest.approx(20.0)
+
+    # One emission interval later a single request is allowed again
+    assert backend.hit_sync("k", rule, 120.0)[0] is True
+    assert backend.hit_sync("k", rule, 120.0)[0] is False
+
+
+def test_gcra_keys_are_independent():
+    """Test limits are tracked per key."""
+    backend = InMemoryRateLimitBackend()
+    rule = RateLimitRule(limit=1, period=60)
+
+    assert backend.hit_sync("a", rule, 0.0)[0] is True
+    assert backend.hit_sync("b", rule, 0.0)[0] is True
+    assert backend.hit_sync("a", rule, 0.0)[0] is False
+
+
+def test_sweep_drops_idle_keys():
+    """Test keys whose state has lapsed are swept."""
+    backend = InMemoryRateLimitBackend()
+    rule = RateLimitRule(limit=10, period=10)
+    backend.hit_sync("idle", rule, 0.0)
+    backend._sweep(100.0)
+    assert "idle" not in backend._tat
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_profile_update_rate_limited(mock_context, client, sample_profile, monkeypatch):
+    """Test profile updates beyond the hourly limit get 429 RATE_LIMITED."""
+    mock_context.return_value = {
+        "authenticated": True,
+        "user_id": "test-user-id",
+        "tenant_id": "test-tenant-id",
+        "role": "customer",
+        "correlation_id": "test-corr-id"
+    }
+    monkeypatch.setitem(rate_limiter.rules, "profile_update", RateLimitRule(2, HOUR))
+
+    for _ in range(2):
+        assert client.patch("/api/v1/profiles/me", json={"first_name": "Jane"}).status_code == 200
+
+    response = client.patch("/api/v1/profiles/me", json={"first_name": "Jane"})
+    assert response.status_code == 429
+    assert response.json()["error"]["code"] == "RATE_LIMITED"
+    assert int(response.headers["Retry-After"]) == HOUR // 2
+
+
+def test_health_exempt_from_global_limits(client, monkeypatch):
+    """Test health probes are never rate limited."""
+    monkeypatch.setitem(rate_limiter.rules, "ip", RateLimitRule(1, 60))
+    for _ in range(3):
+        assert client.get("/health").status_code == 200
+
+    assert client.get("/api/v1/profiles/me").status_code == 401
+    assert client.get("/api/v1/profiles/me").status_code == 429
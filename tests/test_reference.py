@@ -48,3 +48,33 @@ def test_get_consent_types(client):
     assert data["success"] is True
     assert "types" in data["data"]
     assert "terms_and_conditions" in data["data"]["types"]
+
+
+def test_get_combined_reference_data(client):
+    """Test the combined document carries every reference list."""
+    response = client.get("/api/v1/reference")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert "active" in data["profile_statuses"]["statuses"]
+    assert "pending" in data["kyc_statuses"]["statuses"]
+    assert "residential" in data["address_types"]["types"]
+    assert "pan" in data["document_types"]["types"]
+    assert "terms_and_conditions" in data["consent_types"]["types"]
+
+
+def test_reference_data_is_cacheable(client):
+    """Test reference responses carry a strong ETag and a long max-age."""
+    response = client.get("/api/v1/reference/kyc-statuses")
+    etag = response.headers["etag"]
+    assert not etag.startswith("W/")
+    assert "max-age=86400" in response.headers["cache-control"]
+    assert client.get("/api/v1/reference/kyc-statuses").headers["etag"] == etag
+
+
+def test_reference_data_not_modified(client):
+    """Test a matching If-None-Match is answered with 304."""
+    etag = client.get("/api/v1/reference").headers["etag"]
+    response = client.get("/api/v1/reference", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
@@ -0,0 +1,73 @@
+"""Tests for JWT verification and the claims cache."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from jose import JWTError, jwt
+
+from app.config import config
+from app.security import ClaimsCache, claims_cache, decode_token, verify_token
+
+
+def _token(ttl: int = 3600, **claims) -> str:
+    payload = {"user_id": "test-user-id", "role": "customer", "exp": int(time.time()) + ttl, **claims}
+    return jwt.encode(payload, config.security.jwt_secret_key, algorithm=config.security.jwt_algorithm)
+
+
+@pytest.fixture(autouse=True)
+def reset_claims_cache():
+    """Reset the global claims cache before each test."""
+    claims_cache.clear()
+    yield
+    claims_cache.clear()
+
+
+def test_verified_claims_are_cached():
+    """Test a repeated token is verified once."""
+    token = _token()
+    with patch("app.security.decode_token", wraps=decode_token) as decode:
+        first = verify_token(token)
+        second = verify_token(token)
+
+    assert first["user_id"] == "test-user-id"
+    assert second is first
+    assert decode.call_count == 1
+
+
+def test_cache_entry_expires_with_token():
+    """Test claims are not served from cache past the token's exp."""
+    cache = ClaimsCache(max_entries=10, max_ttl=300)
+    token = _token(ttl=5)
+    cache.put(token, jwt.get_unverified_claims(token))
+    assert cache.get(token) is not None
+
+    with patch("app.security.time.time", return_value=time.time() + 10):
+        assert cache.get(token) is None
+
+
+def test_cache_entry_bounded_by_max_ttl():
+    """Test long-lived tokens are re-verified after the max TTL."""
+    cache = ClaimsCache(max_entries=10, max_ttl=1)
+    token = _token(ttl=3600)
+    cache.put(token, jwt.get_unverified_claims(token))
+
+    with patch("app.security.time.time", return_value=time.time() + 2):
+        assert cache.get(token) is None
+
+
+def test_expired_token_rejected():
+    """Test expired tokens fail verification."""
+    with pytest.raises(JWTError):
+        verify_token(_token(ttl=-10))
+
+
+def test_cache_is_bounded():
+    """Test least recently used entries are evicted."""
+    cache = ClaimsCache(max_entries=2, max_ttl=60)
+    tokens = [_token(n=i) for i in range(3)]
+    for token in tokens:
+        cache.put(token, jwt.get_unverified_claims(token))
+
+    assert cache.get(tokens[0]) is None
+    assert cache.get(tokens[2]) is not None
@@ -0,0 +1,110 @@
+"""Tests for the projection and fast JSON rendering path."""
+
+import json
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+from app.models.address import AddressResponse
+from app.models.audit import AuditResponse
+from app.models.enums import KYCStatus
+from app.models.profile import ProfileResponse
+from app.serialization import Projection, dumps, success_response
+from app.services import storage
+
+
+def test_projection_copies_only_model_fields():
+    """Test raw record fields outside the response model are never projected."""
+    projection = Projection(ProfileResponse)
+    projected = projection({
+        "id": "p-1",
+        "user_id": "u-1",
+        "kyc_status": "pending",
+        "updated_at": "2026-01-10T00:00:00",
+        "pan_id": "ABCDE1234F",
+        "aadhaar_id": "123456789012"
+    })
+    assert set(projected) == set(ProfileResponse.model_fields)
+    assert "pan_id" not in projected
+    assert projected["completeness_percentage"] is None
+    assert projected["first_name"] is None
+
+
+def test_projection_null_fields():
+    """Test fields listed as null are rendered as null even when present."""
+    projection = Projection(ProfileResponse, null_fields=("pan_id_masked",))
+    assert projection({"pan_id_masked": "ABCXXXXF"})["pan_id_masked"] is None
+
+
+def test_dumps_handles_enums_and_dates():
+    """Test enums and dates encode to their JSON values."""
+    assert json.loads(dumps({"status": KYCStatus.VERIFIED, "dob": date(1990, 1, 1)})) == {
+        "status": "verified",
+        "dob": "1990-01-01"
+    }
+
+
+def test_success_response_envelope():
+    """Test the pre-rendered envelope matches the standard shape."""
+    body = json.loads(success_response({"id": "x"}, "corr-1", status_code=201).body)
+    assert body["success"] is True
+    assert body["error"] is None
+    assert body["data"] == {"id": "x"}
+    assert body["metadata"]["correlation_id"] == "corr-1"
+    assert body["metadata"]["timestamp"].endswith("Z")
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_profile_response_fields_unchanged(mock_context, client, sample_profile):
+    """Test the profile endpoint still returns exactly the ProfileResponse fields."""
+    mock_context.return_value = {
+        "authenticated": True,
+        "user_id": "test-user-id",
+        "tenant_id": "test-tenant-id",
+        "role": "customer",
+        "correlation_id": "test-corr-id"
+    }
+    response = client.get("/api/v1/profiles/me")
+    assert response.status_code == 200
+    assert set(response.json()["data"]) == set(ProfileResponse.model_fields)
+
+
+def _assert_matches_model(model, record):
+    projected = json.loads(dumps(Projection(model)(record)))
+    assert projected == model.model_validate(record).model_dump(mode="json")
+
+
+def test_projection_matches_pydantic_rendering():
+    """Test projected storage records render exactly as the response models did."""
+    profile = storage.create_profile({
+        "user_id": "u-1",
+        "first_name": "John",
+        "date_of_birth": date(1990, 1, 1),
+        "email": "john@example.com",
+        "kyc_status": KYCStatus.PENDING,
+        "completeness_percentage": 40.0
+    })
+    address = storage.create_address({
+        "profile_id": profile["id"],
+        "type": "residential",
+        "address_line1": "1 MG Road",
+        "city": "Bengaluru",
+        "state": "Karnataka",
+        "postal_code": "560001",
+        "country": "India",
+        "is_primary": True,
+        "verification_status": "verified",
+        "verified_at": datetime.now(timezone.utc).isoformat()
+    })
+    audit = storage.create_audit_entry({
+        "profile_id": profile["id"],
+        "action": "update",
+        "actor_id": "u-1",
+        "field_name": "first_name",
+        "from_value": "Jon",
+        "to_value": "John"
+    })
+
+    _assert_matches_model(ProfileResponse, profile)
+    _assert_matches_model(AddressResponse, address)
+    _assert_matches_model(AuditResponse, audit)
+    assert json.loads(dumps(Projection(AddressResponse)(address)))["created_at"].endswith("Z")
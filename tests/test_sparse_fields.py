@@ -0,0 +1,68 @@
+"""Tests for sparse fieldsets and ETags on reads."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.services.profile_service import profile_service
+
+USER_CONTEXT = {
+    "authenticated": True,
+    "user_id": "test-user-id",
+    "tenant_id": "test-tenant-id",
+    "role": "customer",
+    "correlation_id": "test-corr-id"
+}
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_profile_fields_projection(mock_context, client, sample_profile):
+    """Test only the requested fields are returned."""
+    mock_context.return_value = USER_CONTEXT
+    response = client.get("/api/v1/profiles/me?fields=first_name,kyc_status,completeness_percentage")
+    assert response.status_code == 200
+    assert response.json()["data"] == {
+        "first_name": "John",
+        "kyc_status": "pending",
+        "completeness_percentage": 0.0
+    }
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_unknown_field_rejected(mock_context, client, sample_profile):
+    """Test requesting a field outside the response model is a 400."""
+    mock_context.return_value = USER_CONTEXT
+    response = client.get("/api/v1/profiles/me?fields=first_name,pan_id")
+    assert response.status_code == 400
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_etag_per_fieldset_and_not_modified(mock_context, client, sample_profile):
+    """Test each fieldset has its own ETag and a matching If-None-Match gets 304."""
+    mock_context.return_value = USER_CONTEXT
+    full = client.get("/api/v1/profiles/me")
+    sparse = client.get("/api/v1/profiles/me?fields=first_name")
+    assert full.headers["etag"] != sparse.headers["etag"]
+
+    response = client.get("/api/v1/profiles/me?fields=first_name", headers={"If-None-Match": sparse.headers["etag"]})
+    assert response.status_code == 304
+    assert response.headers["etag"] == sparse.headers["etag"]
+
+    client.patch("/api/v1/profiles/me", json={"first_name": "Jane"})
+    response = client.get("/api/v1/profiles/me?fields=first_name", headers={"If-None-Match": sparse.headers["etag"]})
+    assert response.status_code == 200
+    assert response.json()["data"] == {"first_name": "Jane"}
+
+
+@pytest.mark.asyncio
+async def test_masking_skipped_for_excluded_fields():
+    """Test masked identity values are only derived when requested, and raw values are always dropped."""
+    profile = {"id": "p-1", "pan_id": "ABCDE1234F", "aadhaar_id": "123456789012"}
+
+    masked = await profile_service._apply_pii_masking(profile, "customer", frozenset({"first_name"}))
+    assert "pan_id_masked" not in masked and "aadhaar_masked" not in masked
+    assert "pan_id" not in masked and "aadhaar_id" not in masked
+
+    masked = await profile_service._apply_pii_masking(profile, "customer", frozenset({"pan_id_masked"}))
+    assert masked["pan_id_masked"] == "ABCXXXXF"
+    assert "aadhaar_masked" not in masked
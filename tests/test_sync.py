@@ -0,0 +1,94 @@
+"""Tests for the delta sync endpoint."""
+
+from unittest.mock import patch
+
+from app.services import storage
+from app.services.sync_service import SyncService, sync_service
+
+USER_CONTEXT = {
+    "authenticated": True,
+    "user_id": "test-user-id",
+    "tenant_id": "test-tenant-id",
+    "role": "customer",
+    "correlation_id": "test-corr-id"
+}
+
+
+def _address(profile_id: str, city: str) -> dict:
+    return storage.create_address({
+        "profile_id": profile_id,
+        "type": "current",
+        "address_line1": "1 MG Road",
+        "city": city,
+        "state": "Karnataka",
+        "postal_code": "560001",
+        "country": "India",
+        "is_primary": False,
+        "verification_status": "unverified"
+    })
+
+
+def test_profile_versions_index_changes(sample_profile):
+    """Test each change bumps the profile version and the index keeps only the latest per record."""
+    address = _address(sample_profile["id"], "Bengaluru")
+    storage.update_profile(sample_profile["id"], {"first_name": "Jane"})
+    storage.update_address(address["id"], {"city": "Mysuru"})
+
+    assert storage.get_profile_version(sample_profile["id"]) == 3
+    assert storage.get_profile_changes_since(sample_profile["id"], 0) == [
+        ("profile", sample_profile["id"]), ("address", address["id"])
+    ]
+    assert storage.get_profile_changes_since(sample_profile["id"], 2) == [("address", address["id"])]
+    assert storage.get_profile_changes_since(sample_profile["id"], 3) == []
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_sync_returns_only_changes_since_version(mock_context, client, sample_profile):
+    """Test a sync from a version returns just what changed after it, including deletions."""
+    mock_context.return_value = USER_CONTEXT
+    kept = _address(sample_profile["id"], "Bengaluru")
+    removed = _address(sample_profile["id"], "Chennai")
+
+    first = client.get("/api/v1/profiles/me/sync").json()["data"]
+    assert first["full"] is True
+    assert first["profile"]["id"] == sample_profile["id"]
+    assert {a["id"] for a in first["addresses"]} == {kept["id"], removed["id"]}
+
+    storage.update_address(kept["id"], {"city": "Mysuru"})
+    storage.delete_address(removed["id"])
+
+    delta = client.get(f"/api/v1/profiles/me/sync?since={first['since']}").json()["data"]
+    assert delta["full"] is False
+    assert delta["profile"] is None
+    assert [a["city"] for a in delta["addresses"]] == ["Mysuru"]
+    assert [(d["entity"], d["id"]) for d in delta["deleted"]] == [("address", removed["id"])]
+
+    unchanged = client.get(f"/api/v1/profiles/me/sync?since={delta['since']}").json()["data"]
+    assert unchanged["since"] == delta["since"]
+    assert unchanged["addresses"] == [] and unchanged["deleted"] == []
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_sync_ahead_of_server_is_full(mock_context, client, sample_profile):
+    """Test a client version the server has not reached gets a full sync."""
+    mock_context.return_value = USER_CONTEXT
+    _address(sample_profile["id"], "Bengaluru")
+
+    data = client.get(f"/api/v1/profiles/me/sync?since={sync_service.encode_token(999)}").json()["data"]
+    assert data["full"] is True
+    assert len(data["addresses"]) == 1
+
+
+@patch("app.routes.profiles.extract_user_context")
+def test_sync_token_from_previous_epoch_is_full(mock_context, client, sample_profile):
+    """Test a token issued before storage was reset gets a full sync, not a partial delta."""
+    mock_context.return_value = USER_CONTEXT
+    _address(sample_profile["id"], "Bengaluru")
+    _address(sample_profile["id"], "Chennai")
+
+    stale = SyncService().encode_token(1)
+    data = client.get(f"/api/v1/profiles/me/sync?since={stale}").json()["data"]
+    assert data["full"] is True
+    assert len(data["addresses"]) == 2
+
+    assert client.get("/api/v1/profiles/me/sync?since=not-a-token").status_code == 400
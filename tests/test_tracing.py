@@ -0,0 +1,68 @@
+"""Tests for request tracing."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.config import config
+from app.tracing import RequestTrace, _current_trace, span, traced
+
+
+@pytest.fixture
+def trace_all(monkeypatch):
+    """Trace every request and return Server-Timing."""
+    monkeypatch.setattr(config.tracing, "sample_rate", 1.0)
+    monkeypatch.setattr(config.tracing, "server_timing", True)
+
+
+def test_span_is_noop_without_trace():
+    """Test spans outside a sampled request record nothing."""
+    with span("cache") as recorded:
+        pass
+    assert recorded is None
+
+
+@pytest.mark.asyncio
+async def test_spans_recorded_on_current_trace():
+    """Test spans and traced functions record into the request trace."""
+    @traced("masking")
+    async def mask():
+        return "masked"
+
+    trace = RequestTrace("corr-1")
+    token = _current_trace.set(trace)
+    try:
+        with span("cache", namespace="profile"):
+            pass
+        assert await mask() == "masked"
+    finally:
+        _current_trace.reset(token)
+
+    assert [name for name, _, _ in trace.spans] == ["cache", "masking"]
+    assert set(trace.timings()) == {"cache", "masking"}
+
+
+@patch("app.services.profile_service.authz_service_client.check_ownership", new_callable=AsyncMock, return_value=True)
+@patch("app.routes.profiles.extract_user_context")
+def test_server_timing_breakdown(mock_context, mock_ownership, client, sample_profile, trace_all):
+    """Test a traced profile read reports cache, storage, masking and serialization."""
+    mock_context.return_value = {
+        "authenticated": True,
+        "user_id": "test-user-id",
+        "tenant_id": "test-tenant-id",
+        "role": "customer",
+        "correlation_id": "test-corr-id"
+    }
+
+    response = client.get(f"/api/v1/profiles/{sample_profile['id']}")
+    assert response.status_code == 200
+
+    names = {entry.split(";")[0].strip() for entry in response.headers["Server-Timing"].split(",")}
+    assert {"cache", "storage", "masking", "serialization", "total"} <= names
+
+
+def test_unsampled_requests_have_no_header(client, monkeypatch):
+    """Test Server-Timing is only added to sampled requests."""
+    monkeypatch.setattr(config.tracing, "sample_rate", 0.0)
+    monkeypatch.setattr(config.tracing, "server_timing", True)
+    assert "Server-Timing" not in client.get("/health").headers
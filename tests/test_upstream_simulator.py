@@ -0,0 +1,105 @@
+"""Tests for the service clients against the upstream simulator."""
+
+import time
+
+import pytest
+
+from app.clients.authz_service import AuthZServiceClient
+from app.clients.document_service import DocumentServiceClient
+from app.clients.entity_service import EntityServiceClient
+from tests.upstream_simulator import FaultProfile, LatencyDistribution
+
+
+@pytest.mark.asyncio
+async def test_authz_check_against_simulator(simulator):
+    """Test permission checks round-trip through the simulator."""
+    client = AuthZServiceClient(transport=simulator.transport())
+    simulator.deny("officer-2", "profile-1")
+
+    assert await client.check_permission("officer-1", "profile", "profile-1", "read") is True
+    assert await client.check_permission("officer-2", "profile", "profile-1", "read") is False
+    assert simulator.call_count("POST", "/authz/check") == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_authz_batch_check_and_fallback(simulator):
+    """Test batch checks use one call, and fall back to per-resource checks without the endpoint."""
+    client = AuthZServiceClient(transport=simulator.transport())
+    simulator.deny("officer-1", "profile-2")
+
+    expected = {"profile-1": True, "profile-2": False, "profile-3": True}
+    ids = list(expected)
+    assert await client.check_permissions("officer-1", "profile", ids, "read") == expected
+    assert simulator.call_count("POST", "/authz/check-batch") == 1
+
+    simulator.bulk_authz_enabled = False
+    assert await client.check_permissions("officer-1", "profile", ids, "read") == expected
+    assert client.bulk_supported is False
+    assert simulator.call_count("POST", "/authz/check-batch") == 2
+    assert simulator.call_count("POST", "/authz/check") == 5
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_authz_batch_endpoint_reprobed_after_cooldown(simulator):
+    """Test the batch endpoint is tried again once the fallback cooldown ends."""
+    client = AuthZServiceClient(transport=simulator.transport())
+    client.bulk_reprobe_seconds = 0
+    simulator.bulk_authz_enabled = False
+    await client.check_permissions("officer-1", "profile", ["profile-1"], "read")
+
+    simulator.bulk_authz_enabled = True
+    assert await client.check_permissions("officer-1", "profile", ["profile-1", "profile-2"], "read") == {
+        "profile-1": True, "profile-2": True
+    }
+    assert simulator.call_count("POST", "/authz/check-batch") == 2
+    assert simulator.call_count("POST", "/authz/check") == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_entity_round_trip(simulator):
+    """Test create and fetch of a profile entity."""
+    client = EntityServiceClient(transport=simulator.transport())
+
+    created = await client.create_profile_entity({"id": "profile-1", "first_name": "John"})
+    fetched = await client.get_profile_entity("profile-1")
+
+    assert created["id"] == "profile-1"
+    assert fetched["first_name"] == "John"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_are_retried(simulator):
+    """Test 5xx faults exhaust the client's retry attempts."""
+    client = DocumentServiceClient(transport=simulator.transport())
+    simulator.set_faults("/documents", FaultProfile(error_rate=1.0))
+
+    assert await client.get_document_download_url("doc-1") is None
+    assert simulator.call_count("GET", "/documents") == client.retry_attempts
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_loris_is_bounded_by_timeout(simulator):
+    """Test a trickling upstream cannot outlast the client timeout."""
+    client = AuthZServiceClient(transport=simulator.transport())
+    client.timeout = 0.05
+    client.retry_attempts = 1
+    simulator.set_faults("/authz", FaultProfile(slow_loris_rate=1.0, slow_loris_chunk_bytes=1, slow_loris_chunk_delay_ms=20))
+
+    start = time.monotonic()
+    assert await client.check_permission("officer-1", "profile", "profile-1", "read") is False
+    assert time.monotonic() - start < 0.5
+    await client.close()
+
+
+def test_latency_distribution_parse():
+    """Test latency specs parse and sample non-negative values."""
+    import random
+
+    distribution = LatencyDistribution.parse("lognormal:20:0.5")
+    assert distribution.kind == "lognormal"
+    assert all(distribution.sample(random.Random(1)) >= 0 for _ in range(100))
@@ -0,0 +1,453 @@
+"""Local stand-in for entity-service, document-service and authz-service.
+
+The simulator implements the endpoints called by `EntityServiceClient`,
+`DocumentServiceClient` and `AuthZServiceClient` with scriptable latency
+distributions, error rates and slow-loris responses.
+
+In-process (tests)::
+
+    simulator = UpstreamSimulator(seed=7)
+    simulator.set_faults("/authz", FaultProfile(latency=LatencyDistribution.parse("lognormal:20:0.5")))
+    client = AuthZServiceClient(transport=simulator.transport())
+
+Separate process (load tests)::
+
+    python -m tests.upstream_simulator --port 9000 --latency lognormal:20:0.5 --error-rate 0.01
+
+Faults can be changed on a running process with `PUT /__simulator/faults`.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+
+DOWNLOAD_URL_TTL_SECONDS = 900
+
+
+class LatencyDistribution(BaseModel):
+    """Latency distribution; all parameters are in milliseconds."""
+    kind: str = "fixed"
+    params: List[float] = Field(default_factory=lambda: [0.0])
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Parse `kind:p1:p2`, e.g. `fixed:20`, `uniform:10:50`, `normal:30:5`,
+        `lognormal:20:0.5` (median, sigma) or `exponential:25` (mean)."""
+        kind, *params = spec.split(":")
+        return cls(kind=kind, params=[float(p) for p in params] or [0.0])
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency in seconds."""
+        p = self.params
+        if self.kind == "fixed":
+            value = p[0]
+        elif self.kind == "uniform":
+            value = rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(math.log(p[0]), p[1])
+        elif self.kind == "exponential":
+            value = rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0.0
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.kind}")
+        return max(0.0, value) / 1000
+
+
+class FaultProfile(BaseModel):
+    """Behaviour injected into responses for a route prefix."""
+    latency: LatencyDistribution = Field(default_factory=LatencyDistribution)
+    error_rate: float = Field(default=0.0, ge=0, le=1)
+    error_status: int = 503
+    slow_loris_rate: float = Field(default=0.0, ge=0, le=1)
+    slow_loris_chunk_bytes: int = Field(default=8, ge=1)
+    slow_loris_chunk_delay_ms: float = Field(default=200.0, ge=0)
+
+
+class UpstreamSimulator:
+    """Scriptable ASGI stand-in for the upstream services."""
+
+    def __init__(self, seed: Optional[int] = None, default_faults: Optional[FaultProfile] = None):
+        self.rng = random.Random(seed)
+        self.faults: Dict[str, FaultProfile] = {"/": default_faults or FaultProfile()}
+        self.profiles: Dict[str, dict] = {}
+        self.addresses: Dict[str, dict] = {}
+        self.documents: Dict[str, dict] = {}
+        self.notifications: List[Tuple[str, dict]] = []
+        self.denied: Set[Tuple[str, str]] = set()
+        self.permissions: Dict[str, List[str]] = {}
+        self.bulk_documents_enabled = True
+        self.bulk_authz_enabled = True
+        self.calls: List[Tuple[str, str]] = []
+        self.stats: Dict[str, int] = {"requests": 0, "errors_injected": 0, "slow_loris": 0}
+        self.app = self._build_app()
+
+    # -- scripting -----------------------------------------------------
+
+    def set_faults(self, prefix: str, profile: FaultProfile) -> None:
+        """Apply a fault profile to every path under `prefix`."""
+        self.faults[prefix] = profile
+
+    def deny(self, user_id: str, resource_id: str) -> None:
+        """Make authz checks for this user/resource pair return `allowed: false`."""
+        self.denied.add((user_id, resource_id))
+
+    def reset(self) -> None:
+        """Clear data, faults and recorded calls."""
+        self.faults = {"/": FaultProfile()}
+        self.profiles.clear()
+        self.addresses.clear()
+        self.documents.clear()
+        self.notifications.clear()
+        self.denied.clear()
+        self.permissions.clear()
+        self.bulk_documents_enabled = True
+        self.bulk_authz_enabled = True
+        self.calls.clear()
+        self.stats = {"requests": 0, "errors_injected": 0, "slow_loris": 0}
+
+    def call_count(self, method: str, path_prefix: str = "/") -> int:
+        """Count recorded calls matching a method and path prefix."""
+        return sum(1 for m, p in self.calls if m == method and p.startswith(path_prefix))
+
+    def transport(self) -> "SimulatorTransport":
+        """httpx transport that routes requests to this simulator in-process."""
+        return SimulatorTransport(self.app)
+
+    # -- fault injection -----------------------------------------------
+
+    def _faults_for(self, path: str) -> FaultProfile:
+        best = max((p for p in self.faults if path.startswith(p)), key=len)
+        return self.faults[best]
+
+    async def _respond(self, request: Request, payload: Any, status_code: int = 200) -> Response:
+        """Render a payload after applying the faults configured for the route."""
+        path = request.url.path
+        self.calls.append((request.method, path))
+        self.stats["requests"] += 1
+        faults = self._faults_for(path)
+
+        delay = faults.latency.sample(self.rng)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if faults.error_rate and self.rng.random() < faults.error_rate:
+            self.stats["errors_injected"] += 1
+            return JSONResponse({"error": "injected fault"}, status_code=faults.error_status)
+
+        response = JSONResponse(payload, status_code=status_code)
+        if faults.slow_loris_rate and self.rng.random() < faults.slow_loris_rate:
+            self.stats["slow_loris"] += 1
+            return self._slow_loris(response, faults)
+        return response
+
+    async def _respond_conditional(self, request: Request, payload: dict, last_modified: Optional[str] = None) -> Response:
+        """Render a payload with validators, answering 304 when the client's copy is current."""
+        etag = '"' + hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:32] + '"'
+        headers = {"ETag": etag}
+        if last_modified:
+            headers["Last-Modified"] = format_datetime(datetime.fromisoformat(last_modified), usegmt=True)
+        if request.headers.get("if-none-match") == etag:
+            self.stats["not_modified"] = self.stats.get("not_modified", 0) + 1
+            response = await self._respond(request, None, 304)
+            if response.status_code == 304:
+                return Response(status_code=304, headers=headers)
+            return response
+        response = await self._respond(request, payload)
+        response.headers.update(headers)
+        return response
+
+    @staticmethod
+    def _slow_loris(response: JSONResponse, faults: FaultProfile) -> StreamingResponse:
+        """Trickle the body out a few bytes at a time."""
+        body = response.body
+        size = faults.slow_loris_chunk_bytes
+        delay = faults.slow_loris_chunk_delay_ms / 1000
+
+        async def trickle():
+            for start in range(0, len(body), size):
+                await asyncio.sleep(delay)
+                yield body[start:start + size]
+
+        return StreamingResponse(trickle(), status_code=response.status_code, media_type="application/json")
+
+    # -- endpoints -------------------------------------------------------
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(title="Upstream Simulator", docs_url=None, redoc_url=None, openapi_url=None)
+
+        @app.post("/entities/profiles")
+        async def create_profile_entity(request: Request):
+            data = await request.json()
+            profile_id = str(data.get("id") or uuid.uuid4())
+            entity = {**data, "id": profile_id, "updated_at": _now()}
+            self.profiles[profile_id] = entity
+            return await self._respond(request, entity, 201)
+
+        @app.get("/entities/profiles/{profile_id}")
+        async def get_profile_entity(profile_id: str, request: Request):
+            entity = self.profiles.get(profile_id)
+            if entity is None:
+                return await self._respond(request, {"error": "not found"}, 404)
+            return await self._respond_conditional(request, entity, entity.get("updated_at"))
+
+        @app.patch("/entities/profiles/{profile_id}")
+        async def update_profile_entity(profile_id: str, request: Request):
+            data = await request.json()
+            entity = self.profiles.setdefault(profile_id, {"id": profile_id})
+            entity.update(data)
+            entity["updated_at"] = _now()
+            return await self._respond(request, entity)
+
+        @app.post("/entities/addresses")
+        async def create_address_entity(request: Request):
+            data = await request.json()
+            address_id = str(data.get("id") or uuid.uuid4())
+            entity = {**data, "id": address_id}
+            self.addresses[address_id] = entity
+            return await self._respond(request, entity, 201)
+
+        @app.get("/entities/profiles/{profile_id}/addresses")
+        async def get_addresses_by_profile(profile_id: str, request: Request):
+            data = [a for a in self.addresses.values() if str(a.get("profile_id")) == profile_id]
+            return await self._respond_conditional(request, {"data": data})
+
+        @app.post("/documents/upload")
+        async def upload_document(request: Request):
+            data = await request.json()
+            document_id = f"doc_{uuid.uuid4().hex}"
+            self.documents[document_id] = {
+                "document_id": document_id,
+                "filename": data.get("filename"),
+                "content_type": data.get("content_type"),
+                "metadata": data.get("metadata", {}),
+                "status": "uploaded",
+            }
+            return await self._respond(request, self.documents[document_id], 201)
+
+        @app.post("/documents/batch")
+        async def get_documents_batch(request: Request):
+            if not self.bulk_documents_enabled:
+                return await self._respond(request, {"error": "not found"}, 404)
+            data = await request.json()
+            items = [
+                {**self.documents.get(document_id, {"document_id": document_id}), **_download_url(document_id)}
+                for document_id in data.get("document_ids", [])
+            ]
+            return await self._respond(request, {"data": items})
+
+        @app.get("/documents/{document_id}/download-url")
+        async def get_document_download_url(document_id: str, request: Request):
+            return await self._respond(request, _download_url(document_id))
+
+        @app.get("/documents/{document_id}")
+        async def get_document_metadata(document_id: str, request: Request):
+            document = self.documents.get(document_id)
+            if document is None:
+                return await self._respond(request, {"error": "not found"}, 404)
+            return await self._respond(request, document)
+
+        @app.delete("/documents/{document_id}")
+        async def delete_document(document_id: str, request: Request):
+            document = self.documents.get(document_id)
+            if document is None:
+                return await self._respond(request, {"error": "not found"}, 404)
+            document["deleted_at"] = _now()
+            return await self._respond(request, {"deleted": True})
+
+        @app.post("/notifications/{endpoint}")
+        async def send_notifications(endpoint: str, request: Request):
+            data = await request.json()
+            for notification in data.get("notifications", []):
+                self.notifications.append((endpoint, notification))
+            return await self._respond(request, {"accepted": len(data.get("notifications", []))}, 202)
+
+        @app.post("/authz/check")
+        async def check_permission(request: Request):
+            data = await request.json()
+            allowed = (data.get("user_id"), data.get("resource_id")) not in self.denied
+            return await self._respond(request, {"allowed": allowed})
+
+        @app.post("/authz/check-batch")
+        async def check_permissions(request: Request):
+            if not self.bulk_authz_enabled:
+                return await self._respond(request, {"error": "not found"}, 404)
+            data = await request.json()
+            results = [
+                {"resource_id": resource_id, "allowed": (data.get("user_id"), resource_id) not in self.denied}
+                for resource_id in data.get("resource_ids", [])
+            ]
+            return await self._respond(request, {"results": results})
+
+        @app.post("/authz/field-access")
+        async def check_field_access(request: Request):
+            return await self._respond(request, {"allowed": True})
+
+        @app.get("/authz/users/{user_id}/permissions")
+        async def get_user_permissions(user_id: str, request: Request):
+            return await self._respond(request, {"permissions": self.permissions.get(user_id, [])})
+
+        @app.put("/__simulator/faults")
+        async def put_faults(request: Request):
+            data = await request.json()
+            for prefix, profile in data.items():
+                self.set_faults(prefix, FaultProfile(**profile))
+            return {prefix: profile.model_dump() for prefix, profile in self.faults.items()}
+
+        @app.get("/__simulator/stats")
+        async def get_stats():
+            return self.stats
+
+        @app.post("/__simulator/reset")
+        async def post_reset():
+            self.reset()
+            return {"reset": True}
+
+        return app
+
+
+class SimulatorTransport(httpx.AsyncBaseTransport):
+    """In-process transport that honours httpx read timeouts.
+
+    `httpx.ASGITransport` buffers the whole response and ignores timeouts,
+    which hides exactly the slow-upstream behaviour the simulator exists to
+    produce. This transport streams the body and applies the read timeout to
+    each chunk, as a socket would.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        read_timeout = request.extensions.get("timeout", {}).get("read")
+        body = await request.aread()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "headers": [(k.lower(), v) for (k, v) in request.headers.raw],
+            "scheme": request.url.scheme,
+            "path": request.url.path,
+            "raw_path": request.url.raw_path.split(b"?")[0],
+            "query_string": request.url.query,
+            "server": (request.url.host, request.url.port),
+            "client": ("127.0.0.1", 123),
+            "root_path": "",
+        }
+        messages: asyncio.Queue = asyncio.Queue()
+        request_sent = False
+        disconnected = asyncio.Event()
+
+        async def receive() -> dict:
+            nonlocal request_sent
+            if request_sent:
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message: dict) -> None:
+            await messages.put(message)
+
+        task = asyncio.ensure_future(self.app(scope, receive, send))
+        task.add_done_callback(lambda t: messages.put_nowait(t))
+
+        async def next_message() -> dict:
+            try:
+                item = await asyncio.wait_for(messages.get(), read_timeout)
+            except asyncio.TimeoutError:
+                disconnected.set()
+                task.cancel()
+                raise httpx.ReadTimeout("Simulated upstream read timed out", request=request)
+            if isinstance(item, asyncio.Future):
+                if not item.cancelled() and item.exception():
+                    raise item.exception()
+                raise httpx.RemoteProtocolError("Upstream closed without a response", request=request)
+            return item
+
+        start = await next_message()
+
+        async def stream_body():
+            try:
+                while True:
+                    message = await next_message()
+                    yield message.get("body", b"")
+                    if not message.get("more_body", False):
+                        break
+            finally:
+                disconnected.set()
+
+        return httpx.Response(
+            start["status"],
+            headers=start.get("headers", []),
+            stream=_ResponseStream(stream_body()),
+            request=request,
+        )
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, iterator):
+        self._iterator = iterator
+
+    async def __aiter__(self):
+        async for chunk in self._iterator:
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._iterator.aclose()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _download_url(document_id: str) -> dict:
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=DOWNLOAD_URL_TTL_SECONDS)
+    return {
+        "document_id": document_id,
+        "url": f"https://documents.example.com/{document_id}?token={uuid.uuid4().hex}",
+        "expires_at": expires_at.isoformat(),
+        "expires_in": DOWNLOAD_URL_TTL_SECONDS,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the upstream simulator as a standalone server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--latency", default="fixed:0", help="e.g. fixed:20, uniform:10:50, lognormal:20:0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--slow-loris-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    simulator = UpstreamSimulator(
+        seed=args.seed,
+        default_faults=FaultProfile(
+            latency=LatencyDistribution.parse(args.latency),
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            slow_loris_rate=args.slow_loris_rate,
+        ),
+    )
+
+    import uvicorn
+    uvicorn.run(simulator.app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()